@@ -0,0 +1,367 @@
+"""
+Incremental OHLCV bars built tick by tick in memory.
+
+Each (symbol, timeframe) keeps one open bar. A bar is closed when a tick for
+the same symbol falls into a later bucket, or when the market clock (the
+newest tick timestamp seen for any symbol) passes the end of the bucket, so
+quiet symbols still get their bars closed.
+
+resample_ticks() is the batch equivalent for stored ticks, resample_ticks_many()
+the same for many symbols at once. Both run on resample_arrays(): bucket ids
+from sorted int64 timestamps, then one np.maximum / np.minimum / np.add
+.reduceat per column, instead of pandas' resample/groupby machinery.
+Buckets can have any fixed width, on the same epoch grid as BarBuilder's,
+or can be aligned to a trading session (BIST_SESSION).
+"""
+from datetime import datetime, time, timedelta
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+# Timeframes published on the bus and stored in ohlcv_bars (pandas offset aliases used elsewhere in the repo)
+BAR_TIMEFRAMES = ('1s', '1min', '5min')
+
+TIMEFRAME_SECONDS = {
+    '1s': 1,
+    '5s': 5,
+    '1min': 60,
+    '5min': 300,
+    '15min': 900,
+    '1h': 3600,
+}
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# Borsa Istanbul equities: continuous trading from 10:00, closing auction until 18:10
+BIST_SESSION = (time(10, 0), time(18, 10))
+
+DAY_NS = 86_400 * 1_000_000_000
+
+_EPOCH = datetime(1970, 1, 1)
+
+def timeframe_ns(timeframe):
+    try:
+        return TIMEFRAME_SECONDS[timeframe] * 1_000_000_000
+    except KeyError:
+        raise ValueError(f"Unsupported bar timeframe: {timeframe}")
+
+def _to_ns(ts):
+    if isinstance(ts, int):
+        return ts
+    if isinstance(ts, str):
+        ts = datetime.fromisoformat(ts)
+    if ts.tzinfo is not None:
+        ts = ts.replace(tzinfo=None)
+    delta = ts - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1000
+
+def bucket_width_ns(timeframe):
+    """
+    Fixed bucket width of a timeframe in ns: an int, a timedelta, or a pandas
+    alias such as '1s', '7min', '2h'. Calendar aliases ('1D', '1W', '1ME')
+    raise ValueError.
+    """
+    if isinstance(timeframe, (int, np.integer)):
+        width = int(timeframe)
+    elif isinstance(timeframe, (timedelta, pd.Timedelta)):
+        width = pd.Timedelta(timeframe).value
+    else:
+        try:
+            offset = to_offset(timeframe)
+        except (TypeError, ValueError):
+            raise ValueError(f"Unknown timeframe: {timeframe}")
+        if not isinstance(offset, pd.offsets.Tick):
+            raise ValueError(f"Not a fixed bucket width: {timeframe}")
+        width = offset.nanos
+    if width <= 0:
+        raise ValueError(f"Not a fixed bucket width: {timeframe}")
+    return width
+
+def _session_offsets(session):
+    return tuple((t.hour * 3600 + t.minute * 60 + t.second) * 1_000_000_000 + t.microsecond * 1000 for t in session)
+
+def resample_arrays(ts_ns, price, volume, width_ns, session=None, keys=None, origin_ns=0):
+    """
+    OHLCV bars from tick arrays, sorted by time (within each key when keys
+    are given). Buckets without trades do not exist (no NaN rows to drop).
+
+    Args:
+        ts_ns (np.ndarray): int64 epoch-ns timestamps (naive wall clock).
+        price, volume (np.ndarray): float arrays; a NaN price only adds its
+            volume (a bucket without any price is dropped), NaN volumes count as 0.
+        width_ns (int): Bucket width.
+        session (tuple | None): (open, close) datetime.time. Buckets start at
+            the session open each day, the last one ends at the close, and
+            ticks outside the session are dropped. None: buckets on multiples
+            of the width from origin_ns.
+        keys (np.ndarray | None): int codes (e.g. symbols), sorted; a new key starts a new bar.
+        origin_ns (int): Grid origin without a session (0: the epoch grid of
+            BarBuilder, Series.dt.floor and resample(origin='epoch')).
+
+    Returns:
+        dict: start (int64 ns), open, high, low, close, volume, tick_count
+        (and key when keys are given) arrays, one entry per bar.
+    """
+    ts_ns = np.asarray(ts_ns, dtype=np.int64)
+    price = np.asarray(price, dtype=np.float64)
+    volume = np.asarray(volume, dtype=np.float64)
+    if session is not None:
+        open_ns, close_ns = _session_offsets(session)
+        time_of_day = ts_ns % DAY_NS
+        keep = (time_of_day >= open_ns) & (time_of_day < close_ns)
+        if not keep.all():
+            ts_ns, price, volume = ts_ns[keep], price[keep], volume[keep]
+            keys = keys[keep] if keys is not None else None
+    valid = ~np.isnan(price)
+    missing_volume = np.isnan(volume)
+    if missing_volume.any():
+        volume = np.where(missing_volume, 0.0, volume)
+
+    if session is None:
+        start = origin_ns + (ts_ns - origin_ns) // width_ns * width_ns
+    else:
+        origin = ts_ns - ts_ns % DAY_NS + open_ns
+        start = origin + (ts_ns - origin) // width_ns * width_ns
+
+    n = len(ts_ns)
+    new_bar = start[1:] != start[:-1]
+    if keys is not None:
+        new_bar |= keys[1:] != keys[:-1]
+    first = np.flatnonzero(np.r_[n > 0, new_bar])
+    last = np.r_[first[1:] - 1, n - 1] if n else first
+    if valid.all():
+        open_at, close_at, traded = first, last, None
+        high_src = low_src = price
+        tick_count = last - first + 1
+    else:
+        # OHLC and tick_count from the valid prices only; volume still sums every row
+        position = np.arange(n)
+        open_at = np.minimum.reduceat(np.where(valid, position, n), first)
+        close_at = np.maximum.reduceat(np.where(valid, position, -1), first)
+        traded = close_at >= 0
+        open_at, close_at = np.where(traded, open_at, first), np.where(traded, close_at, first)
+        high_src, low_src = np.where(valid, price, -np.inf), np.where(valid, price, np.inf)
+        tick_count = np.add.reduceat(valid.astype(np.int64), first)
+    bars = {
+        'start': start[first],
+        'open': price[open_at],
+        'high': np.maximum.reduceat(high_src, first) if n else price,
+        'low': np.minimum.reduceat(low_src, first) if n else price,
+        'close': price[close_at],
+        'volume': np.add.reduceat(volume, first) if n else volume,
+        'tick_count': tick_count,
+    }
+    if keys is not None:
+        bars['key'] = keys[first]
+    if traded is not None and not traded.all():
+        bars = {name: values[traded] for name, values in bars.items()}
+    return bars
+
+def _sorted_ns(timestamps):
+    """int64 ns of a datetime Series/Index, and the stable order sorting it (None if already sorted)."""
+    ts_ns = timestamps.to_numpy(dtype='datetime64[ns]').view(np.int64)
+    if len(ts_ns) and (ts_ns[1:] < ts_ns[:-1]).any():
+        order = np.argsort(ts_ns, kind='stable')
+        return ts_ns[order], order
+    return ts_ns, None
+
+def resample_ticks(ticks, timeframe, tick_count=False, session=None):
+    """
+    Resamples ticks (price, volume; timestamp index or column) to OHLCV bars.
+    Buckets without trades are dropped rather than filled. Buckets start on
+    multiples of the timeframe, like BarBuilder's, or on the session grid
+    (see resample_arrays).
+
+    Args:
+        timeframe (str | int): Pandas alias or width in ns (bucket_width_ns).
+        tick_count (bool): Also return the number of ticks per bar.
+        session (tuple | None): e.g. BIST_SESSION.
+    """
+    if 'timestamp' in ticks.columns:
+        ticks = ticks.set_index('timestamp')
+    index = ticks.index
+    if getattr(index, 'tz', None) is not None:
+        if session is not None:
+            raise ValueError("Session buckets need naive wall-clock timestamps")
+        return _resample_ticks_pandas(ticks, timeframe, tick_count)
+    try:
+        width = bucket_width_ns(timeframe)
+    except ValueError:
+        if session is not None:
+            raise
+        return _resample_ticks_pandas(ticks, timeframe, tick_count)
+
+    ts_ns, order = _sorted_ns(index)
+    price = ticks['price'].to_numpy(dtype=np.float64)
+    volume = ticks['volume'].to_numpy(dtype=np.float64)
+    if order is not None:
+        price, volume = price[order], volume[order]
+    bars = resample_arrays(ts_ns, price, volume, width, session)
+    columns = OHLCV_COLUMNS + (['tick_count'] if tick_count else [])
+    unit = index.unit if isinstance(index, pd.DatetimeIndex) else 'ns'
+    start = pd.DatetimeIndex(bars['start'].view('datetime64[ns]'), name='timestamp').as_unit(unit)
+    return pd.DataFrame({c: bars[c] for c in columns}, index=start)
+
+def _resample_ticks_pandas(ticks, timeframe, tick_count=False):
+    # DataFrame.resample path: calendar timeframes, tz-aware timestamps, and the reference for resample_arrays
+    # Open: first, High: max, Low: min, Close: last, Volume: sum
+    price_aggs = ['first', 'max', 'min', 'last'] + (['count'] if tick_count else [])
+    try:
+        # The epoch grid of resample_arrays and dt.floor, not the first tick's midnight
+        bucket_width_ns(timeframe)
+        options = {'origin': 'epoch'}
+    except ValueError:
+        options = {}  # Calendar timeframes: no fixed-width grid to anchor
+    bars = ticks.resample(timeframe, **options).agg({'price': price_aggs, 'volume': 'sum'})
+    bars.columns = ['open', 'high', 'low', 'close'] + (['tick_count'] if tick_count else []) + ['volume']
+    bars = bars.dropna()
+    return bars[OHLCV_COLUMNS + (['tick_count'] if tick_count else [])]
+
+def resample_ticks_many(ticks, timeframe, session=None):
+    """
+    resample_ticks for many symbols in one vectorised pass: ticks (symbol,
+    timestamp, price, volume) are split into bars on (symbol, bucket)
+    changes at once instead of one resample per symbol.
+
+    Returns:
+        pd.DataFrame: OHLCV indexed by (symbol, timestamp), sorted.
+    """
+    timestamps = ticks['timestamp']
+    if timestamps.dt.tz is not None:
+        return _resample_ticks_many_pandas(ticks, timeframe)
+    try:
+        width = bucket_width_ns(timeframe)
+    except ValueError:
+        return _resample_ticks_many_pandas(ticks, timeframe)
+
+    codes, symbols = pd.factorize(ticks['symbol'], sort=True)
+    ts_ns = timestamps.to_numpy(dtype='datetime64[ns]').view(np.int64)
+    price = ticks['price'].to_numpy(dtype=np.float64)
+    volume = ticks['volume'].to_numpy(dtype=np.float64)
+    if len(codes) and ((codes[1:] < codes[:-1]) | ((codes[1:] == codes[:-1]) & (ts_ns[1:] < ts_ns[:-1]))).any():
+        order = np.lexsort((ts_ns, codes))
+        codes, ts_ns, price, volume = codes[order], ts_ns[order], price[order], volume[order]
+    bars = resample_arrays(ts_ns, price, volume, width, session, keys=codes)
+    index = pd.MultiIndex.from_arrays([
+        pd.Index(symbols.to_numpy()[bars['key']], name='symbol'),
+        pd.DatetimeIndex(bars['start'].view('datetime64[ns]'), name='timestamp').as_unit(timestamps.dt.unit),
+    ])
+    return pd.DataFrame({c: bars[c] for c in OHLCV_COLUMNS}, index=index)
+
+def _resample_ticks_many_pandas(ticks, timeframe):
+    bucket = ticks['timestamp'].dt.floor(timeframe).rename('timestamp')
+    bars = ticks.groupby([ticks['symbol'], bucket], sort=True).agg(
+        open=('price', 'first'), high=('price', 'max'), low=('price', 'min'),
+        close=('price', 'last'), volume=('volume', 'sum'),
+    )
+    return bars.dropna()
+
+def split_panel(panel):
+    """
+    Splits a (symbol, timestamp)-indexed frame sorted by symbol into
+    {symbol: timestamp-indexed frame} with positional slices (no per-group
+    groupby/copy, which dominates at hundreds of symbols).
+    """
+    flat = panel.reset_index(level='symbol')
+    symbols = flat.pop('symbol').to_numpy()
+    if not len(symbols):
+        return {}
+    cuts = np.flatnonzero(symbols[1:] != symbols[:-1]) + 1
+    starts = np.r_[0, cuts]
+    ends = np.r_[cuts, len(symbols)]
+    return {symbols[s]: flat.iloc[s:e] for s, e in zip(starts, ends)}
+
+class BarBuilder:
+    """
+    Not thread safe; the tick bus serialises calls to update().
+    """
+
+    def __init__(self, timeframes=BAR_TIMEFRAMES):
+        self.timeframes = tuple(timeframes)
+        self._widths = [(tf, timeframe_ns(tf)) for tf in self.timeframes]
+        self._min_width = min(w for _, w in self._widths)
+        # (symbol, timeframe) -> [start_ns, open, high, low, close, volume, tick_count, first_ns, last_ns]
+        self._open = {}
+        # (symbol, timeframe) -> start_ns of the last closed (published) bar
+        self._closed = {}
+        self.clock_ns = 0
+        self.late_ticks = 0
+
+    def update(self, symbol, price, volume, timestamp):
+        """
+        Adds one tick.
+
+        Args:
+            timestamp (datetime | str | int): Tick time (naive wall clock or epoch-ns).
+
+        Returns:
+            list: Bars closed by this tick (see _emit for the dict shape).
+        """
+        ts_ns = _to_ns(timestamp)
+        volume = volume or 0.0
+        closed = []
+        for tf, width in self._widths:
+            start = ts_ns - ts_ns % width
+            key = (symbol, tf)
+            bar = self._open.get(key)
+            late = start < bar[0] if bar is not None else start <= self._closed.get(key, -1)
+            if late:
+                # Late tick for a bucket already closed (by a newer tick or the market
+                # clock): published bars are final, and it belongs to no open bar
+                self.late_ticks += 1
+                continue
+            if bar is None or start > bar[0]:
+                if bar is not None:
+                    closed.append(self._emit(symbol, tf, bar))
+                    self._closed[key] = bar[0]
+                self._open[key] = [start, price, price, price, price, volume, 1, ts_ns, ts_ns]
+            else:
+                # Same bucket; an out-of-order tick moves open/close only if it is the oldest/newest
+                if price > bar[2]:
+                    bar[2] = price
+                if price < bar[3]:
+                    bar[3] = price
+                if ts_ns < bar[7]:
+                    bar[1], bar[7] = price, ts_ns
+                if ts_ns >= bar[8]:
+                    bar[4], bar[8] = price, ts_ns
+                bar[5] += volume
+                bar[6] += 1
+
+        # Sweep other symbols only when the clock enters a new smallest bucket
+        if ts_ns - ts_ns % self._min_width > self.clock_ns - self.clock_ns % self._min_width:
+            self.clock_ns = ts_ns
+            closed.extend(self.close_due(ts_ns))
+        elif ts_ns > self.clock_ns:
+            self.clock_ns = ts_ns
+        return closed
+
+    def close_due(self, now_ns):
+        """Closes every open bar whose bucket ended at or before `now_ns`."""
+        closed = []
+        for tf, width in self._widths:
+            for key, bar in list(self._open.items()):
+                if key[1] == tf and bar[0] + width <= now_ns:
+                    closed.append(self._emit(key[0], tf, bar))
+                    self._closed[key] = bar[0]
+                    del self._open[key]
+        return closed
+
+    def open_bars(self):
+        """Current (unfinished) bars, same shape as closed ones."""
+        return [self._emit(sym, tf, bar) for (sym, tf), bar in self._open.items()]
+
+    @staticmethod
+    def _emit(symbol, timeframe, bar):
+        return {
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'start': _EPOCH + timedelta(microseconds=bar[0] // 1000),
+            'open': bar[1],
+            'high': bar[2],
+            'low': bar[3],
+            'close': bar[4],
+            'volume': bar[5],
+            'tick_count': bar[6],
+        }
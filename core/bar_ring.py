@@ -0,0 +1,263 @@
+"""
+Memory-mapped ring buffers of recent closed bars, one file per (timeframe, symbol).
+
+The ingestion server appends every closed bar; the bot, dashboard, predict
+and committee map the same files read-only and take the last N bars as a
+numpy slice instead of querying SQLite. Files live in /dev/shm when it
+exists (RAM, no disk I/O), otherwise under data/bar_rings; BIST_RING_DIR
+overrides both.
+
+File layout (little endian):
+    header (64 bytes): magic, version, capacity, seq, count
+    records: BAR_DTYPE x 2*capacity
+
+Every record is written twice, at slot i and i + capacity, so the newest n
+bars are always one contiguous slice (no wrap-around copy). `count` is the
+write cursor (bars ever written). `seq` is a seqlock: the writer makes it
+odd before touching a record and even again after updating `count`;
+readers retry when it is odd or changed while they read.
+
+Single writer per file. Python gives no memory-fence guarantees, but on
+x86/ARM64 the aligned 8-byte header stores are not torn, and the seqlock
+re-check catches a concurrent write.
+"""
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+# Ensure we can import from core
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from core.bar_builder import BAR_TIMEFRAMES, OHLCV_COLUMNS
+
+MAGIC = b'BISTRING'
+VERSION = 1
+RING_CAPACITY = 2048       # bars per (timeframe, symbol); 2 x 2048 x 56 B = 224 KiB per file
+MAX_RETRIES = 10000        # seqlock spins before a reader gives up on a stalled writer
+
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u4'),
+    ('capacity', '<u4'),
+    ('seq', '<u8'),
+    ('count', '<u8'),
+    ('_pad', 'V32'),
+])
+HEADER_SIZE = HEADER_DTYPE.itemsize  # 64
+
+BAR_DTYPE = np.dtype([
+    ('start', '<i8'),       # Bucket start, epoch-ns (naive wall clock, like tick timestamps)
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8'),
+    ('tick_count', '<i8'),
+])
+
+def ring_dir():
+    override = os.environ.get('BIST_RING_DIR')
+    if override:
+        return override
+    if os.path.isdir('/dev/shm'):
+        return '/dev/shm/bist_bars'
+    return os.path.join(project_root, 'data', 'bar_rings')
+
+def ring_path(symbol, timeframe, directory=None):
+    return os.path.join(directory or ring_dir(), timeframe, f"{symbol}.ring")
+
+class BarRing:
+    """
+    One mapped ring file. Use BarRing.create() in the writer process and
+    BarRing.open() (read-only) everywhere else.
+    """
+
+    def __init__(self, path, writable):
+        self.path = path
+        self.writable = writable
+        mode = 'r+' if writable else 'r'
+        self._header = np.memmap(path, dtype=HEADER_DTYPE, mode=mode, shape=(1,))
+        if self._header['magic'][0] != MAGIC or self._header['version'][0] != VERSION:
+            raise ValueError(f"{path} is not a bar ring (version {VERSION})")
+        self.capacity = int(self._header['capacity'][0])
+        self.records = np.memmap(path, dtype=BAR_DTYPE, mode=mode, offset=HEADER_SIZE, shape=(2 * self.capacity,))
+
+    @classmethod
+    def create(cls, path, capacity=RING_CAPACITY):
+        """Opens the ring for writing, creating (or resizing) the file as needed."""
+        size = HEADER_SIZE + 2 * capacity * BAR_DTYPE.itemsize
+        if os.path.exists(path) and os.path.getsize(path) == size:
+            ring = cls(path, writable=True)
+            if ring._header['seq'][0] & 1:
+                # Previous writer died mid-append; the slot it touched is rewritten next time
+                ring._header['seq'][0] += 1
+            return ring
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.truncate(size)
+        header = np.memmap(tmp, dtype=HEADER_DTYPE, mode='r+', shape=(1,))
+        header['magic'] = MAGIC
+        header['version'] = VERSION
+        header['capacity'] = capacity
+        header.flush()
+        del header
+        # Readers never see a half-initialised file
+        os.replace(tmp, path)
+        return cls(path, writable=True)
+
+    @classmethod
+    def open(cls, path):
+        """Maps an existing ring read-only."""
+        return cls(path, writable=False)
+
+    @property
+    def count(self):
+        """Bars ever written (the write cursor)."""
+        return int(self._header['count'][0])
+
+    def append(self, bar):
+        """
+        Appends one closed bar (BarBuilder dict: start, open, high, low, close,
+        volume, tick_count).
+        """
+        header = self._header
+        count = int(header['count'][0])
+        slot = count % self.capacity
+        record = (
+            np.datetime64(bar['start'], 'ns').astype(np.int64),
+            bar['open'], bar['high'], bar['low'], bar['close'], bar['volume'] or 0.0, bar['tick_count'],
+        )
+        header['seq'][0] += 1            # odd: write in progress
+        self.records[slot] = record
+        self.records[slot + self.capacity] = record
+        header['count'][0] = count + 1
+        header['seq'][0] += 1            # even: consistent
+
+    def last(self, n, copy=False):
+        """
+        The newest min(n, count, capacity) bars, oldest first.
+
+        Args:
+            copy (bool): False returns a read-only view into the mapping. The
+                view is consistent when returned and stays valid until the
+                writer appends another capacity - n bars.
+
+        Returns:
+            np.ndarray of BAR_DTYPE.
+        """
+        header = self._header
+        for _ in range(MAX_RETRIES):
+            seq = int(header['seq'][0])
+            if seq & 1:
+                time.sleep(0)
+                continue
+            count = int(header['count'][0])
+            n_avail = min(n, count, self.capacity)
+            end = count % self.capacity + self.capacity
+            window = self.records[end - n_avail:end]
+            if copy:
+                window = window.copy()
+            if int(header['seq'][0]) == seq:
+                if not copy:
+                    window = window.view(np.ndarray)
+                    window.flags.writeable = False
+                return window
+        raise TimeoutError(f"Bar ring writer stalled: {self.path}")
+
+    def frame(self, n):
+        """The newest n bars as a timestamp-indexed OHLCV DataFrame (like fetch_ohlcv)."""
+        bars = self.last(n, copy=True)
+        index = pd.DatetimeIndex(bars['start'].astype('datetime64[ns]'), name='timestamp')
+        return pd.DataFrame({c: bars[c] for c in OHLCV_COLUMNS}, index=index)
+
+    def close(self):
+        for arr in (self._header, self.records):
+            if self.writable:
+                arr.flush()
+            mm = getattr(arr, '_mmap', None)
+            if mm is not None:
+                try:
+                    mm.close()
+                except BufferError:
+                    pass  # A view handed out by last() still references the mapping
+
+class BarRings:
+    """Writer side: one ring per (timeframe, symbol), created on first bar."""
+
+    def __init__(self, directory=None, capacity=RING_CAPACITY, timeframes=BAR_TIMEFRAMES):
+        self.directory = directory or ring_dir()
+        self.capacity = capacity
+        self.timeframes = tuple(timeframes)
+        self._rings = {}
+        self._lock = threading.Lock()
+
+    def append(self, bar):
+        if bar['timeframe'] not in self.timeframes:
+            return
+        key = (bar['timeframe'], bar['symbol'])
+        # Appends to one ring must not interleave (seqlock = single writer)
+        with self._lock:
+            ring = self._rings.get(key)
+            if ring is None:
+                ring = self._rings[key] = BarRing.create(
+                    ring_path(bar['symbol'], bar['timeframe'], self.directory), self.capacity)
+            ring.append(bar)
+
+    def close(self):
+        with self._lock:
+            for ring in self._rings.values():
+                ring.close()
+            self._rings.clear()
+
+def open_bar_ring(symbol, timeframe, directory=None):
+    """Read-only ring of one symbol, or None if no writer has created it."""
+    try:
+        return BarRing.open(ring_path(symbol, timeframe, directory))
+    except (OSError, ValueError):
+        return None
+
+def read_ring_bars(symbol, timeframe, n, min_bars=None, directory=None):
+    """
+    The newest n bars from the shared ring as an OHLCV DataFrame, or None when
+    the ring is missing or holds fewer than min_bars (default n) bars.
+    """
+    ring = open_bar_ring(symbol, timeframe, directory)
+    if ring is None:
+        return None
+    try:
+        if min(ring.count, ring.capacity) < (min_bars if min_bars is not None else n):
+            return None
+        return ring.frame(n)
+    finally:
+        ring.close()
+
+_default_rings = None
+_default_lock = threading.Lock()
+
+def start_bar_rings(directory=None):
+    """Starts the process-wide ring writer (ingestion server only)."""
+    global _default_rings
+    with _default_lock:
+        if _default_rings is None:
+            _default_rings = BarRings(directory)
+    return _default_rings
+
+def get_bar_rings():
+    """The ring writer, or None if this process does not write rings."""
+    return _default_rings
+
+def close_bar_rings():
+    global _default_rings
+    with _default_lock:
+        rings, _default_rings = _default_rings, None
+    if rings is not None:
+        rings.close()
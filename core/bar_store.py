@@ -0,0 +1,132 @@
+"""
+Stored OHLCV bars (ohlcv_bars) at the BarBuilder timeframes.
+
+The ingestion server feeds every tick through a BarBuilder and queues each
+bar it closes on the tick writer (core.tick_writer), so the table grows as
+ticks arrive and closed bars are never recomputed. Bars of one bucket that
+are written twice (the partial bar flushed on shutdown and the rest of the
+bucket after a restart) are merged by bar_upsert().
+
+fetch_bars() is what the feature engine and dashboard read for the stored
+timeframes; backfill_bars() builds the table from tick history once.
+"""
+import os
+import sys
+from datetime import date
+
+import pandas as pd
+
+# Ensure we can import from core
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from core.database import OHLCVBar, get_engine
+from core.bar_builder import BAR_TIMEFRAMES, OHLCV_COLUMNS, resample_ticks, split_panel
+
+def bar_upsert():
+    """INSERT for ohlcv_bars that merges a row into an existing bar of the same bucket."""
+    table = OHLCVBar.__table__
+    stmt = sqlite_insert(table)
+    new = stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=['timeframe', 'symbol', 'start'],
+        set_={
+            # open stays: the stored part of the bucket came first
+            'high': func.max(table.c.high, new.high),
+            'low': func.min(table.c.low, new.low),
+            'close': new.close,
+            'volume': table.c.volume + new.volume,
+            'tick_count': table.c.tick_count + new.tick_count,
+        },
+    )
+
+def fetch_bars(symbol, timeframe='1min', limit=5000, role='analytics', engine=None):
+    """
+    Reads the newest stored bars of one symbol.
+
+    Args:
+        symbol (str): Stock symbol (e.g., 'THYAO')
+        timeframe (str): One of BAR_TIMEFRAMES
+        limit (int): Number of most recent bars to fetch
+        role (str): Read-only engine role ('analytics' or 'dashboard')
+
+    Returns:
+        pd.DataFrame: timestamp-indexed open, high, low, close, volume (oldest first).
+    """
+    query = text(
+        "SELECT start, open, high, low, close, volume FROM ohlcv_bars "
+        "WHERE timeframe = :timeframe AND symbol = :symbol ORDER BY start DESC LIMIT :limit"
+    )
+    df = pd.read_sql(query, engine if engine is not None else get_engine(role),
+                     params={'timeframe': timeframe, 'symbol': symbol, 'limit': limit})
+    df['start'] = pd.to_datetime(df['start'], format='ISO8601')
+    df = df.rename(columns={'start': 'timestamp'}).sort_values('timestamp').set_index('timestamp')
+    return df[OHLCV_COLUMNS]
+
+def fetch_bars_many(symbols, timeframe='1min', limit=5000, role='analytics', engine=None):
+    """
+    fetch_bars for many symbols with one statement per COMPOUND_CHUNK symbols
+    (see core.tick_store.newest_per_symbol) instead of one query each.
+
+    Returns:
+        dict: {symbol: fetch_bars-style DataFrame} for the symbols that have bars.
+    """
+    from core.tick_store import newest_per_symbol
+    symbols = list(dict.fromkeys(symbols))
+    columns = ['symbol', 'start'] + OHLCV_COLUMNS
+    statements = newest_per_symbol(symbols, limit, columns, table='ohlcv_bars', time_column='start',
+                                   where='timeframe = :timeframe', params={'timeframe': timeframe})
+    engine = engine if engine is not None else get_engine(role)
+    frames = [pd.read_sql(text(sql), engine, params=params) for sql, params in statements]
+    if not frames:
+        return {}
+    df = pd.concat(frames, ignore_index=True)
+    df['start'] = pd.to_datetime(df['start'], format='ISO8601')
+    df = df.rename(columns={'start': 'timestamp'}).sort_values(['symbol', 'timestamp'])
+    bars = split_panel(df.set_index(['symbol', 'timestamp'])[OHLCV_COLUMNS])
+    return {symbol: bars[symbol] for symbol in symbols if symbol in bars}
+
+def backfill_bars(timeframes=BAR_TIMEFRAMES, start=None, end=None, symbols=None, store=None, engine=None):
+    """
+    Rebuilds stored bars of [start, end) from tick history, replacing existing rows.
+
+    Args:
+        end (datetime | None): Defaults to today 00:00, so the buckets the
+            running server is still building are left alone.
+        symbols (list | None): Defaults to ALL_SYMBOLS.
+        store: core.tick_store.TickStore to read ticks from.
+        engine: Engine to write to (defaults to the 'ingest' engine).
+
+    Returns:
+        dict: {timeframe: bars written}.
+    """
+    if store is None:
+        from core.tick_store import get_tick_store
+        store = get_tick_store('analytics')
+    if symbols is None:
+        from core.config_symbols import ALL_SYMBOLS
+        symbols = ALL_SYMBOLS
+    engine = engine if engine is not None else get_engine('ingest')
+    end = end if end is not None else pd.Timestamp(date.today())
+    insert = OHLCVBar.__table__.insert().prefix_with('OR REPLACE', dialect='sqlite')
+
+    written = {tf: 0 for tf in timeframes}
+    for symbol in symbols:
+        ticks = store.query(symbol, start, end)
+        if ticks.empty:
+            continue
+        rows = []
+        for tf in timeframes:
+            bars = resample_ticks(ticks[['timestamp', 'price', 'volume']], tf, tick_count=True).reset_index()
+            bars = bars.rename(columns={'timestamp': 'start'}).assign(symbol=symbol, timeframe=tf)
+            bars['tick_count'] = bars['tick_count'].astype(int)
+            rows.extend(bars.to_dict('records'))
+            written[tf] += len(bars)
+        with engine.begin() as conn:
+            conn.execute(insert, rows)
+    return written
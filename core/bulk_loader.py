@@ -0,0 +1,133 @@
+"""
+Bulk inserts of column data (historical backfills, migrations).
+
+bulk_load() takes whole columns (a DataFrame, a dict of numpy arrays or
+lists, or a pyarrow Table/RecordBatch), converts each column once with
+vectorised numpy calls and feeds plain tuples to the sqlite3 driver's
+executemany inside a single transaction. No ORM objects and no per-row
+Python processing are involved.
+
+Timestamps are written in SQLAlchemy's SQLite DATETIME text format
+('YYYY-MM-DD HH:MM:SS.ffffff'), so rows loaded here compare and parse
+exactly like rows written through the ORM or the tick writer.
+"""
+import os
+import sys
+import time
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+# Ensure we can import from core
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from sqlalchemy import DateTime, text
+
+from core.database import TickData, get_engine
+
+BULK_BATCH_SIZE = 50_000   # rows converted to tuples and handed to executemany at a time
+
+CONFLICT_PREFIX = {'ignore': 'OR IGNORE', 'replace': 'OR REPLACE', None: ''}
+
+def _as_columns(data):
+    """{name: array-like} from a DataFrame, pyarrow Table/RecordBatch or mapping."""
+    if isinstance(data, pd.DataFrame):
+        return {name: data[name] for name in data.columns}
+    if hasattr(data, 'column_names') and hasattr(data, 'column'):
+        # pyarrow Table / RecordBatch (pyarrow itself stays an optional import)
+        return {name: data.column(name).to_numpy(zero_copy_only=False) for name in data.column_names}
+    return dict(data)
+
+def _datetime_strings(values):
+    ts = pd.to_datetime(pd.Series(values), format='ISO8601')
+    if ts.dt.tz is not None:
+        ts = ts.dt.tz_localize(None)
+    strings = np.datetime_as_string(ts.to_numpy().astype('datetime64[us]'), unit='us')
+    strings = np.char.replace(strings, 'T', ' ').astype(object)
+    strings[ts.isna().to_numpy()] = None
+    return strings.tolist()
+
+def _column_values(values, column, n_rows):
+    """One column as a list of driver-ready Python values (scalars are broadcast)."""
+    if np.isscalar(values) or values is None or isinstance(values, (datetime, date)):
+        if isinstance(column.type, DateTime) and values is not None:
+            values = _datetime_strings([values])[0]
+        return [values] * n_rows
+    if isinstance(column.type, DateTime):
+        return _datetime_strings(values)
+    arr = np.asarray(values)
+    if arr.dtype.kind == 'f' and np.isnan(arr).any():
+        arr = np.where(np.isnan(arr), None, arr)  # NaN -> NULL
+    return arr.tolist()
+
+def _default_value(column):
+    default = column.default
+    if default is None:
+        return None
+    return default.arg(None) if default.is_callable else default.arg
+
+def _secondary_indexes(conn, table_name):
+    # Non-unique indexes only: unique ones enforce dedup (OR IGNORE) and must stay
+    rows = conn.execute(text(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = :t AND sql IS NOT NULL"
+    ), {'t': table_name}).all()
+    return [(name, sql) for name, sql in rows if 'UNIQUE' not in sql.upper().split('INDEX')[0]]
+
+def bulk_load(data, table=None, engine=None, on_conflict='ignore', drop_indexes=False, batch_size=BULK_BATCH_SIZE):
+    """
+    Inserts column data into a table in one transaction.
+
+    Args:
+        data: pd.DataFrame, pyarrow Table/RecordBatch, or {column: array/list/scalar}.
+            Scalars are broadcast; table columns that are missing get their
+            model default (e.g. tick_data.source = '', received_at = now).
+        table: SQLAlchemy Table (defaults to tick_data).
+        on_conflict (str | None): 'ignore' skips rows hitting a unique index,
+            'replace' overwrites them, None raises.
+        drop_indexes (bool): Drop the table's non-unique indexes during the
+            load and rebuild them afterwards (faster for loads much larger
+            than the table).
+
+    Returns:
+        dict: rows, inserted, seconds, rows_per_s.
+    """
+    table = table if table is not None else TickData.__table__
+    engine = engine if engine is not None else get_engine('ingest')
+    started = time.perf_counter()
+
+    columns = _as_columns(data)
+    unknown = set(columns) - set(table.columns.keys())
+    if unknown:
+        raise ValueError(f"{table.name} has no column(s) {sorted(unknown)}")
+    n_rows = max((len(v) for v in columns.values() if not (np.isscalar(v) or v is None)), default=0)
+    for column in table.columns:
+        if column.name not in columns and not column.primary_key and column.default is not None:
+            columns[column.name] = _default_value(column)
+
+    names = list(columns)
+    sql = (f"INSERT {CONFLICT_PREFIX[on_conflict]} INTO {table.name} ({', '.join(names)}) "
+           f"VALUES ({', '.join('?' * len(names))})")
+    values = [_column_values(columns[name], table.columns[name], n_rows) for name in names]
+
+    inserted = 0
+    if n_rows:
+        with engine.begin() as conn:
+            dropped = _secondary_indexes(conn, table.name) if drop_indexes else []
+            for name, _ in dropped:
+                conn.exec_driver_sql(f"DROP INDEX {name}")
+            dbapi_conn = conn.connection.dbapi_connection
+            before = dbapi_conn.total_changes
+            for offset in range(0, n_rows, batch_size):
+                rows = list(zip(*(col[offset:offset + batch_size] for col in values)))
+                conn.exec_driver_sql(sql, rows)
+            inserted = dbapi_conn.total_changes - before
+            for _, ddl in dropped:
+                conn.exec_driver_sql(ddl)
+
+    seconds = time.perf_counter() - started
+    return {'rows': n_rows, 'inserted': inserted, 'seconds': seconds,
+            'rows_per_s': n_rows / seconds if seconds > 0 else 0.0}
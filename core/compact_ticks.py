@@ -0,0 +1,207 @@
+"""
+Compact tick schema: ticks_compact plus the tick_symbols dictionary.
+
+tick_data keeps every tick as strings and doubles: symbol and source text,
+ISO timestamp text, an autoincrement id and a three-column unique index on
+top. ticks_compact stores the same tick as integers:
+
+    symbol_id, source_id   ids from the tick_symbols dictionary
+    ts                     int64 epoch nanoseconds (naive wall clock)
+    price                  int64, price * PRICE_SCALE
+    volume                 REAL (SQLite writes integral values as integers)
+
+in a WITHOUT ROWID table clustered on (symbol_id, ts, source_id), which is
+also the dedup key.
+
+load_compact() reads the integer columns through the raw sqlite3 cursor
+straight into a numpy structured array, so no timestamp string is parsed.
+tick_data stays the ingest table; migrate_tick_data() copies it (and its day
+partitions) over and can be re-run, ticks already copied are skipped.
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Ensure we can import from core
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from sqlalchemy import select
+
+from core.database import CompactTick, TickSymbol, get_engine
+from core.bulk_loader import bulk_load
+
+# 4 decimals: BIST equities tick in 0.01 (0.001 for some warrants), FX quotes in 0.0001
+PRICE_SCALE = 10_000
+
+# What load_compact() returns, ordered by (symbol_id, ts)
+TICK_DTYPE = np.dtype([
+    ('symbol_id', '<i8'),
+    ('ts', '<i8'),          # epoch-ns
+    ('price', '<f8'),
+    ('volume', '<f8'),
+])
+_RAW_DTYPE = np.dtype([('symbol_id', '<i8'), ('ts', '<i8'), ('price', '<i8'), ('volume', '<f8')])
+
+def encode_prices(prices):
+    """Float prices -> int64 multiples of 1/PRICE_SCALE (rounded to nearest)."""
+    return np.rint(np.asarray(prices, dtype=np.float64) * PRICE_SCALE).astype(np.int64)
+
+def decode_prices(price_ticks):
+    return np.asarray(price_ticks, dtype=np.float64) / PRICE_SCALE
+
+def to_epoch_ns(timestamps):
+    """datetime64 values or tick_data ISO strings -> int64 epoch-ns (NaT stays NaT's sentinel)."""
+    ts = pd.to_datetime(pd.Series(timestamps), format='ISO8601')
+    return ts.dt.as_unit('ns').to_numpy().view(np.int64)
+
+def symbol_ids(names, kind='symbol', engine=None, create=True):
+    """
+    {name: id} from the tick_symbols dictionary.
+
+    Args:
+        kind (str): 'symbol' or 'source'.
+        create (bool): Add names that have no id yet (needs a writable engine).
+    """
+    names = [str(n) for n in dict.fromkeys(names)]
+    if not names:
+        return {}
+    engine = engine if engine is not None else get_engine('ingest' if create else 'analytics')
+    table = TickSymbol.__table__
+    if create:
+        with engine.begin() as conn:
+            conn.execute(table.insert().prefix_with('OR IGNORE', dialect='sqlite'),
+                         [{'kind': kind, 'name': n} for n in names])
+    with engine.connect() as conn:
+        rows = conn.execute(select(table.c.name, table.c.id)
+                            .where(table.c.kind == kind, table.c.name.in_(names))).all()
+    return dict(rows)
+
+def symbol_names(kind='symbol', engine=None):
+    """{id: name} of every dictionary entry of one kind."""
+    engine = engine if engine is not None else get_engine('analytics')
+    table = TickSymbol.__table__
+    with engine.connect() as conn:
+        return dict(conn.execute(select(table.c.id, table.c.name).where(table.c.kind == kind)).all())
+
+def write_compact(ticks, engine=None, keep_received=False):
+    """
+    Inserts ticks into ticks_compact; ticks already stored are skipped.
+
+    Args:
+        ticks (pd.DataFrame): tick_data columns (symbol, price, volume,
+            timestamp, source, optionally received_at).
+        keep_received (bool): Also store received_at (NULL otherwise).
+
+    Returns:
+        int: Rows inserted.
+    """
+    if ticks.empty:
+        return 0
+    engine = engine if engine is not None else get_engine('ingest')
+    sources = ticks['source'].fillna('') if 'source' in ticks else pd.Series('', index=ticks.index)
+    sym = symbol_ids(ticks['symbol'].unique(), 'symbol', engine)
+    src = symbol_ids(sources.unique(), 'source', engine)
+
+    columns = {
+        'symbol_id': ticks['symbol'].map(sym).to_numpy(np.int64),
+        'ts': to_epoch_ns(ticks['timestamp']),
+        'source_id': sources.map(src).to_numpy(np.int64),
+        'price': encode_prices(ticks['price']),
+        'volume': ticks['volume'].fillna(0.0).to_numpy(np.float64),
+    }
+    if keep_received and 'received_at' in ticks:
+        received = pd.to_datetime(ticks['received_at'], format='ISO8601')
+        columns['received_ns'] = np.where(received.isna(), None, to_epoch_ns(received))
+    return bulk_load(columns, table=CompactTick.__table__, engine=engine)['inserted']
+
+def load_compact(symbols=None, start=None, end=None, engine=None, role='analytics'):
+    """
+    Ticks from ticks_compact as a TICK_DTYPE structured array ordered by
+    (symbol_id, ts). Rows go from the sqlite3 cursor into numpy as integers;
+    prices are divided by PRICE_SCALE in one vectorised step.
+
+    Args:
+        symbols (str | list | None): One symbol, several, or all.
+        start, end (datetime | str | None): Time range (end exclusive).
+    """
+    engine = engine if engine is not None else get_engine(role)
+    clauses, params = [], []
+    if symbols is not None:
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        ids = list(symbol_ids(symbols, 'symbol', engine, create=False).values())
+        if not ids:
+            return np.empty(0, dtype=TICK_DTYPE)
+        clauses.append(f"symbol_id IN ({', '.join('?' * len(ids))})")
+        params.extend(ids)
+    if start is not None:
+        clauses.append("ts >= ?")
+        params.append(int(pd.Timestamp(start).as_unit('ns').value))
+    if end is not None:
+        clauses.append("ts < ?")
+        params.append(int(pd.Timestamp(end).as_unit('ns').value))
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    sql = f"SELECT symbol_id, ts, price, volume FROM ticks_compact{where} ORDER BY symbol_id, ts"
+
+    with engine.connect() as conn:
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            cursor.execute(sql, params)
+            raw = np.fromiter(cursor, dtype=_RAW_DTYPE)
+        finally:
+            cursor.close()
+
+    ticks = np.empty(len(raw), dtype=TICK_DTYPE)
+    for name in ('symbol_id', 'ts', 'volume'):
+        ticks[name] = raw[name]
+    ticks['price'] = decode_prices(raw['price'])
+    return ticks
+
+def load_compact_frame(symbols=None, start=None, end=None, engine=None, role='analytics'):
+    """
+    load_compact() as a DataFrame with symbol, timestamp (datetime64[ns]),
+    price and volume, in (symbol, timestamp) order, like TickStore.query() minus
+    the id/source columns.
+    """
+    engine = engine if engine is not None else get_engine(role)
+    ticks = load_compact(symbols, start, end, engine=engine)
+    names = symbol_names('symbol', engine)
+    return pd.DataFrame({
+        'symbol': pd.Series(ticks['symbol_id']).map(names),
+        'timestamp': ticks['ts'].view('datetime64[ns]'),
+        'price': ticks['price'],
+        'volume': ticks['volume'],
+    })
+
+def migrate_tick_data(store=None, engine=None, batch_size=100_000, keep_received=False):
+    """
+    Copies tick_data and every day partition (including archived ones) into
+    ticks_compact. Safe to re-run: ticks already copied are skipped.
+
+    Args:
+        store: core.tick_store.TickStore to read from.
+        engine: Engine holding ticks_compact (defaults to the 'ingest' engine).
+
+    Returns:
+        dict: rows_read, rows_written, tables (names read).
+    """
+    if store is None:
+        from core.tick_store import get_tick_store
+        store = get_tick_store('analytics')
+    engine = engine if engine is not None else get_engine('ingest')
+    TickSymbol.__table__.create(engine, checkfirst=True)
+    CompactTick.__table__.create(engine, checkfirst=True)
+
+    read = written = 0
+    tables = []
+    for table, batch in store.scan(batch_size):
+        if not tables or tables[-1] != table:
+            tables.append(table)
+        read += len(batch)
+        written += write_compact(batch, engine=engine, keep_received=keep_received)
+    return {'rows_read': read, 'rows_written': written, 'tables': tables}
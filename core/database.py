@@ -1,31 +1,297 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime
+from sqlalchemy import create_engine, event, Column, Integer, BigInteger, String, Float, DateTime, LargeBinary, Index, inspect, text
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import declarative_base, sessionmaker
 import os
+import threading
+import time
 from datetime import datetime
+from pathlib import Path
 
 # Define database file path
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DB_PATH = os.path.join(BASE_DIR, 'data', 'database', 'market_data.db')
+# BIST_DB_PATH lets benchmarks and tests point the system at a scratch database
+DB_PATH = os.environ.get('BIST_DB_PATH', os.path.join(BASE_DIR, 'data', 'database', 'market_data.db'))
 DB_URL = f"sqlite:///{DB_PATH}"
+# BIST_DB_READ_ONLY=1 (or set_read_only()) for analysis processes: no writer engine, no DDL
+READ_ONLY = os.environ.get('BIST_DB_READ_ONLY', '').lower() in ('1', 'true', 'yes')
 
-# SQLAlchemy setup
+TICK_UNIQUE_INDEX = 'ux_tick_symbol_ts_source'
+
+# Connection tuning: one writer, many concurrent readers (WAL)
+BUSY_TIMEOUT_MS = 5000            # a blocked writer waits this long before "database is locked"
+MMAP_SIZE = 256 * 1024 * 1024     # readers page through the OS cache instead of copying into SQLite's
+LOCK_CONTENDED_MS = 1.0           # BEGIN IMMEDIATE slower than this counts as a contended lock
+
+# Engine per role. Readers open the file read-only, so they can never take the write lock.
+ENGINE_ROLES = {
+    'ingest':    {'read_only': False, 'cache_mb': 16,  'pool_size': 1},  # socket server, fetch scripts
+    'analytics': {'read_only': True,  'cache_mb': 128, 'pool_size': 4},  # feature engine, training, replay
+    'dashboard': {'read_only': True,  'cache_mb': 32,  'pool_size': 8},  # Streamlit session threads
+}
+
+class LockStats:
+    """
+    Write-lock contention of one engine role. Every write transaction starts
+    with BEGIN IMMEDIATE, so the time spent in it is the wait for the lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.transactions = 0
+            self.contended = 0
+            self.busy_errors = 0
+            self.total_wait_ms = 0.0
+            self.max_wait_ms = 0.0
+
+    def record(self, wait_ms):
+        with self._lock:
+            self.transactions += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+            if wait_ms >= LOCK_CONTENDED_MS:
+                self.contended += 1
+
+    def busy(self):
+        with self._lock:
+            self.busy_errors += 1
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                'transactions': self.transactions,
+                'contended': self.contended,
+                'busy_errors': self.busy_errors,
+                'total_wait_ms': self.total_wait_ms,
+                'avg_wait_ms': self.total_wait_ms / self.transactions if self.transactions else 0.0,
+                'max_wait_ms': self.max_wait_ms,
+            }
+
+_engines = {}
+_sessions = {}
+_lock_stats = {role: LockStats() for role in ENGINE_ROLES}
+_engines_lock = threading.Lock()
+_schema_lock = threading.Lock()
+_schema_ready = False
+
+def _tune_connection(dbapi_conn, read_only, cache_mb):
+    cursor = dbapi_conn.cursor()
+    if read_only:
+        cursor.execute("PRAGMA query_only=ON")
+    else:
+        # WAL is persistent in the file; NORMAL only fsyncs at checkpoints, which
+        # can lose the last commits on power loss but never corrupts the database
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+    cursor.execute(f"PRAGMA cache_size={-cache_mb * 1024}")  # negative = KiB
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+def _create_engine(role):
+    settings = ENGINE_ROLES[role]
+    read_only = settings['read_only']
+    if read_only:
+        url = f"sqlite:///file:{Path(DB_PATH).as_posix()}?mode=ro&uri=true"
+    else:
+        url = DB_URL
+    new_engine = create_engine(url, echo=False, pool_size=settings['pool_size'], max_overflow=4,
+                               pool_timeout=BUSY_TIMEOUT_MS / 1000)
+    stats = _lock_stats[role]
+
+    @event.listens_for(new_engine, 'connect')
+    def on_connect(dbapi_conn, record):
+        _tune_connection(dbapi_conn, read_only, settings['cache_mb'])
+        if not read_only:
+            # Let SQLAlchemy's 'begin' below issue the BEGIN instead of the driver
+            dbapi_conn.isolation_level = None
+
+    if not read_only:
+        @event.listens_for(new_engine, 'begin')
+        def on_begin(conn):
+            if conn.get_execution_options().get('isolation_level') == 'AUTOCOMMIT':
+                return  # VACUUM and friends must run outside a transaction
+            started = time.perf_counter()
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+            stats.record((time.perf_counter() - started) * 1000)
+
+    @event.listens_for(new_engine, 'handle_error')
+    def on_error(context):
+        if 'database is locked' in str(context.original_exception):
+            stats.busy()
+
+    return new_engine
+
+def get_engine(role='ingest'):
+    """
+    Returns the process-wide engine for a role (see ENGINE_ROLES), creating it
+    on first use. 'ingest' is the only engine that writes; the others are
+    read-only. The schema is created/upgraded once, the first time the
+    ingest engine is requested (or a reader finds no database file).
+    """
+    if role not in ENGINE_ROLES:
+        raise ValueError(f"role must be one of {list(ENGINE_ROLES)}")
+    writer = not ENGINE_ROLES[role]['read_only']
+    if writer and READ_ONLY:
+        raise RuntimeError(f"Database is in read-only mode; the '{role}' engine is not available")
+    with _engines_lock:
+        created = role not in _engines
+        if created:
+            _engines[role] = _create_engine(role)
+        role_engine = _engines[role]
+    if writer:
+        _ensure_schema(role_engine)
+    elif created and not READ_ONLY and not os.path.exists(DB_PATH):
+        # Fresh checkout: readers need the file to exist
+        get_engine('ingest')
+    return role_engine
+
+def get_session_factory(role='ingest'):
+    """Process-wide sessionmaker bound to get_engine(role)."""
+    with _engines_lock:
+        factory = _sessions.get(role)
+    if factory is None:
+        factory = sessionmaker(bind=get_engine(role))
+        with _engines_lock:
+            factory = _sessions.setdefault(role, factory)
+    return factory
+
+def set_read_only(enabled=True):
+    """
+    Read-only mode for analysis processes (same as BIST_DB_READ_ONLY=1):
+    the ingest engine, SessionLocal and init_db() refuse to run, so the
+    process never writes or needs write access to the data directory.
+    """
+    global READ_ONLY
+    READ_ONLY = enabled
+
+def __getattr__(name):
+    # engine and SessionLocal are created on first use, not at import
+    if name == 'engine':
+        return get_engine('ingest')
+    if name == 'SessionLocal':
+        return get_session_factory('ingest')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def lock_stats(role=None):
+    """Write-lock wait counters for one role, or a dict of all roles."""
+    if role is not None:
+        return _lock_stats[role].as_dict()
+    return {name: stats.as_dict() for name, stats in _lock_stats.items()}
+
+def reset_lock_stats():
+    for stats in _lock_stats.values():
+        stats.reset()
+
+# SQLAlchemy setup (engines and sessions: get_engine / get_session_factory)
 Base = declarative_base()
-engine = create_engine(DB_URL, echo=False)
-SessionLocal = sessionmaker(bind=engine)
 
 class TickData(Base):
+    """
+    One trade (or 1-minute bar close for history feeds).
+    (symbol, timestamp, source) is unique, so re-sent history is ignored
+    instead of duplicated (see core.tick_writer and compact_tick_data).
+    """
     __tablename__ = 'tick_data'
+    __table_args__ = (Index(TICK_UNIQUE_INDEX, 'symbol', 'timestamp', 'source', unique=True),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     symbol = Column(String, index=True)
     price = Column(Float)
     volume = Column(Float, nullable=True)
     timestamp = Column(DateTime)
+    source = Column(String, nullable=False, default='', server_default='')  # Feed name ('' = unknown / legacy)
     received_at = Column(DateTime, default=datetime.utcnow)
 
     def __repr__(self):
         return f"<Tick(stock='{self.symbol}', price={self.price}, time='{self.timestamp}')>"
 
+class TickSymbol(Base):
+    """
+    Dictionary of the names behind CompactTick's integer ids: kind 'symbol'
+    for stock symbols, 'source' for feed names.
+    """
+    __tablename__ = 'tick_symbols'
+    __table_args__ = (Index('ux_tick_symbols_kind_name', 'kind', 'name', unique=True),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    kind = Column(String, nullable=False)
+    name = Column(String, nullable=False)
+
+    def __repr__(self):
+        return f"<TickSymbol({self.id}, {self.kind}='{self.name}')>"
+
+class CompactTick(Base):
+    """
+    tick_data in compact form (core.compact_ticks): dictionary ids instead of
+    strings, int64 epoch-ns timestamps (naive wall clock, like tick_data) and
+    prices as integer multiples of 1/PRICE_SCALE.
+    (symbol_id, ts, source_id) is the clustered key of a WITHOUT ROWID table,
+    so there is no id column or separate dedup index and each symbol's ticks
+    are stored contiguously in time order.
+    """
+    __tablename__ = 'ticks_compact'
+    __table_args__ = {'sqlite_with_rowid': False}
+
+    symbol_id = Column(Integer, primary_key=True, autoincrement=False)
+    ts = Column(BigInteger, primary_key=True, autoincrement=False)
+    source_id = Column(Integer, primary_key=True, autoincrement=False)
+    price = Column(BigInteger, nullable=False)
+    volume = Column(Float, nullable=False, default=0.0)
+    received_ns = Column(BigInteger, nullable=True)  # Only kept when asked for (see migrate_tick_data)
+
+    def __repr__(self):
+        return f"<CompactTick(symbol_id={self.symbol_id}, ts={self.ts}, price={self.price})>"
+
+class OrderBookSnapshot(Base):
+    """
+    Top-N L2 order book captured at ingest, with the imbalance computed from it.
+    bids/asks hold packed little-endian float64 [price, qty] pairs
+    (see core.orderflow.pack_levels / unpack_levels).
+    """
+    __tablename__ = 'order_book_snapshots'
+    __table_args__ = (Index('ix_order_book_symbol_ts', 'symbol', 'timestamp'),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    symbol = Column(String)
+    timestamp = Column(DateTime)
+    depth = Column(Integer)  # Levels stored per side
+    bids = Column(LargeBinary)
+    asks = Column(LargeBinary)
+    imbalance = Column(Float)
+    weighted_imbalance = Column(Float)
+    received_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<Book(stock='{self.symbol}', imbalance={self.imbalance}, time='{self.timestamp}')>"
+
+class OHLCVBar(Base):
+    """
+    Closed OHLCV bar per (timeframe, symbol, start), written incrementally by the
+    ingestion server as ticks arrive (core.bar_store). The current bar only
+    lives in the server's memory until it closes.
+    """
+    __tablename__ = 'ohlcv_bars'
+    __table_args__ = (Index('ux_bars_tf_symbol_start', 'timeframe', 'symbol', 'start', unique=True),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    symbol = Column(String)
+    timeframe = Column(String)  # pandas offset alias: '1s', '1min', '5min'
+    start = Column(DateTime)    # Bucket start (inclusive)
+    open = Column(Float)
+    high = Column(Float)
+    low = Column(Float)
+    close = Column(Float)
+    volume = Column(Float)
+    tick_count = Column(Integer)
+
+    def __repr__(self):
+        return f"<Bar('{self.symbol}', {self.timeframe}, start='{self.start}', close={self.close})>"
+
 class MacroData(Base):
     """
     Stores macroeconomic indicators (Inflation, Interest Rate, USDTRY, etc.)
@@ -60,10 +326,92 @@ class FundFlow(Base):
         return f"<Fund('{self.fund_code}', stock%={self.stock_allocation_pct}, date='{self.date}')>"
 
 def init_db():
-    """Initializes the database by creating tables."""
-    # Ensure directory exists
-    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
-    Base.metadata.create_all(engine)
+    """
+    Creates missing tables and upgrades old ones. Runs by itself the first
+    time the ingest engine is used; calling it again re-checks the schema.
+    """
+    with _schema_lock:
+        was_ready = _schema_ready
+    bind = get_engine('ingest')  # first use runs the schema check itself
+    if was_ready:
+        _ensure_schema(bind, force=True)
+
+def _ensure_schema(bind, force=False):
+    global _schema_ready
+    if _schema_ready and not force:
+        return
+    with _schema_lock:
+        if _schema_ready and not force:
+            return
+        # Ensure directory exists
+        os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+        Base.metadata.create_all(bind)
+        _upgrade_tick_data(bind)
+        _schema_ready = True
+
+def _add_source_column(bind):
+    columns = {c['name'] for c in inspect(bind).get_columns('tick_data')}
+    if 'source' not in columns:
+        with bind.begin() as conn:
+            conn.execute(text("ALTER TABLE tick_data ADD COLUMN source VARCHAR NOT NULL DEFAULT ''"))
+
+def _upgrade_tick_data(bind):
+    """
+    Brings tick_data tables created before the dedup key up to date:
+    adds the source column and the unique index. The index cannot be built
+    while duplicates exist; compact_tick_data() removes them.
+    """
+    _add_source_column(bind)
+    indexes = {i['name'] for i in inspect(bind).get_indexes('tick_data')}
+    if TICK_UNIQUE_INDEX not in indexes:
+        try:
+            with bind.begin() as conn:
+                conn.execute(text(
+                    f"CREATE UNIQUE INDEX {TICK_UNIQUE_INDEX} ON tick_data (symbol, timestamp, source)"
+                ))
+        except IntegrityError:
+            print("[!] tick_data contains duplicate ticks; run 'python scripts/compact_ticks.py' "
+                  "to remove them and enable deduplication.")
+            return False
+    return True
+
+def compact_tick_data(bind=None, keep='first', legacy_source=None):
+    """
+    Removes duplicate ticks in place and enables the unique index.
+
+    Args:
+        bind: Target engine (defaults to the project database).
+        keep (str): 'first' keeps the earliest inserted copy, 'last' the newest.
+        legacy_source (str | None): Assign this source to rows stored before the
+            source column existed (''), so they collapse with re-sent copies.
+
+    Returns:
+        dict: rows_before, rows_after, removed.
+    """
+    bind = bind if bind is not None else get_engine('ingest')
+    if keep not in ('first', 'last'):
+        raise ValueError("keep must be 'first' or 'last'")
+    agg = 'MIN' if keep == 'first' else 'MAX'
+
+    Base.metadata.tables['tick_data'].create(bind, checkfirst=True)
+    _add_source_column(bind)
+    with bind.begin() as conn:
+        before = conn.execute(text("SELECT COUNT(*) FROM tick_data")).scalar()
+        if legacy_source:
+            # Drop legacy rows that already exist under the new source name first
+            conn.execute(text(
+                "DELETE FROM tick_data WHERE source = '' AND EXISTS ("
+                "SELECT 1 FROM tick_data t WHERE t.symbol = tick_data.symbol "
+                "AND t.timestamp = tick_data.timestamp AND t.source = :src)"
+            ), {'src': legacy_source})
+            conn.execute(text("UPDATE tick_data SET source = :src WHERE source = ''"), {'src': legacy_source})
+        conn.execute(text(
+            f"DELETE FROM tick_data WHERE id NOT IN "
+            f"(SELECT {agg}(id) FROM tick_data GROUP BY symbol, timestamp, source)"
+        ))
+        conn.execute(text(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {TICK_UNIQUE_INDEX} ON tick_data (symbol, timestamp, source)"
+        ))
+        after = conn.execute(text("SELECT COUNT(*) FROM tick_data")).scalar()
+    return {'rows_before': before, 'rows_after': after, 'removed': before - after}
 
-# Auto-initialize when imported, or can be called explicitly
-init_db()
@@ -0,0 +1,98 @@
+"""
+LRU cache of computed feature frames.
+
+The dashboard scanner and chart view, run_bot and the committee often build
+the same feature frame for the same symbol within seconds. Entries are keyed
+by what determines the frame:
+
+    (symbol, timeframe, indicator set, window, data version)
+
+where the data version is the symbol's newest tick (id, timestamp) from
+TickStore.newest(). A new tick changes the key, so stale entries are never
+returned; they simply age out of the LRU. Memory is bounded by an entry
+count and by the frames' total size.
+
+core.feature_engine owns the process-wide instance (feature_cache_stats(),
+clear_feature_cache()).
+"""
+import threading
+from collections import OrderedDict
+
+MAX_ENTRIES = 512
+MAX_BYTES = 256 * 1024 * 1024
+
+class FeatureCache:
+    """
+    Thread-safe LRU of DataFrames. get() hands out shallow copies, so callers
+    adding columns (add_indicators does) never change a cached frame.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.nbytes = 0
+        self._entries = OrderedDict()   # key -> (frame, nbytes)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """The cached frame for `key` (a copy), or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return entry[0].copy(deep=False)
+
+    def put(self, key, frame):
+        nbytes = int(frame.memory_usage(index=True, deep=False).sum())
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[1]
+            if nbytes > self.max_bytes:
+                return
+            self._entries[key] = (frame.copy(deep=False), nbytes)
+            self.nbytes += nbytes
+            while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.nbytes -= evicted
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """get(key), else compute() stored under `key` (empty frames are not cached)."""
+        frame = self.get(key)
+        if frame is None:
+            frame = compute()
+            if not frame.empty:
+                self.put(key, frame)
+        return frame
+
+    def invalidate(self, symbol=None):
+        """Drops every entry (or those of one symbol, the key's first element)."""
+        with self._lock:
+            for key in [k for k in self._entries if symbol is None or k[0] == symbol]:
+                self.nbytes -= self._entries.pop(key)[1]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.nbytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
@@ -1,8 +1,9 @@
+import numpy as np
 import pandas as pd
 import pandas_ta as ta
 import sys
 import os
-from sqlalchemy.orm import Session
+from sqlalchemy import text
 
 # Ensure we can import from core
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -10,89 +11,327 @@ project_root = os.path.dirname(os.path.dirname(current_dir))
 if project_root not in sys.path:
     sys.path.append(project_root)
 
-from core.database import SessionLocal, TickData, engine
+from core.database import get_engine
+from core.orderflow import unpack_levels
+from core.tick_store import get_tick_store
+from core.bar_builder import BAR_TIMEFRAMES
+from core.bar_store import fetch_bars, fetch_bars_many
+from core.bar_ring import read_ring_bars
+from core.macro_service import get_macro_service
+from core.feature_cache import FeatureCache
+from core.feature_registry import registry, register_indicator
+from core import indicator_kernels
 
-def fetch_and_process_data(symbol, timeframe='1min', limit=5000):
+INDICATOR_BACKENDS = ('pandas_ta', 'numba')
+# Computes the built-in indicators; 'numba' uses core/indicator_kernels.py (set_indicator_backend())
+INDICATOR_BACKEND = 'pandas_ta'
+
+# Process-wide cache of finished feature frames (see core/feature_cache.py)
+_feature_cache = FeatureCache()
+
+def fetch_and_process_data(symbol, timeframe='1min', limit=5000, role='analytics', macro=False, cache=True,
+                           rows=None, features=None):
     """
     Fetches raw tick data from DB, resamples to OHLC, and calculates indicators.
     
     Args:
         symbol (str): Stock symbol (e.g., 'THYAO')
         timeframe (str): Resample timeframe (e.g., '1min')
-        limit (int): Number of tick records to fetch
+        limit (int): Number of bars to fetch (the newest ones, see fetch_ohlcv)
+        role (str): Read-only engine role ('analytics' or 'dashboard')
+        macro (bool): Append macro/fund series as of each bar (add_macro_features)
+        cache (bool): Reuse the frame built for the same newest tick (feature cache)
+        rows (int | None): Instead of `limit`, fetch exactly the bars the
+            indicators' warm-up needs for the newest `rows` feature rows
+            (see core.feature_registry) and return those rows.
+        features (list | None): Registered indicator names (default: all).
         
     Returns:
         pd.DataFrame: Processed dataframe with OHLCV and indicators.
     """
-    # 1. Fetch Data
-    query = f"SELECT * FROM tick_data WHERE symbol = '{symbol}' ORDER BY timestamp DESC LIMIT {limit}"
-    
+    def compute():
+        if rows is None:
+            df_resampled = fetch_ohlcv(symbol, timeframe=timeframe, limit=limit, role=role)
+        else:
+            df_resampled = fetch_many([symbol], timeframe=timeframe, role=role, cache=False,
+                                      rows=rows, features=features).get(symbol, pd.DataFrame())
+        if df_resampled.empty:
+            return df_resampled
+        df = add_indicators(df_resampled, features)
+        if rows is not None:
+            df = df.tail(rows)
+        if macro:
+            df = add_macro_features(df, role=role)
+        return df
+
+    version = _tick_versions([symbol], role).get(symbol) if cache else None
+    if version is None:
+        return compute()
+    window = limit if rows is None else ('rows', rows)
+    return _feature_cache.get_or_compute(_feature_key(symbol, timeframe, window, version, macro, role, features),
+                                         compute)
+
+def _tick_versions(symbols, role):
+    # {symbol: newest hot tick}; empty if the probe fails (the caller then computes uncached)
     try:
-        df = pd.read_sql(query, engine)
+        return get_tick_store(role).newest(symbols)
     except Exception as e:
-        print(f"[!] Error fetching data: {e}")
-        return pd.DataFrame()
+        print(f"[!] Error reading tick versions: {e}")
+        return {}
 
-    if df.empty:
-        print(f"[!] No data found for {symbol}")
-        return pd.DataFrame()
+def _feature_key(symbol, timeframe, window, version, macro=False, role='analytics', features=None):
+    indicator_set = registry.signature(features) + (('backend', INDICATOR_BACKEND),)
+    if macro:
+        indicator_set += (('macro', get_macro_service(role).version()),)
+    return (symbol, timeframe, indicator_set, window, version)
 
-    # Sort by time ascending for proper resampling
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    df = df.sort_values('timestamp')
-    df.set_index('timestamp', inplace=True)
-
-    # 2. Resample (Tick -> OHLCV)
-    # Open: first, High: max, Low: min, Close: last, Volume: sum
-    ohlc_dict = {
-        'price': ['first', 'max', 'min', 'last'],
-        'volume': 'sum'
-    }
-    
-    # Resample
-    df_resampled = df.resample(timeframe).agg(ohlc_dict)
-    
-    # Flatten multi-index columns
-    df_resampled.columns = ['open', 'high', 'low', 'close', 'volume']
-    
+def feature_cache_stats():
+    """Entries, bytes, hits, misses, evictions and hit_rate of the feature cache."""
+    return _feature_cache.stats()
+
+def clear_feature_cache(symbol=None):
+    _feature_cache.invalidate(symbol)
+
+def set_indicator_backend(name):
+    """
+    Selects how add_indicators() computes the built-in indicators (same as
+    BIST_INDICATOR_BACKEND=name): 'pandas_ta', or 'numba' for the compiled
+    kernels in core/indicator_kernels.py (same values, see its docstring).
+    """
+    global INDICATOR_BACKEND
+    if name not in INDICATOR_BACKENDS:
+        raise ValueError(f"Unknown indicator backend: {name} (expected one of {INDICATOR_BACKENDS})")
+    if name == 'numba' and not indicator_kernels.NUMBA_AVAILABLE:
+        print("[!] numba is not installed; the 'numba' indicator backend runs as plain Python")
+    INDICATOR_BACKEND = name
+
+def load_archived_data(symbol, timeframe='1min', start=None, end=None):
+    """
+    Like fetch_and_process_data, but reads months of history from the Parquet
+    archive (core/parquet_archive.py, filled by scripts/export_parquet.py).
+
+    Returns:
+        pd.DataFrame: Processed dataframe, empty if nothing is archived.
+    """
+    from core.parquet_archive import load_ohlcv
+
+    df_resampled = load_ohlcv(symbol, timeframe=timeframe, start=start, end=end)
+    if df_resampled.empty:
+        return df_resampled
+    return add_indicators(df_resampled)
+
+def fetch_ohlcv(symbol, timeframe='1min', limit=5000, role='analytics'):
+    """
+    Fetches the newest `limit` OHLCV bars (no indicators). Stored timeframes
+    (BAR_TIMEFRAMES) are read from the ingestion server's shared-memory ring
+    (core.bar_ring) when it holds `limit` bars, else from ohlcv_bars; other
+    timeframes, or a database without stored bars yet, are resampled from
+    as many of the newest ticks as `limit` bars take (TickStore.latest_bars).
+    Live consumers seed core.tick_bus.BarCache with this once.
+    """
+    if timeframe in BAR_TIMEFRAMES:
+        bars = read_ring_bars(symbol, timeframe, limit)
+        if bars is not None:
+            return bars
+        try:
+            bars = fetch_bars(symbol, timeframe=timeframe, limit=limit, role=role)
+            if not bars.empty:
+                return bars
+        except Exception as e:
+            print(f"[!] Error fetching bars: {e}")
+
+    # Resample (Tick -> OHLCV) the newest ticks across the hot table and day partitions
     # Drop empty bins (minutes with no trades)
     # Using dropna() changes the timeline continuity, but fills are dangerous for indicators if gap is huge.
     # For now, we drop empty bars.
-    df_resampled.dropna(inplace=True)
+    try:
+        df_resampled = get_tick_store(role).latest_bars([symbol], timeframe, limit).get(symbol)
+    except Exception as e:
+        print(f"[!] Error fetching data: {e}")
+        return pd.DataFrame()
 
-    if df_resampled.empty:
-        print("[!] Resampling resulted in empty dataframe (not enough density?)")
+    if df_resampled is None or df_resampled.empty:
+        print(f"[!] No data found for {symbol}")
         return pd.DataFrame()
 
-    # 3. Calculate Indicators
+    return df_resampled
+
+def fetch_many(symbols, timeframe='1min', lookback=5000, role='analytics', indicators=False, cache=True,
+               rows=None, features=None):
+    """
+    fetch_ohlcv for a whole symbol list: rings first, then one stored-bars
+    query for the symbols still missing, then tick reads for the rest (one
+    statement per table and window, see TickStore.latest_bars) resampled
+    for all of them in a single grouped pass.
+
+    Args:
+        lookback (int): Bars per symbol, like fetch_ohlcv's limit.
+        indicators (bool): Run add_indicators on every frame.
+        cache (bool): With indicators, serve symbols without new ticks from
+            the feature cache (one newest-tick probe for the whole list).
+        rows (int | None): Instead of `lookback`, fetch exactly
+            registry.bars_needed(rows) bars per symbol, i.e. `rows` feature
+            rows after the indicators' warm-up; with indicators, frames are
+            cut to `rows`.
+        features (list | None): Registered indicator names (default: all).
+
+    Returns:
+        dict: {symbol: DataFrame} in input order; symbols without data are left out.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    n_bars = registry.bars_needed(rows, features) if rows is not None else lookback
+    window = lookback if rows is None else ('rows', rows)
+    frames = {}
+    cached = {}
+    versions = _tick_versions(symbols, role) if indicators and cache else {}
+    for symbol, version in versions.items():
+        if version is not None:
+            df = _feature_cache.get(_feature_key(symbol, timeframe, window, version, features=features))
+            if df is not None:
+                cached[symbol] = df
+    wanted = [s for s in symbols if s not in cached]
+
+    short = {}
+    if timeframe in BAR_TIMEFRAMES:
+        for symbol in wanted:
+            bars = read_ring_bars(symbol, timeframe, n_bars)
+            if bars is not None:
+                frames[symbol] = bars
+        missing = [s for s in wanted if s not in frames]
+        if missing:
+            try:
+                frames.update(fetch_bars_many(missing, timeframe=timeframe, limit=n_bars, role=role))
+            except Exception as e:
+                print(f"[!] Error fetching bars: {e}")
+        if rows is not None:
+            # Stored bars not covering the warm-up: try the ticks, keep whichever is longer
+            short = {s: df for s, df in frames.items() if len(df) < n_bars}
+            for symbol in short:
+                del frames[symbol]
+
+    # Ticks are read until they resample to n_bars bars (TickStore.latest_bars)
+    missing = [s for s in wanted if s not in frames]
+    if missing:
+        try:
+            frames.update(get_tick_store(role).latest_bars(missing, timeframe, n_bars))
+        except Exception as e:
+            print(f"[!] Error fetching data: {e}")
+        for symbol, df in short.items():
+            if len(df) > len(frames.get(symbol, ())):
+                frames[symbol] = df
+
+    result = {}
+    for symbol in symbols:
+        if symbol in cached:
+            result[symbol] = cached[symbol]
+            continue
+        df = frames.get(symbol)
+        if df is None or df.empty:
+            continue
+        if indicators:
+            df = add_indicators(df, features)
+            if rows is not None:
+                df = df.tail(rows)
+            if df.empty:
+                continue
+            if versions.get(symbol) is not None:
+                _feature_cache.put(_feature_key(symbol, timeframe, window, versions[symbol], features=features), df)
+        result[symbol] = df
+    return result
+
+def add_indicators(df_resampled, features=None):
+    """
+    Adds the model's indicator columns to an OHLCV frame and drops warm-up
+    rows. The columns come from core.feature_registry (default: every
+    registered indicator, the ones below first).
+
+    Args:
+        features (list | None): Registered indicator names to add.
+    """
+    return registry.compute(df_resampled, features)
+
+# 3. Indicators (warm-up = leading NaN bars of each, see core/feature_registry.py)
+# talib=False: pandas_ta switches to TA-Lib whenever it is installed, which seeds RSI/EMA/MACD
+# differently; core.streaming_indicators, core.panel_features and the numba backend reproduce the pandas path
+@register_indicator('rsi_14', ['RSI_14'], warmup=14)
+def _rsi_14(bars):
+    if INDICATOR_BACKEND == 'numba':
+        return indicator_kernels.rsi(bars['close'].to_numpy(), 14)
+    return ta.rsi(bars['close'], length=14, talib=False)
+
+@register_indicator('sma_50', ['SMA_50'], warmup=49)
+def _sma_50(bars):
+    if INDICATOR_BACKEND == 'numba':
+        return indicator_kernels.sma(bars['close'].to_numpy(), 50)
+    return ta.sma(bars['close'], length=50, talib=False)
+
+# EMA 200 (Trend)
+@register_indicator('ema_200', ['EMA_200'], warmup=199)
+def _ema_200(bars):
+    if INDICATOR_BACKEND == 'numba':
+        return indicator_kernels.ema(bars['close'].to_numpy(), 200)
+    return ta.ema(bars['close'], length=200, talib=False)
+
+# MACD (12, 26, 9): MACD_12_26_9, MACDh_12_26_9, MACDs_12_26_9; the signal starts 8 bars after the slow EMA
+@register_indicator('macd_12_26_9', ['MACD_12_26_9', 'MACDh_12_26_9', 'MACDs_12_26_9'], warmup=33)
+def _macd_12_26_9(bars):
+    if INDICATOR_BACKEND == 'numba':
+        return np.column_stack(indicator_kernels.macd(bars['close'].to_numpy(), 12, 26, 9))
+    return ta.macd(bars['close'], fast=12, slow=26, signal=9, talib=False)
+
+# Bollinger Bands (20, 2)
+@register_indicator('bbands_20_2', ['BBL_20_2.0', 'BBM_20_2.0', 'BBU_20_2.0', 'BBB_20_2.0', 'BBP_20_2.0'], warmup=19)
+def _bbands_20_2(bars):
+    if INDICATOR_BACKEND == 'numba':
+        return np.column_stack(indicator_kernels.bbands(bars['close'].to_numpy(), 20, 2.0))
+    return ta.bbands(bars['close'], length=20, std=2.0, talib=False)
+
+set_indicator_backend(os.environ.get('BIST_INDICATOR_BACKEND', INDICATOR_BACKEND))
+
+def add_macro_features(df, columns=None, role='analytics'):
+    """
+    Appends the macro_data / fund_flow series as of each bar (last value
+    published at or before the bar, see core.macro_service). The series are
+    cached per process, so this costs one searchsorted per call.
+
+    Args:
+        columns (list | None): Series to add (default: all, e.g. 'inflation_cpi',
+            'usd_try', 'fund_stock_pct_mean'). NaN before a series' first value.
+    """
+    return get_macro_service(role).join(df, columns)
+
+def fetch_order_book(symbol, limit=5000, role='analytics'):
+    """
+    Fetches stored order book snapshots with their imbalance scores.
+
+    Args:
+        symbol (str): Stock symbol (e.g., 'THYAO')
+        limit (int): Number of most recent snapshots to fetch
+        role (str): Read-only engine role ('analytics' or 'dashboard')
+
+    Returns:
+        pd.DataFrame: Timestamp-indexed imbalance, weighted_imbalance,
+        best_bid, best_ask (oldest first).
+    """
+    query = text(
+        "SELECT timestamp, bids, asks, imbalance, weighted_imbalance FROM order_book_snapshots "
+        "WHERE symbol = :symbol ORDER BY timestamp DESC LIMIT :limit"
+    )
+
     try:
-        # RSI 14
-        df_resampled['RSI_14'] = ta.rsi(df_resampled['close'], length=14)
-        
-        # SMA 50
-        df_resampled['SMA_50'] = ta.sma(df_resampled['close'], length=50)
-        
-        # EMA 200 (Trend)
-        df_resampled['EMA_200'] = ta.ema(df_resampled['close'], length=200)
-        
-        # MACD (12, 26, 9)
-        macd = ta.macd(df_resampled['close'], fast=12, slow=26, signal=9)
-        if macd is not None:
-             # macd returns 3 columns: MACD_12_26_9, MACDh_12_26_9, MACDs_12_26_9
-             # We rename them for simpler access
-            df_resampled = pd.concat([df_resampled, macd], axis=1)
-
-        # Bollinger Bands (20, 2)
-        bbands = ta.bbands(df_resampled['close'], length=20, std=2.0)
-        if bbands is not None:
-            df_resampled = pd.concat([df_resampled, bbands], axis=1)
-            
+        df = pd.read_sql(query, get_engine(role), params={'symbol': symbol, 'limit': limit})
     except Exception as e:
-        print(f"[!] Indicator calculation error: {e}")
+        print(f"[!] Error fetching order book: {e}")
+        return pd.DataFrame()
+
+    if df.empty:
+        return pd.DataFrame()
+
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    df = df.sort_values('timestamp').set_index('timestamp')
 
-    # 4. Cleaning (dropna)
-    # Drops rows where indicators are NaN (e.g. first 200 rows for EMA_200)
-    # Note: If data is insufficient (< 200 bars), this might result in empty DF.
-    df_final = df_resampled.dropna()
+    # Level 1 only; unpack_levels() on the blobs gives the full depth
+    df['best_bid'] = [lv[0, 0] if len(lv) else float('nan') for lv in map(unpack_levels, df['bids'])]
+    df['best_ask'] = [lv[0, 0] if len(lv) else float('nan') for lv in map(unpack_levels, df['asks'])]
 
-    return df_final
+    return df.drop(columns=['bids', 'asks'])
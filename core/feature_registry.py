@@ -0,0 +1,109 @@
+"""
+Registry of the indicator columns appended to OHLCV bars.
+
+Each indicator declares its warm-up: the number of leading bars for which
+it is still NaN. add_indicators() drops those rows, so a caller wanting
+`rows` feature rows needs exactly
+
+    bars_needed(rows) = rows + max(warm-up of the selected indicators)
+
+bars, and core.feature_engine fetches that many (fetch_many(rows=...),
+fetch_and_process_data(rows=...)) instead of guessing a tick limit.
+
+New indicators are plugged in with the decorator, no engine edits needed:
+
+    @register_indicator('atr_14', ['ATR_14'], warmup=14)
+    def atr_14(bars):
+        return ta.atr(bars['high'], bars['low'], bars['close'], length=14)
+
+The compute function gets the OHLCV frame (plus columns added so far) and
+returns a Series, a DataFrame or an array with one column per declared
+name, in declared order. Columns are appended in registration order.
+
+Recursive indicators (EMA, RSI) also depend on where the fetched range
+starts, just like with a tick limit: the warm-up is where values begin, not
+where they stop changing.
+"""
+import numpy as np
+
+class Indicator:
+    """One registered indicator: name, output columns, warm-up bars, compute(bars)."""
+
+    __slots__ = ('name', 'columns', 'warmup', 'compute')
+
+    def __init__(self, name, columns, warmup, compute):
+        self.name = name
+        self.columns = list(columns)
+        self.warmup = int(warmup)
+        self.compute = compute
+
+    def __repr__(self):
+        return f"Indicator({self.name!r}, {self.columns}, warmup={self.warmup})"
+
+class FeatureRegistry:
+
+    def __init__(self):
+        self._indicators = {}
+
+    def register(self, name, columns, warmup):
+        """Decorator registering compute(bars) as indicator `name` (re-registering replaces it)."""
+        if warmup < 0:
+            raise ValueError(f"Negative warm-up for indicator {name}: {warmup}")
+
+        def decorator(compute):
+            self._indicators[name] = Indicator(name, columns, warmup, compute)
+            return compute
+        return decorator
+
+    def unregister(self, name):
+        self._indicators.pop(name, None)
+
+    def names(self):
+        return list(self._indicators)
+
+    def select(self, names=None):
+        """The Indicator objects for `names` (default: all, in registration order)."""
+        if names is None:
+            return list(self._indicators.values())
+        unknown = [n for n in names if n not in self._indicators]
+        if unknown:
+            raise KeyError(f"Unknown indicators: {unknown}")
+        return [self._indicators[n] for n in names]
+
+    def columns(self, names=None):
+        return [c for indicator in self.select(names) for c in indicator.columns]
+
+    def warmup(self, names=None):
+        """Leading bars without a complete feature row."""
+        return max((indicator.warmup for indicator in self.select(names)), default=0)
+
+    def bars_needed(self, rows, names=None):
+        """Bars to fetch for `rows` complete feature rows."""
+        return int(rows) + self.warmup(names)
+
+    def signature(self, names=None):
+        """Hashable description of the selection (a cache key part)."""
+        return tuple((i.name, tuple(i.columns), i.warmup) for i in self.select(names))
+
+    def compute(self, bars, names=None):
+        """
+        Appends the selected indicators' columns to a copy of `bars` and drops
+        warm-up rows (any NaN). An indicator that fails or returns None (too
+        few bars for pandas_ta) gets NaN columns, which leaves no rows.
+        """
+        df = bars.copy()
+        for indicator in self.select(names):
+            try:
+                values = indicator.compute(df)
+            except Exception as e:
+                print(f"[!] Indicator calculation error ({indicator.name}): {e}")
+                values = None
+            if values is None:
+                values = np.full((len(df), len(indicator.columns)), np.nan)
+            values = np.asarray(values, dtype=np.float64).reshape(len(df), -1)
+            for k, column in enumerate(indicator.columns):
+                df[column] = values[:, k]
+        return df.dropna()
+
+registry = FeatureRegistry()
+register_indicator = registry.register
@@ -0,0 +1,335 @@
+"""
+Numba-compiled kernels for the model's indicator columns.
+
+pandas_ta builds several intermediate Series per indicator and pays pandas'
+per-call overhead each time; on one symbol's bars that overhead is most of
+the cost. The kernels here are single loops over a contiguous float64
+array, compiled with numba.njit:
+
+    rsi(close, 14)              Wilder smoothing (ewm alpha=1/length, adjust=True)
+    sma(close, 50)              rolling mean
+    ema(close, 200)             SMA-seeded ewm(span=length, adjust=False)
+    macd(close, 12, 26, 9)      (macd, histogram, signal)
+    bbands(close, 20, 2.0)      (lower, mid, upper, bandwidth, percent), ddof=0
+
+Each loop is a port of the pandas kernel pandas_ta calls (the same steps as
+core/streaming_indicators.py, including Kahan compensation, constant-run
+shortcuts and numpy's pairwise summation for the EMA seed), so the results
+equal pandas_ta's non-TA-Lib path (talib=False, as core.feature_engine calls
+it) bit for bit, except in windows of one repeated price: there the
+variance is exactly 0 here, as in pandas < 3.
+
+core.feature_engine uses them with set_indicator_backend('numba') (or
+BIST_INDICATOR_BACKEND=numba). Without numba installed the same functions
+run as plain Python (correct, but slow) and NUMBA_AVAILABLE is False.
+"""
+import math
+import sys
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+EPS = sys.float_info.epsilon
+
+# numpy's pairwise summation block size (PW_BLOCKSIZE in loops_utils.h)
+_PW_BLOCKSIZE = 128
+
+# error_model='numpy': float division by zero gives inf/NaN like pandas instead of raising
+_jit = njit(cache=True, nogil=True, error_model='numpy')
+
+@_jit
+def _block_sum(a, start, n):
+    # numpy's pairwise_sum() leaf: plain loop below 8 values, else 8 interleaved accumulators
+    if n < 8:
+        res = 0.0
+        for i in range(start, start + n):
+            res += a[i]
+        return res
+    r0, r1, r2, r3 = a[start], a[start + 1], a[start + 2], a[start + 3]
+    r4, r5, r6, r7 = a[start + 4], a[start + 5], a[start + 6], a[start + 7]
+    i = 8
+    while i < n - (n % 8):
+        j = start + i
+        r0 += a[j]
+        r1 += a[j + 1]
+        r2 += a[j + 2]
+        r3 += a[j + 3]
+        r4 += a[j + 4]
+        r5 += a[j + 5]
+        r6 += a[j + 6]
+        r7 += a[j + 7]
+        i += 8
+    res = ((r0 + r1) + (r2 + r3)) + ((r4 + r5) + (r6 + r7))
+    while i < n:
+        res += a[start + i]
+        i += 1
+    return res
+
+@_jit
+def _pairwise_sum(a, start, n):
+    """
+    numpy's pairwise_sum() (the loop behind ndarray.sum()): halves split on a
+    multiple of 8 until blocks of at most _PW_BLOCKSIZE, added in the same
+    tree order. The recursion is unrolled onto a stack (numba's on-disk cache
+    does not handle recursive functions).
+    """
+    starts = np.empty(64, dtype=np.int64)
+    sizes = np.empty(64, dtype=np.int64)
+    stages = np.zeros(64, dtype=np.int64)
+    lefts = np.empty(64)
+    top = 0
+    starts[0] = start
+    sizes[0] = n
+    result = 0.0
+    while top >= 0:
+        size = sizes[top]
+        if size <= _PW_BLOCKSIZE:
+            result = _block_sum(a, starts[top], size)
+            top -= 1
+            continue
+        half = size // 2
+        half -= half % 8
+        if stages[top] == 0:
+            stages[top] = 1
+            child_start, child_size = starts[top], half
+        elif stages[top] == 1:
+            stages[top] = 2
+            lefts[top] = result
+            child_start, child_size = starts[top] + half, size - half
+        else:
+            result = lefts[top] + result
+            top -= 1
+            continue
+        top += 1
+        starts[top] = child_start
+        sizes[top] = child_size
+        stages[top] = 0
+    return result
+
+@_jit
+def _nanmean(x, start, n):
+    """Series.mean() of x[start:start + n] (NaNs skipped)."""
+    values = np.empty(n)
+    count = 0
+    for i in range(n):
+        v = x[start + i]
+        if v == v:
+            values[i] = v
+            count += 1
+        else:
+            values[i] = 0.0
+    if count == 0:
+        return np.nan
+    return _pairwise_sum(values, 0, n) / count
+
+@_jit
+def _first_valid(x):
+    for i in range(len(x)):
+        if x[i] == x[i]:
+            return i
+    return len(x)
+
+@_jit
+def _ewm(x, alpha, adjust, min_periods):
+    """Series.ewm(alpha=..., adjust=..., min_periods=...).mean() (ignore_na=False)."""
+    n = len(x)
+    out = np.empty(n)
+    min_periods = max(min_periods, 1)
+    old_wt_factor = 1.0 - alpha
+    new_wt = 1.0 if adjust else alpha
+    weighted = np.nan
+    old_wt = 1.0
+    nobs = 0
+    for i in range(n):
+        cur = x[i]
+        is_observation = cur == cur
+        nobs += is_observation
+        if weighted == weighted:
+            # A missing value still ages the old weights
+            old_wt *= old_wt_factor
+            if is_observation:
+                if weighted != cur:
+                    weighted = (old_wt * weighted + new_wt * cur) / (old_wt + new_wt)
+                if adjust:
+                    old_wt += new_wt
+                else:
+                    old_wt = 1.0
+        elif is_observation:
+            weighted = cur
+        out[i] = weighted if nobs >= min_periods else np.nan
+    return out
+
+@_jit
+def _rolling_mean(x, length):
+    """Series.rolling(length).mean(): Kahan-compensated add/remove."""
+    n = len(x)
+    out = np.empty(n)
+    nobs = 0
+    neg_ct = 0
+    sum_x = 0.0
+    compensation_add = 0.0
+    compensation_remove = 0.0
+    same_value_run = 0
+    prev_value = x[0] if n else np.nan
+    for i in range(n):
+        if i >= length:
+            value = x[i - length]
+            if value == value:
+                nobs -= 1
+                y = -value - compensation_remove
+                t = sum_x + y
+                compensation_remove = t - sum_x - y
+                sum_x = t
+                if math.copysign(1.0, value) < 0:
+                    neg_ct -= 1
+        value = x[i]
+        if value == value:
+            nobs += 1
+            y = value - compensation_add
+            t = sum_x + y
+            compensation_add = t - sum_x - y
+            sum_x = t
+            if math.copysign(1.0, value) < 0:
+                neg_ct += 1
+            same_value_run = same_value_run + 1 if value == prev_value else 1
+            prev_value = value
+        if nobs < length:
+            out[i] = np.nan
+            continue
+        result = sum_x / nobs
+        if same_value_run >= nobs:
+            result = prev_value
+        elif (neg_ct == 0 and result < 0) or (neg_ct == nobs and result > 0):
+            result = 0.0
+        out[i] = result
+    return out
+
+@_jit
+def _rolling_var(x, length, ddof):
+    """Series.rolling(length).var(ddof): Welford update/downdate with Kahan compensation."""
+    n = len(x)
+    out = np.empty(n)
+    nobs = 0.0
+    mean_x = 0.0
+    ssqdm_x = 0.0
+    compensation_add = 0.0
+    compensation_remove = 0.0
+    same_value_run = 0
+    prev_value = x[0] if n else np.nan
+    for i in range(n):
+        if i >= length:
+            value = x[i - length]
+            if value == value:
+                nobs -= 1
+                if nobs:
+                    prev_mean = mean_x - compensation_remove
+                    y = value - compensation_remove
+                    t = y - mean_x
+                    compensation_remove = t + mean_x - y
+                    mean_x = mean_x - t / nobs
+                    ssqdm_x = ssqdm_x - (value - prev_mean) * (value - mean_x)
+                else:
+                    mean_x = 0.0
+                    ssqdm_x = 0.0
+        value = x[i]
+        if value == value:
+            nobs += 1
+            same_value_run = same_value_run + 1 if value == prev_value else 1
+            prev_value = value
+            prev_mean = mean_x - compensation_add
+            y = value - compensation_add
+            t = y - mean_x
+            compensation_add = t + mean_x - y
+            mean_x = mean_x + t / nobs
+            ssqdm_x = ssqdm_x + (value - prev_mean) * (value - mean_x)
+        if nobs < length or nobs <= ddof:
+            out[i] = np.nan
+        elif nobs == 1 or same_value_run >= nobs:
+            out[i] = 0.0
+        else:
+            out[i] = ssqdm_x / (nobs - ddof)
+    return out
+
+@_jit
+def _ema(x, length):
+    """ta.ema(): NaN until the mean of the first `length` values (from the first valid one), then ewm(adjust=False)."""
+    n = len(x)
+    first = _first_valid(x)
+    seed_row = first + length - 1
+    seeded = np.full(n, np.nan)
+    if seed_row < n:
+        seeded[seed_row] = _nanmean(x, first, length)
+        seeded[seed_row + 1:] = x[seed_row + 1:]
+    return _ewm(seeded, 2.0 / (length + 1.0), False, 0)
+
+@_jit
+def _rsi(close, length):
+    n = len(close)
+    gains = np.empty(n)
+    losses = np.empty(n)
+    if n:
+        gains[0] = losses[0] = np.nan
+    for i in range(1, n):
+        change = close[i] - close[i - 1]
+        gains[i] = 0.0 if change < 0 else change
+        losses[i] = 0.0 if change > 0 else change
+    avg_gain = _ewm(gains, 1.0 / length, True, length)
+    avg_loss = _ewm(losses, 1.0 / length, True, length)
+    return 100.0 * avg_gain / (avg_gain + np.abs(avg_loss))
+
+@_jit
+def _macd(close, fast, slow, signal):
+    line = _ema(close, fast) - _ema(close, slow)
+    signal_line = _ema(line, signal)
+    return line, line - signal_line, signal_line
+
+@_jit
+def _non_zero_range(high, low):
+    # pandas_ta: eps is added to the whole column once any difference is 0
+    diff = high - low
+    for i in range(len(diff)):
+        if diff[i] == 0:
+            return diff + EPS
+    return diff
+
+@_jit
+def _bbands(close, length, std, ddof):
+    mid = _rolling_mean(close, length)
+    deviations = std * np.sqrt(_rolling_var(close, length, ddof))
+    lower = mid - deviations
+    upper = mid + deviations
+    width = _non_zero_range(upper, lower)
+    return lower, mid, upper, 100.0 * width / mid, _non_zero_range(close, lower) / width
+
+def _as_array(close):
+    return np.ascontiguousarray(close, dtype=np.float64)
+
+def rsi(close, length=14):
+    """ta.rsi(close, length) as a float64 array."""
+    return _rsi(_as_array(close), length)
+
+def sma(close, length):
+    """ta.sma(close, length)."""
+    return _rolling_mean(_as_array(close), length)
+
+def ema(close, length):
+    """ta.ema(close, length)."""
+    return _ema(_as_array(close), length)
+
+def macd(close, fast=12, slow=26, signal=9):
+    """ta.macd(close, fast, slow, signal): (macd, histogram, signal) arrays."""
+    return _macd(_as_array(close), fast, slow, signal)
+
+def bbands(close, length=20, std=2.0, ddof=0):
+    """ta.bbands(close, length, std): (lower, mid, upper, bandwidth, percent) arrays."""
+    return _bbands(_as_array(close), length, float(std), ddof)
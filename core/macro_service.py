@@ -0,0 +1,155 @@
+"""
+Cached as-of joins of the low-frequency series (macro_data, fund_flow).
+
+EVDS macro indicators and TEFAS fund allocations change daily at most, so
+MacroService loads both tables once into a wide, forward-filled frame (one
+column per series) and joins it onto any bar index with one
+np.searchsorted: every bar gets the last value published at or before its
+timestamp (pd.merge_asof with direction='backward').
+
+The cache is keyed on a cheap signature of both tables (MAX(id), COUNT(*)),
+re-checked at most every CHECK_INTERVAL seconds, so rows written by
+scripts/fetch_macro.py or scripts/fetch_tefas.py from another process are
+picked up. Both scripts also call invalidate_macro_cache() after writing.
+
+Columns: the macro indicator names ('inflation_cpi', 'policy_rate',
+'usd_try'), fund_<CODE>_stock_pct per TEFAS fund and fund_stock_pct_mean.
+"""
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+# Ensure we can import from core
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from sqlalchemy import text
+
+from core.database import get_engine
+
+CHECK_INTERVAL = 5.0   # seconds between table signature checks
+
+class MacroService:
+    """Process-wide cache of the macro/fund series; see get_macro_service()."""
+
+    def __init__(self, engine=None, role='analytics', check_interval=CHECK_INTERVAL):
+        self.engine = engine if engine is not None else get_engine(role)
+        self.check_interval = check_interval
+        self.loads = 0          # Table reads so far (cache misses)
+        self._lock = threading.Lock()
+        self._frame = None
+        self._signature = None
+        self._checked_at = 0.0
+
+    def invalidate(self):
+        """Forces a reload on the next access."""
+        with self._lock:
+            self._frame = None
+            self._signature = None
+
+    def series(self):
+        """
+        The wide series frame: sorted timestamp index, one forward-filled
+        column per series (NaN before a series' first value).
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._frame is not None and now - self._checked_at < self.check_interval:
+                return self._frame
+            signature = self._read_signature()
+            self._checked_at = now
+            if self._frame is None or signature != self._signature:
+                self._frame = self._load()
+                self._signature = signature
+                self.loads += 1
+            return self._frame
+
+    def version(self):
+        """Changes whenever the series frame is reloaded (a cache key for frames built from it)."""
+        self.series()
+        return self.loads
+
+    def asof(self, index, columns=None):
+        """
+        Series values as of each timestamp of `index`.
+
+        Args:
+            index: Bar timestamps (DatetimeIndex or array-like), any order.
+            columns (list | None): Subset of series (missing ones come back NaN).
+
+        Returns:
+            pd.DataFrame: Aligned to `index`.
+        """
+        frame = self.series()
+        if columns is not None:
+            frame = frame.reindex(columns=columns)
+        index = pd.DatetimeIndex(index)
+        pos = np.searchsorted(frame.index.as_unit('ns').asi8, index.as_unit('ns').asi8, side='right') - 1
+        out = np.full((len(index), frame.shape[1]), np.nan)
+        known = pos >= 0
+        out[known] = frame.to_numpy(dtype=float)[pos[known]]
+        return pd.DataFrame(out, index=index, columns=frame.columns)
+
+    def join(self, bars, columns=None):
+        """`bars` (timestamp-indexed) with the as-of series columns appended."""
+        return pd.concat([bars, self.asof(bars.index, columns)], axis=1)
+
+    def latest(self):
+        """{series: newest value} (series without data left out)."""
+        frame = self.series()
+        if frame.empty:
+            return {}
+        return frame.iloc[-1].dropna().to_dict()
+
+    def _read_signature(self):
+        with self.engine.connect() as conn:
+            return tuple(conn.execute(text(
+                "SELECT (SELECT MAX(id) FROM macro_data), (SELECT COUNT(*) FROM macro_data), "
+                "(SELECT MAX(id) FROM fund_flow), (SELECT COUNT(*) FROM fund_flow)"
+            )).one())
+
+    def _load(self):
+        macro = pd.read_sql(text("SELECT indicator_name, value, timestamp FROM macro_data ORDER BY id"), self.engine)
+        funds = pd.read_sql(text("SELECT fund_code, stock_allocation_pct, date FROM fund_flow ORDER BY id"), self.engine)
+        long = pd.concat([
+            pd.DataFrame({'name': macro['indicator_name'], 'value': macro['value'], 'timestamp': macro['timestamp']}),
+            pd.DataFrame({'name': 'fund_' + funds['fund_code'] + '_stock_pct',
+                          'value': funds['stock_allocation_pct'], 'timestamp': funds['date']}),
+        ], ignore_index=True)
+        long['timestamp'] = pd.to_datetime(long['timestamp'], format='ISO8601')
+        long = long.dropna(subset=['timestamp'])
+        if long.empty:
+            return pd.DataFrame(index=pd.DatetimeIndex([], name='timestamp'), dtype=float)
+
+        # Same-timestamp rows: the last inserted wins
+        long = long.sort_values('timestamp', kind='stable')
+        wide = long.pivot_table(index='timestamp', columns='name', values='value', aggfunc='last', sort=True)
+        wide.columns.name = None
+        wide = wide.ffill()
+        fund_columns = [c for c in wide.columns if c.startswith('fund_')]
+        if fund_columns:
+            wide['fund_stock_pct_mean'] = wide[fund_columns].mean(axis=1)
+        return wide
+
+_services = {}
+_services_lock = threading.Lock()
+
+def get_macro_service(role='analytics'):
+    """The process-wide MacroService of an engine role."""
+    with _services_lock:
+        if role not in _services:
+            _services[role] = MacroService(role=role)
+        return _services[role]
+
+def invalidate_macro_cache():
+    """Drops every cached series frame (called after macro/fund writes)."""
+    with _services_lock:
+        services = list(_services.values())
+    for service in services:
+        service.invalidate()
@@ -1,5 +1,8 @@
 import numpy as np
 
+# Levels per side kept in order book snapshots
+BOOK_DEPTH = 10
+
 def calculate_imbalance(bids, asks, depth=5):
     """
     Calculates the Order Book Imbalance.
@@ -66,3 +69,26 @@ def calculate_weighted_imbalance(bids, asks, depth=5):
     imbalance = (weighted_bid_sum - weighted_ask_sum) / (weighted_bid_sum + weighted_ask_sum)
     
     return imbalance
+
+def pack_levels(levels, depth=BOOK_DEPTH):
+    """
+    Packs the top `depth` [price, qty] levels into bytes for storage.
+
+    Returns:
+        bytes: Little-endian float64 pairs (16 bytes per level).
+    """
+    if not levels:
+        return b""
+    arr = np.asarray(levels[:depth], dtype='<f8').reshape(-1, 2)
+    return arr.tobytes()
+
+def unpack_levels(blob):
+    """
+    Inverse of pack_levels.
+
+    Returns:
+        np.ndarray: Shape (levels, 2) with columns [price, qty].
+    """
+    if not blob:
+        return np.empty((0, 2), dtype=np.float64)
+    return np.frombuffer(blob, dtype='<f8').reshape(-1, 2)
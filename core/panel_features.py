@@ -0,0 +1,278 @@
+"""
+Indicator columns for many symbols at once, on (time x symbol) matrices.
+
+add_indicators() runs pandas_ta once per symbol, so a 40-symbol cycle pays
+the per-call overhead 40 times. BarPanel stacks every symbol's bars into
+(T, S) float arrays instead, right-aligned on bar position: row T-1 is each
+symbol's newest bar, shorter histories are NaN-padded at the top. Bars are
+not aligned on wall-clock time, because each symbol's indicators run over
+its own bar sequence, exactly like add_indicators() over that symbol's
+frame.
+
+panel_indicators() then computes RSI_14, SMA_50, EMA_200, MACD(12, 26, 9)
+and BBANDS(20, 2) for all columns in one set of numpy operations:
+
+    ewm recursions      one loop over T, vectorised over symbols, with the
+                        same per-step update as pandas' ewm
+    rolling means       cumulative sums, centred on each symbol's first bar
+    rolling variance    two-pass over sliding windows, in symbol chunks
+
+feature_tensor() returns the model input for all symbols as one
+(S, window, features) float32 array, feature_frames() the add_indicators()
+frames per symbol. Values agree with pandas_ta's non-TA-Lib path
+(talib=False, as core.feature_engine calls it) to ~1e-10 relative
+(summation order differs for the means; the recursions are the same).
+Windows of one repeated price give pandas' exact mean and 0 variance;
+in nearly flat windows the Bollinger bandwidth and %B divide by a tiny
+band width and agree to ~1e-7.
+"""
+import numpy as np
+import pandas as pd
+
+from core.bar_builder import OHLCV_COLUMNS
+from core.streaming_indicators import INDICATOR_COLUMNS
+
+FEATURE_COLUMNS = OHLCV_COLUMNS + INDICATOR_COLUMNS
+
+VAR_CHUNK_CELLS = 4_000_000   # window x rows x symbols per rolling-variance chunk (~32 MB)
+
+class BarPanel:
+    """
+    OHLCV bars of many symbols as (T, S) arrays.
+
+    Attributes:
+        symbols (list): Column order.
+        values (dict): {'open', 'high', 'low', 'close', 'volume': (T, S) float64}.
+        timestamps (np.ndarray): (T, S) datetime64[ns], NaT in the padding.
+        lengths (np.ndarray): Bars per symbol.
+    """
+
+    def __init__(self, symbols, values, timestamps, lengths):
+        self.symbols = list(symbols)
+        self.values = values
+        self.timestamps = timestamps
+        self.lengths = lengths
+
+    @classmethod
+    def from_frames(cls, frames, length=None):
+        """
+        Args:
+            frames (dict): {symbol: OHLCV frame} (timestamp index, oldest first),
+                e.g. from fetch_many().
+            length (int | None): Keep the newest `length` bars per symbol
+                (default: the longest history).
+        """
+        frames = {s: df for s, df in frames.items() if not df.empty}
+        lengths = np.array([len(df) for df in frames.values()], dtype=np.int64)
+        T = int(lengths.max(initial=0)) if length is None else int(length)
+        lengths = np.minimum(lengths, T)
+        values = {c: np.full((T, len(frames)), np.nan) for c in OHLCV_COLUMNS}
+        timestamps = np.full((T, len(frames)), np.datetime64('NaT'), dtype='datetime64[ns]')
+        for j, df in enumerate(frames.values()):
+            n = lengths[j]
+            # Selecting columns copies the frame; skip it when they are already OHLCV
+            block = (df if list(df.columns) == OHLCV_COLUMNS else df[OHLCV_COLUMNS]).to_numpy(np.float64)[-n:]
+            for k, column in enumerate(OHLCV_COLUMNS):
+                values[column][T - n:, j] = block[:, k]
+            timestamps[T - n:, j] = df.index.values[-n:]
+        return cls(frames.keys(), values, timestamps, lengths)
+
+    def __len__(self):
+        return len(self.symbols)
+
+def _first_valid(x):
+    """Row of each column's first non-NaN value (len(x) if none)."""
+    valid = ~np.isnan(x)
+    return np.where(valid.any(axis=0), valid.argmax(axis=0), len(x))
+
+def _ewm_mean(x, alpha, adjust=True, min_periods=0):
+    """
+    Series.ewm(alpha=..., adjust=...).mean() of every column of x (T, K),
+    with the same per-step update as pandas (ignore_na=False).
+
+    Args:
+        alpha, adjust, min_periods: One value, or one per column.
+    """
+    T, K = x.shape
+    alpha = np.broadcast_to(np.asarray(alpha, dtype=np.float64), (K,))
+    adjust = np.broadcast_to(np.asarray(adjust, dtype=bool), (K,))
+    old_wt_factor = 1.0 - alpha
+    new_wt = np.where(adjust, 1.0, alpha)
+    observed = ~np.isnan(x)
+
+    out = np.empty((T, K))
+    if not T:
+        return out
+    weighted = x[0].copy()
+    old_wt = np.ones(K)
+    out[0] = weighted
+    blended = np.empty(K)
+    for t in range(1, T):
+        cur = x[t]
+        started = weighted == weighted
+        np.multiply(old_wt, old_wt_factor, out=old_wt, where=started)
+        step = started & observed[t]
+        np.multiply(old_wt, weighted, out=blended)
+        blended += new_wt * cur
+        blended /= old_wt + new_wt
+        np.copyto(weighted, blended, where=step & (weighted != cur))
+        np.copyto(old_wt, np.where(adjust, old_wt + new_wt, 1.0), where=step)
+        np.copyto(weighted, cur, where=~started & observed[t])
+        out[t] = weighted
+    min_periods = np.maximum(np.broadcast_to(np.asarray(min_periods), (K,)), 1)
+    out[np.cumsum(observed, axis=0) < min_periods] = np.nan
+    return out
+
+def _flat_windows(x, length):
+    """True where the `length` values ending at each row are one repeated price (pandas' same_value_run)."""
+    T, S = x.shape
+    rows = np.broadcast_to(np.arange(T)[:, None], (T, S))
+    changed = np.ones((T, S), dtype=bool)
+    changed[1:] = x[1:] != x[:-1]
+    run_start = np.maximum.accumulate(np.where(changed, rows, 0), axis=0)
+    return rows - run_start + 1 >= length
+
+def _rolling_mean(x, length, first=None):
+    """
+    Series.rolling(length).mean() per column (NaN unless the window is full).
+    Each column's values must be contiguous from its first valid row. A window
+    of one repeated price gives exactly that price, as in pandas.
+    """
+    T, S = x.shape
+    first = _first_valid(x) if first is None else first
+    out = np.full((T, S), np.nan)
+    if T < length:
+        return out
+    # Centre each column on its first value so the running sums stay small
+    offset = x[np.minimum(first, T - 1), np.arange(S)]
+    offset = np.where(np.isnan(offset), 0.0, offset)
+    sums = np.zeros((T + 1, S))
+    np.cumsum(np.nan_to_num(x - offset), axis=0, out=sums[1:])
+    np.subtract(sums[length:], sums[:-length], out=out[length - 1:])
+    out[length - 1:] /= length
+    out += offset
+    # The cumsum difference leaves float residue that flat windows must not show
+    flat = _flat_windows(x, length)
+    np.copyto(out, x, where=flat)
+    out[np.arange(T)[:, None] < first + length - 1] = np.nan
+    return out
+
+def _rolling_var(x, length, ddof=0):
+    """Series.rolling(length).var(ddof) per column, two-pass within each window (exactly 0 when flat)."""
+    T, S = x.shape
+    out = np.full((T, S), np.nan)
+    if T < length:
+        return out
+    chunk = max(1, VAR_CHUNK_CELLS // (length * (T - length + 1)))
+    for j in range(0, S, chunk):
+        windows = np.lib.stride_tricks.sliding_window_view(x[:, j:j + chunk], length, axis=0)
+        mean = windows.mean(axis=-1, keepdims=True)
+        out[length - 1:, j:j + chunk] = ((windows - mean) ** 2).sum(axis=-1) / (length - ddof)
+    out[_flat_windows(x, length)] = 0.0
+    return out
+
+def _seeded_ema_input(x, length):
+    """pandas_ta's ema() input: NaN up to the seed row, which holds the mean of the first `length` values."""
+    T = len(x)
+    first = _first_valid(x)
+    seed_row = first + length - 1
+    seeded = np.where(np.arange(T)[:, None] > seed_row, x, np.nan)
+    columns = np.flatnonzero(seed_row < T)
+    rows = first[columns, None] + np.arange(length)
+    seeded[seed_row[columns], columns] = x[rows, columns[:, None]].mean(axis=1)
+    return seeded
+
+def _ema_input(x, lengths):
+    """Seeded inputs and alphas of ta.ema(x, length) for each length, stacked as columns."""
+    seeded = np.hstack([_seeded_ema_input(x, n) for n in lengths])
+    alpha = np.repeat([2.0 / (n + 1.0) for n in lengths], x.shape[1])
+    return seeded, alpha
+
+def _non_zero_range(high, low):
+    # pandas_ta: eps is added to a whole column once any of its differences is 0
+    diff = high - low
+    return diff + np.where((diff == 0).any(axis=0), np.finfo(np.float64).eps, 0.0)
+
+def panel_indicators(close):
+    """
+    The add_indicators() columns for a (T, S) close matrix.
+
+    Returns:
+        dict: {column name: (T, S) float64}, NaN during each symbol's warm-up.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    T, S = close.shape
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # One ewm pass for the RSI 14 gains/losses (Wilder smoothing) and EMA 12/26/200
+        change = np.vstack([np.full((1, S), np.nan), np.diff(close, axis=0)])
+        gains = np.where(change < 0, 0.0, change)
+        losses = np.where(change > 0, 0.0, change)
+        emas, ema_alpha = _ema_input(close, (12, 26, 200))
+        smoothed = _ewm_mean(np.hstack([gains, losses, emas]),
+                             np.r_[np.full(2 * S, 1.0 / 14), ema_alpha],
+                             adjust=np.r_[np.ones(2 * S, dtype=bool), np.zeros(3 * S, dtype=bool)],
+                             min_periods=np.r_[np.full(2 * S, 14), np.ones(3 * S, dtype=np.int64)])
+        avg_gain, avg_loss, ema_12, ema_26, ema_200 = np.hsplit(smoothed, 5)
+        rsi = 100 * avg_gain / (avg_gain + np.abs(avg_loss))
+
+        # MACD signal: EMA 9 of the MACD line from its first value on
+        macd = ema_12 - ema_26
+        signal = _ewm_mean(*_ema_input(macd, (9,)), adjust=False)
+
+        mid = _rolling_mean(close, 20)
+        deviations = 2.0 * np.sqrt(_rolling_var(close, 20, ddof=0))
+        lower, upper = mid - deviations, mid + deviations
+        width = _non_zero_range(upper, lower)
+        bandwidth = 100 * width / mid
+        percent = _non_zero_range(close, lower) / width
+
+    return dict(zip(INDICATOR_COLUMNS, [
+        rsi, _rolling_mean(close, 50), ema_200,
+        macd, macd - signal, signal,
+        lower, mid, upper, bandwidth, percent,
+    ]))
+
+def panel_features(panel, tail=None):
+    """
+    (T, S, features) float64 in FEATURE_COLUMNS order (bars then indicators).
+
+    Args:
+        tail (int | None): Only the newest `tail` rows (the indicators still
+            run over every bar).
+    """
+    indicators = panel_indicators(panel.values['close'])
+    rows = slice(-tail, None) if tail else slice(None)
+    columns = [panel.values[c] for c in OHLCV_COLUMNS] + [indicators[c] for c in INDICATOR_COLUMNS]
+    return np.stack([column[rows] for column in columns], axis=-1)
+
+def feature_tensor(panel, window=60, dtype=np.float32):
+    """
+    Batched model input: the newest `window` feature rows of every symbol
+    that has that many rows past its indicator warm-up.
+
+    Returns:
+        tuple: (np.ndarray of shape (symbols, window, len(FEATURE_COLUMNS)),
+        list of the symbols in batch order).
+    """
+    features = panel_features(panel, tail=window) if len(panel) else np.empty((0, 0, len(FEATURE_COLUMNS)))
+    if features.shape[0] < window:
+        return np.empty((0, window, len(FEATURE_COLUMNS)), dtype=dtype), []
+    complete = ~np.isnan(features).any(axis=(0, 2))
+    tensor = np.ascontiguousarray(features[:, complete].transpose(1, 0, 2), dtype=dtype)
+    return tensor, [s for s, ok in zip(panel.symbols, complete) if ok]
+
+def feature_frames(panel):
+    """
+    {symbol: frame} with the same columns and rows as add_indicators() on
+    each symbol's bars (warm-up rows dropped); symbols left empty are skipped.
+    """
+    features = panel_features(panel)
+    T = features.shape[0]
+    frames = {}
+    for j, symbol in enumerate(panel.symbols):
+        block = features[T - panel.lengths[j]:, j]
+        keep = ~np.isnan(block).any(axis=1)
+        if keep.any():
+            index = pd.DatetimeIndex(panel.timestamps[T - panel.lengths[j]:, j][keep], name='timestamp')
+            frames[symbol] = pd.DataFrame(block[keep], index=index, columns=FEATURE_COLUMNS)
+    return frames
@@ -0,0 +1,177 @@
+"""
+Columnar (Parquet) archive of historical ticks and bars for training.
+
+Layout under PARQUET_DIR, hive-partitioned so readers can skip whole
+directories:
+    ticks/symbol=THYAO/date=2025-01-02/part-0.parquet
+    bars/timeframe=1min/symbol=THYAO/date=2025-01-02/part-0.parquet
+
+Exports read through core.tick_store, so hot, partitioned and SQLite-archived
+ticks are all included; re-exporting a day replaces its files. Loaders push
+the symbol/date filters down to directory pruning and the timestamp filter
+down to Parquet row-group statistics, and only read the requested columns.
+
+Usage:
+    export_ticks(start='2025-01-01', end='2025-04-01')
+    export_bars('1min', start='2025-01-01', end='2025-04-01')
+    bars = load_ohlcv('THYAO', '1min', start='2025-02-01')
+"""
+import os
+import sys
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+# Ensure we can import from core
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from core.database import BASE_DIR
+from core.bar_builder import OHLCV_COLUMNS, resample_ticks
+
+PARQUET_DIR = os.path.join(BASE_DIR, 'data', 'archive', 'parquet')
+
+TICK_SCHEMA = pa.schema([
+    ('timestamp', pa.timestamp('ns')),
+    ('price', pa.float64()),
+    ('volume', pa.float64()),
+    ('source', pa.string()),
+])
+BAR_SCHEMA = pa.schema([('timestamp', pa.timestamp('ns'))] + [(c, pa.float64()) for c in OHLCV_COLUMNS])
+
+PARTITIONING = ds.partitioning(pa.schema([('symbol', pa.string()), ('date', pa.string())]), flavor='hive')
+ROW_GROUP_SIZE = 128 * 1024   # rows; keeps timestamp statistics selective within a day
+
+def _ticks_dir(root):
+    return os.path.join(root, 'ticks')
+
+def _bars_dir(root, timeframe):
+    return os.path.join(root, 'bars', f"timeframe={timeframe}")
+
+def _default_symbols(symbols):
+    if symbols:
+        return [symbols] if isinstance(symbols, str) else list(symbols)
+    from core.config_symbols import ALL_SYMBOLS
+    return list(ALL_SYMBOLS)
+
+def _with_partitions(schema):
+    return schema.append(pa.field('symbol', pa.string())).append(pa.field('date', pa.string()))
+
+def _write(df, schema, base_dir):
+    # df: schema columns plus symbol; one file per (symbol, date)
+    df = df.assign(date=df['timestamp'].dt.strftime('%Y-%m-%d'))
+    full_schema = _with_partitions(schema)
+    table = pa.Table.from_pandas(df[full_schema.names], schema=full_schema, preserve_index=False)
+    ds.write_dataset(table, base_dir, format='parquet', partitioning=PARTITIONING,
+                     basename_template='part-{i}.parquet', existing_data_behavior='delete_matching',
+                     max_rows_per_group=ROW_GROUP_SIZE)
+    return len(table)
+
+def export_ticks(start=None, end=None, symbols=None, root=PARQUET_DIR, store=None):
+    """
+    Writes stored ticks of [start, end) to the Parquet archive.
+
+    Args:
+        start, end (datetime | str | None): Time range (end exclusive).
+        symbols (list | None): Symbols to export (defaults to ALL_SYMBOLS).
+        root (str): Archive root directory.
+        store: core.tick_store.TickStore to read from (defaults to the analytics store).
+
+    Returns:
+        dict: {symbol: ticks written}.
+    """
+    if store is None:
+        from core.tick_store import get_tick_store
+        store = get_tick_store('analytics')
+    written = {}
+    for symbol in _default_symbols(symbols):
+        df = store.query(symbol, start, end)
+        if df.empty:
+            continue
+        df['source'] = df['source'].fillna('')
+        written[symbol] = _write(df, TICK_SCHEMA, _ticks_dir(root))
+    return written
+
+def export_bars(timeframe='1min', start=None, end=None, symbols=None, root=PARQUET_DIR, store=None):
+    """
+    Resamples stored ticks of [start, end) and writes the bars to the archive.
+
+    Returns:
+        dict: {symbol: bars written}.
+    """
+    if store is None:
+        from core.tick_store import get_tick_store
+        store = get_tick_store('analytics')
+    written = {}
+    for symbol in _default_symbols(symbols):
+        ticks = store.query(symbol, start, end)
+        if ticks.empty:
+            continue
+        bars = resample_ticks(ticks[['timestamp', 'price', 'volume']], timeframe).reset_index()
+        bars['symbol'] = symbol
+        written[symbol] = _write(bars, BAR_SCHEMA, _bars_dir(root, timeframe))
+    return written
+
+def _filter(symbols, start, end):
+    expr = None
+    clauses = []
+    if symbols:
+        clauses.append(ds.field('symbol').isin([symbols] if isinstance(symbols, str) else list(symbols)))
+    if start is not None:
+        start = pd.Timestamp(start)
+        # Partition pruning on the directory name, then row-group statistics
+        clauses.append(ds.field('date') >= start.strftime('%Y-%m-%d'))
+        clauses.append(ds.field('timestamp') >= pa.scalar(start.value, pa.timestamp('ns')))
+    if end is not None:
+        end = pd.Timestamp(end)
+        clauses.append(ds.field('date') <= end.strftime('%Y-%m-%d'))
+        clauses.append(ds.field('timestamp') < pa.scalar(end.value, pa.timestamp('ns')))
+    for clause in clauses:
+        expr = clause if expr is None else expr & clause
+    return expr
+
+def _load(base_dir, schema, symbols, start, end, columns):
+    if not os.path.isdir(base_dir):
+        return pd.DataFrame(columns=columns or schema.names + ['symbol'])
+    dataset = ds.dataset(base_dir, format='parquet', partitioning=PARTITIONING, schema=_with_partitions(schema))
+    if columns is None:
+        columns = schema.names + ['symbol']
+    # Sorting needs these even if the caller did not ask for them
+    read = list(dict.fromkeys(list(columns) + ['symbol', 'timestamp']))
+    df = dataset.to_table(columns=read, filter=_filter(symbols, start, end)).to_pandas()
+    df = df.sort_values(['symbol', 'timestamp'], kind='stable').reset_index(drop=True)
+    return df[list(columns)]
+
+def load_ticks(symbols=None, start=None, end=None, columns=None, root=PARQUET_DIR):
+    """
+    Reads archived ticks.
+
+    Args:
+        symbols (str | list | None): Symbols to read (None = all).
+        start, end (datetime | str | None): Time range (end exclusive).
+        columns (list | None): Subset of timestamp, price, volume, source, symbol.
+
+    Returns:
+        pd.DataFrame sorted by symbol, timestamp.
+    """
+    return _load(_ticks_dir(root), TICK_SCHEMA, symbols, start, end, columns)
+
+def load_bars(symbols=None, timeframe='1min', start=None, end=None, columns=None, root=PARQUET_DIR):
+    """Reads archived bars (see load_ticks); columns from timestamp, OHLCV, symbol."""
+    return _load(_bars_dir(root, timeframe), BAR_SCHEMA, symbols, start, end, columns)
+
+def load_ohlcv(symbol, timeframe='1min', start=None, end=None, root=PARQUET_DIR):
+    """
+    Timestamp-indexed OHLCV bars of one symbol, like feature_engine.fetch_ohlcv.
+    Uses exported bars of that timeframe if present, otherwise resamples archived ticks.
+    """
+    if os.path.isdir(_bars_dir(root, timeframe)):
+        bars = load_bars(symbol, timeframe, start, end, columns=['timestamp'] + OHLCV_COLUMNS, root=root)
+        return bars.set_index('timestamp')
+    ticks = load_ticks(symbol, start, end, columns=['timestamp', 'price', 'volume'], root=root)
+    if ticks.empty:
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
+    return resample_ticks(ticks, timeframe)
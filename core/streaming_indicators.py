@@ -0,0 +1,384 @@
+"""
+Incremental (streaming) versions of the model's indicator columns.
+
+add_indicators() recomputes RSI_14, SMA_50, EMA_200, MACD(12, 26, 9) and
+BBANDS(20, 2) with pandas_ta (talib=False) over the whole bar window on
+every call. The classes here keep O(1) running state instead and advance by
+one closed bar per update():
+
+    Wilder RSI      two exponentially weighted means (pandas ewm, adjust=True)
+    SMA             rolling sum with Kahan compensation
+    EMA             SMA-seeded exponential recursion (pandas ewm, adjust=False)
+    MACD            two EMAs, the signal EMA seeded from the first valid MACD values
+    Bollinger       rolling mean plus Welford variance (ddof=0)
+
+Each running state is a step-by-step port of the pandas kernels pandas_ta
+calls (Series.ewm().mean(), Series.rolling().mean() / .var()), including
+their compensation terms and constant-run shortcuts, so fed the same bars
+from the same first bar the values are bit-identical to pandas_ta's. A
+stream that keeps running while pandas_ta is recomputed over a sliding
+window differs only through EMA seeding: pandas_ta seeds from the first
+`length` bars of whatever window it gets, a stream from its first bars
+ever, and that difference decays by (1 - 2/(length+1)) per bar.
+
+IndicatorStream bundles the full add_indicators() column set for one
+symbol/timeframe; warm_start() feeds it a history frame first.
+"""
+import math
+import sys
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from core.bar_builder import OHLCV_COLUMNS
+
+def _div(a, b):
+    """a / b with numpy semantics (inf or NaN instead of ZeroDivisionError)."""
+    if b == 0:
+        if a != a or a == 0:
+            return math.nan
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+    return a / b
+
+def _non_zero(diff):
+    # pandas_ta's non_zero_range() adds eps to the whole column as soon as one
+    # difference is exactly zero; a stream can only do it for that bar
+    return diff + sys.float_info.epsilon if diff == 0 else diff
+
+class EWMean:
+    """Series.ewm(alpha=..., adjust=..., min_periods=...).mean(), one value at a time."""
+
+    def __init__(self, alpha, adjust=True, min_periods=0):
+        self.alpha = alpha
+        self.adjust = adjust
+        self.min_periods = max(int(min_periods), 1)
+        self.old_wt_factor = 1.0 - alpha
+        self.new_wt = 1.0 if adjust else alpha
+        self.weighted = math.nan
+        self.old_wt = 1.0
+        self.nobs = 0
+
+    def update(self, value):
+        is_observation = value == value
+        self.nobs += is_observation
+        if self.weighted == self.weighted:
+            # A missing value still ages the old weights (ignore_na=False)
+            self.old_wt *= self.old_wt_factor
+            if is_observation:
+                if self.weighted != value:
+                    self.weighted = (self.old_wt * self.weighted + self.new_wt * value) / (self.old_wt + self.new_wt)
+                if self.adjust:
+                    self.old_wt += self.new_wt
+                else:
+                    self.old_wt = 1.0
+        elif is_observation:
+            self.weighted = value
+        return self.value
+
+    @property
+    def value(self):
+        return self.weighted if self.nobs >= self.min_periods else math.nan
+
+class RollingMean:
+    """Series.rolling(length).mean(): Kahan-compensated running sum over a fixed window."""
+
+    def __init__(self, length):
+        self.length = length
+        self.window = deque()
+        self.nobs = 0
+        self.sum_x = 0.0
+        self.neg_ct = 0
+        self.compensation_add = 0.0
+        self.compensation_remove = 0.0
+        self.same_value_run = 0
+        self.prev_value = math.nan
+
+    def update(self, value):
+        self.window.append(value)
+        if len(self.window) > self.length:
+            self._remove(self.window.popleft())
+        elif len(self.window) == 1:
+            self.prev_value = value
+        self._add(value)
+        return self.value
+
+    def _add(self, value):
+        if value != value:
+            return
+        self.nobs += 1
+        y = value - self.compensation_add
+        t = self.sum_x + y
+        self.compensation_add = t - self.sum_x - y
+        self.sum_x = t
+        if math.copysign(1.0, value) < 0:
+            self.neg_ct += 1
+        # Runs of one value return it exactly (no rounding residue)
+        self.same_value_run = self.same_value_run + 1 if value == self.prev_value else 1
+        self.prev_value = value
+
+    def _remove(self, value):
+        if value != value:
+            return
+        self.nobs -= 1
+        y = -value - self.compensation_remove
+        t = self.sum_x + y
+        self.compensation_remove = t - self.sum_x - y
+        self.sum_x = t
+        if math.copysign(1.0, value) < 0:
+            self.neg_ct -= 1
+
+    @property
+    def value(self):
+        if self.nobs < self.length:
+            return math.nan
+        result = self.sum_x / self.nobs
+        if self.same_value_run >= self.nobs:
+            return self.prev_value
+        if (self.neg_ct == 0 and result < 0) or (self.neg_ct == self.nobs and result > 0):
+            return 0.0
+        return result
+
+class RollingVar:
+    """
+    Series.rolling(length).var(ddof): Welford's update and downdate with Kahan
+    compensation. A window of one repeated value is exactly 0, as in pandas
+    1.4-2.x (pandas 3 can leave ~1e-12 of rounding residue there).
+    """
+
+    def __init__(self, length, ddof=1):
+        self.length = length
+        self.ddof = ddof
+        self.window = deque()
+        self.nobs = 0.0
+        self.mean_x = 0.0
+        self.ssqdm_x = 0.0
+        self.compensation_add = 0.0
+        self.compensation_remove = 0.0
+        self.same_value_run = 0
+        self.prev_value = math.nan
+
+    def update(self, value):
+        self.window.append(value)
+        if len(self.window) > self.length:
+            self._remove(self.window.popleft())
+        elif len(self.window) == 1:
+            self.prev_value = value
+        self._add(value)
+        return self.value
+
+    def _add(self, value):
+        if value != value:
+            return
+        self.nobs += 1
+        self.same_value_run = self.same_value_run + 1 if value == self.prev_value else 1
+        self.prev_value = value
+        prev_mean = self.mean_x - self.compensation_add
+        y = value - self.compensation_add
+        t = y - self.mean_x
+        self.compensation_add = t + self.mean_x - y
+        self.mean_x = self.mean_x + t / self.nobs if self.nobs else 0.0
+        self.ssqdm_x = self.ssqdm_x + (value - prev_mean) * (value - self.mean_x)
+
+    def _remove(self, value):
+        if value != value:
+            return
+        self.nobs -= 1
+        if self.nobs:
+            prev_mean = self.mean_x - self.compensation_remove
+            y = value - self.compensation_remove
+            t = y - self.mean_x
+            self.compensation_remove = t + self.mean_x - y
+            self.mean_x = self.mean_x - t / self.nobs
+            self.ssqdm_x = self.ssqdm_x - (value - prev_mean) * (value - self.mean_x)
+        else:
+            self.mean_x = 0.0
+            self.ssqdm_x = 0.0
+
+    @property
+    def value(self):
+        if self.nobs < self.length or self.nobs <= self.ddof:
+            return math.nan
+        if self.nobs == 1 or self.same_value_run >= self.nobs:
+            return 0.0
+        return self.ssqdm_x / (self.nobs - self.ddof)
+
+class RSI:
+    """ta.rsi(close, length): Wilder smoothing (ewm alpha=1/length) of gains and losses."""
+
+    def __init__(self, length=14):
+        self.length = length
+        self.gains = EWMean(1.0 / length, adjust=True, min_periods=length)
+        self.losses = EWMean(1.0 / length, adjust=True, min_periods=length)
+        self.prev_close = math.nan
+
+    def update(self, close):
+        change = close - self.prev_close
+        self.prev_close = close
+        # change is NaN on the first bar, like close.diff()
+        avg_gain = self.gains.update(0.0 if change < 0 else change)
+        avg_loss = self.losses.update(0.0 if change > 0 else change)
+        return _div(100.0 * avg_gain, avg_gain + abs(avg_loss))
+
+class SMA:
+    """ta.sma(close, length)."""
+
+    def __init__(self, length):
+        self.length = length
+        self.mean = RollingMean(length)
+
+    def update(self, close):
+        return self.mean.update(close)
+
+class EMA:
+    """
+    ta.ema(close, length): the first value is the mean of the first `length`
+    closes, then ewm(span=length, adjust=False).
+    """
+
+    def __init__(self, length):
+        self.length = length
+        self.ewm = EWMean(2.0 / (length + 1.0), adjust=False)
+        self.seed = []
+
+    def update(self, close):
+        if self.seed is not None:
+            self.seed.append(close)
+            if len(self.seed) < self.length:
+                return math.nan
+            # Same reduction pandas_ta uses for the seed
+            close = float(pd.Series(self.seed).mean())
+            self.seed = None
+        return self.ewm.update(close)
+
+class MACD:
+    """ta.macd(close, fast, slow, signal): (macd, histogram, signal)."""
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+
+    def update(self, close):
+        macd = self.fast.update(close) - self.slow.update(close)
+        if macd != macd:
+            return math.nan, math.nan, math.nan
+        signal = self.signal.update(macd)
+        return macd, macd - signal, signal
+
+class BBands:
+    """ta.bbands(close, length, std, ddof=0): (lower, mid, upper, bandwidth, percent)."""
+
+    def __init__(self, length=20, std=2.0, ddof=0):
+        self.std = std
+        self.mean = RollingMean(length)
+        self.var = RollingVar(length, ddof)
+
+    def update(self, close):
+        mid = self.mean.update(close)
+        var = self.var.update(close)
+        deviations = self.std * (math.sqrt(var) if var >= 0 else math.nan)
+        lower = mid - deviations
+        upper = mid + deviations
+        width = _non_zero(upper - lower)
+        return lower, mid, upper, _div(100 * width, mid), _div(_non_zero(close - lower), width)
+
+INDICATOR_COLUMNS = [
+    'RSI_14', 'SMA_50', 'EMA_200',
+    'MACD_12_26_9', 'MACDh_12_26_9', 'MACDs_12_26_9',
+    'BBL_20_2.0', 'BBM_20_2.0', 'BBU_20_2.0', 'BBB_20_2.0', 'BBP_20_2.0',
+]
+
+class IndicatorStream:
+    """
+    The add_indicators() columns for one symbol/timeframe, updated one
+    closed bar at a time. Keeps the last `maxlen` rows so frame() can hand
+    the model its input window without recomputing anything.
+    """
+
+    def __init__(self, maxlen=2000):
+        self.rsi = RSI(14)
+        self.sma = SMA(50)
+        self.ema = EMA(200)
+        self.macd = MACD(12, 26, 9)
+        self.bbands = BBands(20, 2.0)
+        self.last_timestamp = None
+        self.bars_seen = 0
+        self._index = deque(maxlen=maxlen)
+        self._rows = deque(maxlen=maxlen)
+
+    def update(self, timestamp, open_, high, low, close, volume):
+        """
+        Advances every indicator by one closed bar.
+
+        Returns:
+            tuple: The bar's indicator values in INDICATOR_COLUMNS order.
+        """
+        close = float(close)
+        values = (self.rsi.update(close), self.sma.update(close), self.ema.update(close),
+                  *self.macd.update(close), *self.bbands.update(close))
+        self.last_timestamp = timestamp
+        self.bars_seen += 1
+        self._index.append(timestamp)
+        self._rows.append((open_, high, low, close, volume) + values)
+        return values
+
+    def update_frame(self, bars):
+        """
+        Feeds the bars of an OHLCV frame (timestamp index, oldest first) that
+        are newer than the last bar seen; older ones are skipped.
+
+        Returns:
+            int: Bars consumed.
+        """
+        if bars.empty:
+            return 0
+        first = 0 if self.last_timestamp is None else bars.index.searchsorted(self.last_timestamp, side='right')
+        values = bars[OHLCV_COLUMNS].to_numpy(np.float64)[first:]
+        for timestamp, row in zip(bars.index[first:], values.tolist()):
+            self.update(timestamp, *row)
+        return len(values)
+
+    warm_start = update_frame
+
+    def frame(self, tail=None):
+        """
+        The kept bars with their indicator columns, warm-up rows dropped, like
+        add_indicators() over the same bars.
+
+        Args:
+            tail (int | None): Only the newest `tail` bars (warm-up rows are a
+                prefix, so this is frame().tail(tail) without building the rest).
+        """
+        rows = list(self._rows)
+        index = list(self._index)
+        if tail is not None:
+            rows, index = rows[-tail:], index[-tail:]
+        values = np.array(rows, dtype=np.float64).reshape(len(rows), len(OHLCV_COLUMNS) + len(INDICATOR_COLUMNS))
+        valid = ~np.isnan(values).any(axis=1)
+        return pd.DataFrame(values[valid], index=pd.DatetimeIndex(index, name='timestamp')[valid],
+                            columns=OHLCV_COLUMNS + INDICATOR_COLUMNS)
+
+class IndicatorStreams:
+    """IndicatorStream per (symbol, timeframe), created on first use."""
+
+    def __init__(self, maxlen=2000):
+        self.maxlen = maxlen
+        self._streams = {}
+
+    def get(self, symbol, timeframe):
+        key = (symbol, timeframe)
+        if key not in self._streams:
+            self._streams[key] = IndicatorStream(self.maxlen)
+        return self._streams[key]
+
+    def update(self, symbol, timeframe, bars, tail=None):
+        """Feeds `bars` (history on the first call, new bars later) and returns frame(tail)."""
+        stream = self.get(symbol, timeframe)
+        stream.update_frame(bars)
+        return stream.frame(tail)
+
+    def reset(self, symbol=None, timeframe=None):
+        for key in [k for k in self._streams
+                    if (symbol is None or k[0] == symbol) and (timeframe is None or k[1] == timeframe)]:
+            del self._streams[key]
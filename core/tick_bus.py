@@ -0,0 +1,407 @@
+"""
+Local pub/sub bus for live ticks, order book updates and closed bars.
+
+The ingestion server publishes everything it hands to the tick writer;
+run_bot.py, dashboard.py and predict.py subscribe instead of re-querying
+tick_data every cycle. SQLite stays the system of record: the bus only
+carries what was just written, and consumers seed their history from the
+database once.
+
+Transport:
+    A Unix domain socket (data/tick_bus.sock), or TCP on localhost where
+    AF_UNIX is not available. Override with BIST_BUS_ADDRESS ("host:port"
+    or a socket path).
+
+Wire format (newline-delimited JSON):
+    subscriber -> bus, once:  {"topics": ["tick", "bar.1min"], "symbols": ["THYAO"]}
+                              (missing or empty list = everything)
+    bus -> subscriber:        {"topic": "bar.1min", "symbol": "THYAO", ...}
+
+Topics: "tick", "book" and "bar.<timeframe>" for each BarBuilder timeframe.
+Slow subscribers never block the publisher: each one has a bounded queue and
+the oldest messages are dropped when it overflows.
+"""
+import json
+import os
+import socket
+import threading
+from collections import deque, OrderedDict
+from datetime import datetime
+
+from core.bar_builder import BarBuilder, BAR_TIMEFRAMES
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SOCKET_PATH = os.path.join(BASE_DIR, 'data', 'tick_bus.sock')
+DEFAULT_TCP_ADDRESS = ('127.0.0.1', 5556)
+
+MAX_PENDING = 10000       # Messages buffered per subscriber before dropping
+RECONNECT_SECONDS = 5.0
+
+def bus_address():
+    """Resolves the bus address: BIST_BUS_ADDRESS, else a Unix socket, else TCP."""
+    override = os.environ.get('BIST_BUS_ADDRESS')
+    if override:
+        host, sep, port = override.rpartition(':')
+        if sep and port.isdigit():
+            return (host or '127.0.0.1', int(port))
+        return override
+    if hasattr(socket, 'AF_UNIX'):
+        return DEFAULT_SOCKET_PATH
+    return DEFAULT_TCP_ADDRESS
+
+def _family(address):
+    return socket.AF_INET if isinstance(address, tuple) else socket.AF_UNIX
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Not JSON serialisable: {type(value).__name__}")
+
+class _Subscriber:
+    def __init__(self, conn, topics, symbols, max_pending):
+        self.conn = conn
+        self.topics = set(topics) if topics else None
+        self.symbols = set(symbols) if symbols else None
+        self.pending = deque(maxlen=max_pending)
+        self.dropped = 0
+        self.alive = True
+        self._cond = threading.Condition()
+
+    def wants(self, topic, symbol):
+        return ((self.topics is None or topic in self.topics) and
+                (self.symbols is None or symbol in self.symbols))
+
+    def push(self, data):
+        with self._cond:
+            if len(self.pending) == self.pending.maxlen:
+                self.dropped += 1
+            self.pending.append(data)
+            self._cond.notify()
+
+    def run(self):
+        try:
+            while self.alive:
+                with self._cond:
+                    while not self.pending and self.alive:
+                        self._cond.wait()
+                    batch = b"".join(self.pending)
+                    self.pending.clear()
+                if batch:
+                    self.conn.sendall(batch)
+        except OSError:
+            pass
+        finally:
+            self.alive = False
+            self.conn.close()
+
+    def stop(self):
+        with self._cond:
+            self.alive = False
+            self._cond.notify()
+
+class TickBus:
+    """
+    Publisher side. Owned by the ingestion server; safe to call from its
+    client threads and from the asyncio writer stage at the same time.
+    """
+
+    def __init__(self, address=None, timeframes=BAR_TIMEFRAMES, max_pending=MAX_PENDING):
+        self.address = address if address is not None else bus_address()
+        self.max_pending = max_pending
+        self.bars = BarBuilder(timeframes)
+        self.messages_published = 0
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._sock = None
+        self._thread = None
+
+    def start(self):
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            # Stale socket file from a previous run
+            os.unlink(self.address)
+        self._sock = socket.socket(_family(self.address), socket.SOCK_STREAM)
+        if isinstance(self.address, tuple):
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(self.address)
+        self._sock.listen(16)
+        if isinstance(self.address, tuple):
+            # Port 0 -> report the one actually bound
+            self.address = self._sock.getsockname()[:2]
+        self._thread = threading.Thread(target=self._accept_loop, name="tick-bus", daemon=True)
+        self._thread.start()
+        return self
+
+    def _accept_loop(self):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return  # Listening socket closed
+            threading.Thread(target=self._register, args=(conn,), daemon=True).start()
+
+    def _register(self, conn):
+        try:
+            conn.settimeout(5.0)
+            reader = conn.makefile('rb')
+            request = json.loads(reader.readline() or b"{}")
+            reader.close()
+            conn.settimeout(None)
+        except (OSError, ValueError) as e:
+            print(f"[!] Tick bus: bad subscription: {e}")
+            conn.close()
+            return
+
+        sub = _Subscriber(conn, request.get('topics'), request.get('symbols'), self.max_pending)
+        with self._lock:
+            self._subscribers.append(sub)
+        sub.run()
+        with self._lock:
+            if sub in self._subscribers:
+                self._subscribers.remove(sub)
+
+    def publish(self, topic, symbol, payload):
+        """Sends one message to every subscriber of `topic` / `symbol`."""
+        subscribers = self._subscribers
+        if not subscribers:
+            return
+        data = None
+        for sub in subscribers:
+            if sub.alive and sub.wants(topic, symbol):
+                if data is None:
+                    # Encode once, only if somebody listens
+                    msg = {'topic': topic, 'symbol': symbol}
+                    msg.update(payload)
+                    data = (json.dumps(msg, default=_json_default) + "\n").encode('utf-8')
+                sub.push(data)
+        if data is not None:
+            self.messages_published += 1
+
+    def publish_tick(self, symbol, price, volume, timestamp):
+        """Publishes a trade and every bar it closes. Returns the closed bars."""
+        # Held across publish so bars reach subscribers in the order they closed
+        with self._lock:
+            closed = self.bars.update(symbol, price, volume, timestamp)
+            self.publish('tick', symbol, {'price': price, 'volume': volume, 'timestamp': timestamp})
+            for bar in closed:
+                self.publish('bar.' + bar['timeframe'], bar['symbol'], bar)
+        return closed
+
+    def open_bars(self):
+        with self._lock:
+            return self.bars.open_bars()
+
+    def stats(self):
+        with self._lock:
+            subs = list(self._subscribers)
+        return {
+            'subscribers': len(subs),
+            'messages_published': self.messages_published,
+            'dropped': sum(s.dropped for s in subs),
+            # Messages queued but not yet sent: grows when a consumer falls behind
+            'backlog': sum(len(s.pending) for s in subs),
+        }
+
+    def close(self):
+        if self._sock is not None:
+            try:
+                # Wakes the accept() in _accept_loop
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._sock.close()
+            self._sock = None
+        with self._lock:
+            subs, self._subscribers = self._subscribers, []
+        for sub in subs:
+            sub.stop()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+class TickBusSubscriber:
+    """
+    Consumer side connection.
+
+    Raises OSError on connect if no bus is running; use connect_tick_bus()
+    for the "None if unavailable" variant.
+    """
+
+    def __init__(self, topics=None, symbols=None, address=None):
+        self.address = address if address is not None else bus_address()
+        self.topics = list(topics or [])
+        self.symbols = list(symbols or [])
+        self._buf = b""
+        self.sock = socket.socket(_family(self.address), socket.SOCK_STREAM)
+        try:
+            self.sock.connect(self.address)
+            request = {'topics': self.topics, 'symbols': self.symbols}
+            self.sock.sendall((json.dumps(request) + "\n").encode('utf-8'))
+        except OSError:
+            self.sock.close()
+            raise
+
+    def recv(self, timeout=None):
+        """
+        Waits up to `timeout` seconds (None = forever) for messages.
+
+        Returns:
+            list: Decoded messages (possibly empty on timeout).
+
+        Raises:
+            ConnectionError: If the bus went away.
+        """
+        self.sock.settimeout(timeout)
+        try:
+            chunk = self.sock.recv(65536)
+        except socket.timeout:
+            return []
+        if not chunk:
+            raise ConnectionError("Tick bus closed the connection")
+        *lines, self._buf = (self._buf + chunk).split(b"\n")
+        return [json.loads(line) for line in lines if line]
+
+    def __iter__(self):
+        while True:
+            yield from self.recv()
+
+    def close(self):
+        self.sock.close()
+
+def connect_tick_bus(topics=None, symbols=None, address=None):
+    """Returns a TickBusSubscriber, or None if no ingestion server is publishing."""
+    try:
+        return TickBusSubscriber(topics, symbols, address)
+    except OSError:
+        return None
+
+class BarCache:
+    """
+    Live bar history for a set of symbols, kept current by the bus.
+
+    Seed each symbol once from the database (seed()), then read frame();
+    closed bars pushed by the ingestion server are appended in the
+    background. `connected` is False while no bus is reachable, in which
+    case callers should keep reading from the database.
+    """
+
+    def __init__(self, timeframe, symbols=None, maxlen=2000, address=None):
+        self.timeframe = timeframe
+        self.symbols = list(symbols or [])
+        self.maxlen = maxlen
+        self.address = address
+        self.connected = False
+        self._bars = {}        # symbol -> OrderedDict(start -> (o, h, l, c, v))
+        self._seeded = set()
+        self._updated = set()
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="bar-cache", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.is_set():
+            sub = connect_tick_bus(['bar.' + self.timeframe], self.symbols, self.address)
+            if sub is None:
+                self._stop.wait(RECONNECT_SECONDS)
+                continue
+            self.connected = True
+            try:
+                while not self._stop.is_set():
+                    for msg in sub.recv(timeout=1.0):
+                        self._add(msg)
+            except (ConnectionError, OSError, ValueError):
+                pass
+            finally:
+                self.connected = False
+                sub.close()
+
+    def _add(self, bar):
+        start = datetime.fromisoformat(bar['start'])
+        with self._cond:
+            bars = self._bars.setdefault(bar['symbol'], OrderedDict())
+            bars[start] = (bar['open'], bar['high'], bar['low'], bar['close'], bar['volume'])
+            while len(bars) > self.maxlen:
+                bars.popitem(last=False)
+            self._updated.add(bar['symbol'])
+            self._cond.notify_all()
+
+    def is_seeded(self, symbol):
+        return symbol in self._seeded
+
+    def seed(self, symbol, df):
+        """
+        Loads history from an OHLCV frame (timestamp index, open/high/low/close/volume).
+        Bars already received from the bus win over seeded ones.
+        """
+        rows = OrderedDict(
+            (ts.to_pydatetime(), (o, h, l, c, v))
+            for ts, o, h, l, c, v in df[['open', 'high', 'low', 'close', 'volume']].itertuples()
+        )
+        with self._cond:
+            rows.update(self._bars.get(symbol, {}))
+            while len(rows) > self.maxlen:
+                rows.popitem(last=False)
+            self._bars[symbol] = rows
+            self._seeded.add(symbol)
+
+    def frame(self, symbol, since=None):
+        """
+        Returns the cached bars as an OHLCV DataFrame (oldest first).
+
+        Args:
+            since (datetime | None): Only bars starting after this one.
+        """
+        import pandas as pd
+
+        with self._cond:
+            items = list(self._bars.get(symbol, {}).items())
+        if since is not None:
+            items = [(k, v) for k, v in items if k > since]
+        df = pd.DataFrame([v for _, v in items], columns=['open', 'high', 'low', 'close', 'volume'],
+                          index=pd.DatetimeIndex([k for k, _ in items], name='timestamp'))
+        return df.sort_index()
+
+    def wait(self, timeout=None):
+        """
+        Blocks until at least one symbol got a new bar (or `timeout`).
+
+        Returns:
+            set: Symbols updated since the previous call.
+        """
+        with self._cond:
+            if not self._updated:
+                self._cond.wait(timeout)
+            updated, self._updated = self._updated, set()
+        return updated
+
+    def stop(self):
+        self._stop.set()
+
+_default_bus = None
+_default_lock = threading.Lock()
+
+def start_tick_bus(address=None):
+    """Starts the process-wide publisher. Returns None if the address is unavailable."""
+    global _default_bus
+    with _default_lock:
+        if _default_bus is None:
+            try:
+                _default_bus = TickBus(address).start()
+            except OSError as e:
+                print(f"[!] Tick bus disabled: {e}")
+                return None
+    return _default_bus
+
+def get_tick_bus():
+    """The running publisher, or None if this process does not publish."""
+    return _default_bus
+
+def close_tick_bus():
+    global _default_bus
+    with _default_lock:
+        bus, _default_bus = _default_bus, None
+    if bus is not None:
+        bus.close()
@@ -0,0 +1,546 @@
+"""
+Time-partitioned tick storage on top of tick_data.
+
+Ingestion keeps appending to tick_data, which acts as the hot partition.
+roll() moves every closed trading day out of it into its own table,
+tick_data_YYYYMMDD (or tick_data_YYYYMMDD_SYMBOL with per_symbol=True), so
+tick_data stays small and "latest N ticks" queries never scan months of
+history. apply_retention() later moves cold day partitions into one SQLite
+file each under the archive directory and deletes the oldest ones.
+
+TickStore.query() hides the layout: it reads tick_data first and walks back
+through day partitions (in the database, then in the archive) only until the
+requested window or row count is covered.
+
+Usage:
+    store = get_tick_store()
+    df = store.query('THYAO', limit=5000)
+"""
+import os
+import re
+import sqlite3
+import sys
+import threading
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+
+# Ensure we can import from core
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from sqlalchemy import text
+
+from core.database import BASE_DIR, get_engine
+from core.bar_builder import resample_ticks_many, split_panel
+
+HOT_TABLE = 'tick_data'
+ARCHIVE_DIR = os.path.join(BASE_DIR, 'data', 'archive', 'ticks')
+
+# Retention defaults (days, counted back from today)
+HOT_DAYS = 30          # day partitions kept inside the main database
+KEEP_DAYS = None       # archived partitions older than this are deleted (None = keep forever)
+
+COLUMNS = ['id', 'symbol', 'price', 'volume', 'timestamp', 'source', 'received_at']
+PARTITION_PATTERN = re.compile(r'^tick_data_(\d{8})(?:_(\w+))?$')
+
+PARTITION_DDL = """
+CREATE TABLE IF NOT EXISTS {schema}.{name} (
+    id INTEGER PRIMARY KEY,
+    symbol VARCHAR,
+    price FLOAT,
+    volume FLOAT,
+    timestamp DATETIME,
+    source VARCHAR NOT NULL DEFAULT '',
+    received_at DATETIME
+)"""
+PARTITION_INDEX_DDL = "CREATE UNIQUE INDEX IF NOT EXISTS {schema}.ux_{name} ON {name} (symbol, timestamp, source)"
+
+# A stored partition. path is None while it lives in the main database.
+Partition = namedtuple('Partition', ['day', 'symbol', 'table', 'path'])
+
+# SQLite caps a compound SELECT at 500 terms
+COMPOUND_CHUNK = 200
+
+# latest_bars(): first tick read per wanted bar; later reads are sized from
+# the ticks per bar actually seen
+TICKS_PER_BAR_GUESS = 4
+
+def newest_per_symbol(symbols, limit, columns, table='{table}', time_column='timestamp', where=None, params=None):
+    """
+    Statements reading the newest `limit` rows of every symbol at once: one
+    index-ordered LIMIT subquery per symbol, joined with UNION ALL, so SQLite
+    seeks each symbol's tail instead of scanning all of its rows.
+
+    Returns:
+        list[(sql, params)]: One statement per COMPOUND_CHUNK symbols.
+    """
+    statements = []
+    filter_sql = f" AND {where}" if where else ""
+    for offset in range(0, len(symbols), COMPOUND_CHUNK):
+        chunk = symbols[offset:offset + COMPOUND_CHUNK]
+        chunk_params = dict(params or {}, limit=int(limit))
+        parts = []
+        for i, symbol in enumerate(chunk):
+            chunk_params[f"sym{i}"] = symbol
+            parts.append(
+                f"SELECT * FROM (SELECT {', '.join(columns)} FROM {table} WHERE symbol = :sym{i}{filter_sql} "
+                f"ORDER BY {time_column} DESC LIMIT :limit)"
+            )
+        statements.append((" UNION ALL ".join(parts), chunk_params))
+    return statements
+
+def symbol_key(symbol):
+    """Symbol as it appears in per-symbol partition names."""
+    return re.sub(r'\W', '_', symbol.upper())
+
+def partition_name(day, symbol=None):
+    """Table name of the partition holding `day` (and `symbol` for per-symbol layouts)."""
+    name = f"tick_data_{day:%Y%m%d}"
+    if symbol is not None:
+        name += '_' + symbol_key(symbol)
+    return name
+
+def parse_partition_name(name):
+    """Returns (day, symbol) for a partition table/file name, or None."""
+    match = PARTITION_PATTERN.match(name)
+    if match is None:
+        return None
+    return datetime.strptime(match.group(1), '%Y%m%d').date(), match.group(2)
+
+def _day_filter(day, symbol=None):
+    """WHERE clause and params selecting one day's (and symbol's) ticks."""
+    lo, hi = _bounds(day)
+    where = "timestamp >= :lo AND timestamp < :hi"
+    params = {'lo': lo, 'hi': hi}
+    if symbol is not None:
+        where += " AND symbol = :symbol"
+        params['symbol'] = symbol
+    return where, params
+
+def _bounds(day):
+    # tick_data stores timestamps as ISO text, so day bounds compare as strings
+    return str(day), str(day + timedelta(days=1))
+
+class TickStore:
+    """
+    Partition-aware reader and maintainer of the tick tables.
+
+    Reads go through a read-only engine, roll()/apply_retention() through the
+    ingest (write) engine. Both layouts (per day, per day and symbol) can
+    coexist; per_symbol only decides how roll() splits new partitions.
+    """
+
+    def __init__(self, engine=None, role='analytics', archive_dir=ARCHIVE_DIR, per_symbol=False):
+        """
+        Args:
+            engine: SQLAlchemy engine used for reads and writes (defaults to the
+                `role` engine for reads and the 'ingest' engine for writes).
+            role (str): Read-only engine role ('analytics' or 'dashboard').
+            archive_dir (str | None): Directory holding archived partition files.
+            per_symbol (bool): roll() creates one partition per day and symbol.
+        """
+        self.read_engine = engine if engine is not None else get_engine(role)
+        self._write_engine = engine
+        self.archive_dir = archive_dir
+        self.per_symbol = per_symbol
+
+    @property
+    def write_engine(self):
+        if self._write_engine is None:
+            self._write_engine = get_engine('ingest')
+        return self._write_engine
+
+    # --- Layout ---
+
+    def partitions(self, symbols=None, start=None, end=None):
+        """
+        Lists stored day partitions, newest first.
+
+        Args:
+            symbols (str | list | None): Only partitions that can hold these symbols.
+            start, end (datetime | None): Only partitions overlapping [start, end).
+
+        Returns:
+            list[Partition]
+        """
+        # Keyed on (table, archived): a day rolled late can exist in both places
+        found = {}
+        with self.read_engine.connect() as conn:
+            names = conn.execute(text(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE 'tick\\_data\\_%' ESCAPE '\\'"
+            )).scalars().all()
+        for name in names:
+            parsed = parse_partition_name(name)
+            if parsed is not None:
+                found[name, False] = Partition(parsed[0], parsed[1], name, None)
+        if self.archive_dir and os.path.isdir(self.archive_dir):
+            for filename in os.listdir(self.archive_dir):
+                name, ext = os.path.splitext(filename)
+                parsed = parse_partition_name(name)
+                if ext == '.db' and parsed is not None:
+                    found[name, True] = Partition(parsed[0], parsed[1], name, os.path.join(self.archive_dir, filename))
+
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        keys = {symbol_key(s) for s in symbols} if symbols else None
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+        selected = []
+        for part in found.values():
+            if keys is not None and part.symbol is not None and part.symbol not in keys:
+                continue
+            day_start = pd.Timestamp(part.day)
+            if start is not None and day_start + pd.Timedelta(days=1) <= start:
+                continue
+            if end is not None and day_start >= end:
+                continue
+            selected.append(part)
+        return sorted(selected, key=lambda p: (p.day, p.symbol or ''), reverse=True)
+
+    # --- Queries ---
+
+    def query(self, symbols=None, start=None, end=None, limit=None):
+        """
+        Loads ticks across the hot table and all overlapping partitions.
+
+        Args:
+            symbols (str | list | None): One symbol, several, or all.
+            start, end (datetime | str | None): Time range (end exclusive).
+            limit (int | None): Keep only the newest `limit` ticks. Older
+                partitions are not read once the newest rows are complete.
+
+        Returns:
+            pd.DataFrame: id, symbol, price, volume, timestamp, source,
+            received_at in (timestamp, id) order, fresh RangeIndex.
+        """
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+
+        sql, params = self._select(symbols, start, end, limit)
+        frames = [pd.read_sql(text(sql.format(table=HOT_TABLE)), self.read_engine, params=params)]
+
+        for part in self.partitions(symbols, start, end):
+            if limit is not None and self._complete(frames, limit, part.day):
+                break
+            frames.append(self._read_partition(part, sql, params))
+
+        frames = [f for f in frames if not f.empty]
+        if not frames:
+            return pd.DataFrame(columns=COLUMNS)
+        df = pd.concat(frames, ignore_index=True)
+        df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601')
+        df = df.sort_values(['timestamp', 'id'], kind='stable')
+        if limit is not None:
+            df = df.tail(limit)
+        return df.reset_index(drop=True)
+
+    def latest(self, symbol, limit=5000):
+        """The newest `limit` ticks of one symbol, oldest first."""
+        return self.query(symbol, limit=limit)
+
+    def latest_many(self, symbols, limit=5000):
+        """
+        The newest `limit` ticks of every symbol, read with one statement per
+        table (see newest_per_symbol) instead of one query per symbol. Older
+        partitions are only read for symbols that are still short.
+
+        Returns:
+            pd.DataFrame: query() columns sorted by symbol, then (timestamp, id).
+        """
+        pending = list(dict.fromkeys(symbols))
+        frames = [self._read_newest(None, pending, limit)]
+        for part in self.partitions(pending):
+            pending = self._incomplete(frames, pending, limit, part.day)
+            if not pending:
+                break
+            wanted = pending if part.symbol is None else [s for s in pending if symbol_key(s) == part.symbol]
+            if wanted:
+                frames.append(self._read_newest(part, wanted, limit))
+
+        frames = [f for f in frames if not f.empty]
+        if not frames:
+            return pd.DataFrame(columns=COLUMNS)
+        df = pd.concat(frames, ignore_index=True)
+        df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601')
+        df = df.sort_values(['symbol', 'timestamp', 'id'], kind='stable')
+        return df.groupby('symbol', sort=False).tail(limit).reset_index(drop=True)
+
+    def latest_bars(self, symbols, timeframe, n_bars):
+        """
+        The newest `n_bars` bars per symbol resampled from ticks (fewer when
+        the whole history is shorter). Ticks are read with latest_many in
+        growing windows, sized from the ticks per bar seen so far, until every
+        symbol has its bars. The oldest bucket of a window that stops short of
+        a symbol's first tick may be cut, so it is never returned.
+
+        Returns:
+            dict: {symbol: OHLCV frame} for the symbols that have ticks.
+        """
+        frames = {}
+        pending = list(dict.fromkeys(symbols))
+        limit = max(n_bars * TICKS_PER_BAR_GUESS, 1)
+        while pending:
+            ticks = self.latest_many(pending, limit=limit)
+            if ticks.empty:
+                break
+            counts = ticks['symbol'].value_counts()
+            bars = split_panel(resample_ticks_many(ticks[['symbol', 'timestamp', 'price', 'volume']], timeframe))
+            growth = 2.0
+            short = []
+            for symbol in pending:
+                df = bars.get(symbol)
+                if df is None:
+                    continue
+                exhausted = counts[symbol] < limit
+                if not exhausted:
+                    df = df.iloc[1:]
+                if exhausted or len(df) >= n_bars:
+                    frames[symbol] = df.tail(n_bars)
+                else:
+                    short.append(symbol)
+                    growth = max(growth, 1.25 * n_bars / max(len(df), 1))
+            pending = short
+            limit = int(limit * min(growth, 64.0)) + 1
+        return frames
+
+    def newest(self, symbols):
+        """
+        The newest tick of each symbol in tick_data, where new ticks land: one
+        index seek per symbol. Cheap enough to use as a data version (see
+        core.feature_cache).
+
+        Returns:
+            dict: {symbol: (id, timestamp text)}, None for symbols without hot ticks.
+        """
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        symbols = list(dict.fromkeys(symbols))
+        found = {}
+        for sql, params in newest_per_symbol(symbols, 1, ['symbol', 'id', 'timestamp']):
+            with self.read_engine.connect() as conn:
+                for symbol, tick_id, ts in conn.execute(text(sql.format(table=HOT_TABLE)), params):
+                    found[symbol] = (tick_id, str(ts))
+        return {s: found.get(s) for s in symbols}
+
+    def scan(self, batch_size=100_000):
+        """
+        Yields every stored tick in batches: the hot table, then each
+        partition (newest first), in id order within a table. For bulk
+        copies such as core.compact_ticks.migrate_tick_data.
+
+        Yields:
+            (str, pd.DataFrame): table name and a batch of COLUMNS (timestamps unparsed).
+        """
+        sql = f"SELECT {', '.join(COLUMNS)} FROM {{table}} WHERE id > :after ORDER BY id LIMIT :limit"
+        for part in [None] + self.partitions():
+            after = -1
+            while True:
+                batch = self._read_partition(part, sql, {'after': after, 'limit': int(batch_size)})
+                if batch.empty:
+                    break
+                yield (HOT_TABLE if part is None else part.table), batch
+                after = int(batch['id'].iloc[-1])
+
+    def _read_newest(self, part, symbols, limit):
+        frames = [self._read_partition(part, sql, params) for sql, params in newest_per_symbol(symbols, limit, COLUMNS)]
+        return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+    @staticmethod
+    def _incomplete(frames, pending, limit, day):
+        # Symbols whose newest `limit` rows may still reach into `day` or older
+        read = [f[['symbol', 'timestamp']] for f in frames if not f.empty]
+        if not read:
+            return pending
+        df = pd.concat(read, ignore_index=True)
+        df = df[df['symbol'].isin(pending)]
+        df = df.assign(timestamp=pd.to_datetime(df['timestamp'], format='ISO8601'))
+        cutoff = df.sort_values('timestamp', ascending=False).groupby('symbol').nth(limit - 1)
+        day_end = pd.Timestamp(day) + pd.Timedelta(days=1)
+        done = set(cutoff.loc[cutoff['timestamp'] >= day_end, 'symbol'])
+        return [s for s in pending if s not in done]
+
+    def _select(self, symbols, start, end, limit):
+        clauses = []
+        params = {}
+        if symbols:
+            names = [f"sym{i}" for i in range(len(symbols))]
+            clauses.append(f"symbol IN ({', '.join(':' + n for n in names)})")
+            params.update(zip(names, symbols))
+        if start is not None:
+            clauses.append("timestamp >= :start")
+            params['start'] = str(start.to_pydatetime())
+        if end is not None:
+            clauses.append("timestamp < :end")
+            params['end'] = str(end.to_pydatetime())
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT {', '.join(COLUMNS)} FROM {{table}}{where}"
+        if limit is not None:
+            sql += " ORDER BY timestamp DESC LIMIT :limit"
+            params['limit'] = int(limit)
+        return sql, params
+
+    @staticmethod
+    def _complete(frames, limit, day):
+        # Everything in `day` is older than the newest `limit` rows read so far?
+        read = [f['timestamp'] for f in frames if not f.empty]
+        if sum(len(ts) for ts in read) < limit:
+            return False
+        cutoff = pd.to_datetime(pd.concat(read), format='ISO8601').nlargest(limit).iloc[-1]
+        return pd.Timestamp(day) + pd.Timedelta(days=1) <= cutoff
+
+    def _read_partition(self, part, sql, params):
+        # part None = the hot table
+        if part is None or part.path is None:
+            table = HOT_TABLE if part is None else part.table
+            return pd.read_sql(text(sql.format(table=table)), self.read_engine, params=params)
+        conn = sqlite3.connect(f"file:{part.path}?mode=ro", uri=True)
+        try:
+            return pd.read_sql(sql.format(table=HOT_TABLE), conn, params=params)
+        finally:
+            conn.close()
+
+    # --- Maintenance ---
+
+    def roll(self, before=None):
+        """
+        Moves ticks of closed trading days out of tick_data into day partitions.
+        Idempotent: late ticks for an already rolled day are merged into it,
+        inside its archive file when the day was archived meanwhile.
+
+        Args:
+            before (date | None): Roll days strictly before this (default: today).
+
+        Returns:
+            dict: {partition table: rows moved}.
+        """
+        before = before or date.today()
+        moved = {}
+        archived = []
+        with self.write_engine.begin() as conn:
+            if self.per_symbol:
+                groups = conn.execute(text(
+                    "SELECT DISTINCT substr(timestamp, 1, 10), symbol FROM tick_data WHERE timestamp < :before"
+                ), {'before': str(before)}).all()
+            else:
+                groups = [(day, None) for day in conn.execute(text(
+                    "SELECT DISTINCT substr(timestamp, 1, 10) FROM tick_data WHERE timestamp < :before"
+                ), {'before': str(before)}).scalars()]
+
+            for day_str, symbol in groups:
+                day = date.fromisoformat(day_str)
+                name = partition_name(day, symbol)
+                where, params = _day_filter(day, symbol)
+                if self._archive_path(name) is not None:
+                    # ATTACH is not allowed inside this transaction; done below
+                    archived.append((name, where, params))
+                    continue
+                conn.execute(text(PARTITION_DDL.format(schema='main', name=name)))
+                conn.execute(text(PARTITION_INDEX_DDL.format(schema='main', name=name)))
+                conn.execute(text(
+                    f"INSERT OR IGNORE INTO {name} ({', '.join(COLUMNS)}) "
+                    f"SELECT {', '.join(COLUMNS)} FROM tick_data WHERE {where}"
+                ), params)
+                moved[name] = conn.execute(text(f"DELETE FROM tick_data WHERE {where}"), params).rowcount
+
+        for name, where, params in archived:
+            moved[name] = self._roll_into_archive(name, where, params)
+        return moved
+
+    def _archive_path(self, name):
+        """The archive file of partition `name`, if it was archived."""
+        if not self.archive_dir:
+            return None
+        path = os.path.join(self.archive_dir, f"{name}.db")
+        return path if os.path.exists(path) else None
+
+    def _roll_into_archive(self, name, where, params):
+        # Late ticks for an archived day go into its file, where reads already look
+        raw = self.write_engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            cursor.execute("ATTACH DATABASE ? AS archive", (self._archive_path(name),))
+            try:
+                cursor.execute("BEGIN IMMEDIATE")
+                cursor.execute(f"INSERT OR IGNORE INTO archive.{HOT_TABLE} ({', '.join(COLUMNS)}) "
+                               f"SELECT {', '.join(COLUMNS)} FROM main.{HOT_TABLE} WHERE {where}", params)
+                moved = cursor.execute(f"DELETE FROM main.{HOT_TABLE} WHERE {where}", params).rowcount
+                raw.commit()
+            except Exception:
+                raw.rollback()
+                raise
+            finally:
+                cursor.execute("DETACH DATABASE archive")
+        finally:
+            raw.close()
+        return moved
+
+    def archive(self, part):
+        """
+        Moves one in-database partition into its own file under archive_dir
+        (table tick_data inside, so the file can be opened on its own).
+        """
+        if part.path is not None:
+            return part
+        if not self.archive_dir:
+            raise ValueError("archive_dir is not set")
+        os.makedirs(self.archive_dir, exist_ok=True)
+        path = os.path.join(self.archive_dir, f"{part.table}.db")
+
+        raw = self.write_engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            cursor.execute("ATTACH DATABASE ? AS archive", (path,))
+            try:
+                cursor.execute("BEGIN IMMEDIATE")
+                cursor.execute(PARTITION_DDL.format(schema='archive', name=HOT_TABLE))
+                cursor.execute(PARTITION_INDEX_DDL.format(schema='archive', name=HOT_TABLE))
+                cursor.execute(f"INSERT OR IGNORE INTO archive.{HOT_TABLE} SELECT {', '.join(COLUMNS)} FROM main.{part.table}")
+                cursor.execute(f"DROP TABLE main.{part.table}")
+                raw.commit()
+            except Exception:
+                raw.rollback()
+                raise
+            finally:
+                cursor.execute("DETACH DATABASE archive")
+        finally:
+            raw.close()
+        return part._replace(path=path)
+
+    def apply_retention(self, hot_days=HOT_DAYS, keep_days=KEEP_DAYS, today=None):
+        """
+        Archives partitions older than hot_days and deletes those older than keep_days.
+
+        Returns:
+            dict: archived and deleted partition names.
+        """
+        today = today or date.today()
+        archived, deleted = [], []
+        for part in self.partitions():
+            age = (today - part.day).days
+            if keep_days is not None and age > keep_days:
+                if part.path is None:
+                    with self.write_engine.begin() as conn:
+                        conn.execute(text(f"DROP TABLE {part.table}"))
+                else:
+                    os.remove(part.path)
+                deleted.append(part.table)
+            elif hot_days is not None and age > hot_days and part.path is None and self.archive_dir:
+                self.archive(part)
+                archived.append(part.table)
+        return {'archived': archived, 'deleted': deleted}
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def get_tick_store(role='analytics'):
+    """Process-wide TickStore reading through the `role` engine."""
+    with _stores_lock:
+        if role not in _stores:
+            _stores[role] = TickStore(role=role)
+        return _stores[role]
@@ -0,0 +1,273 @@
+import atexit
+import queue
+import threading
+from collections import deque
+import time
+import sys
+import os
+
+# Ensure we can import from core
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from core.database import TickData, OHLCVBar, lock_stats
+from core.bar_store import bar_upsert
+
+# Flush policy: whichever comes first
+BATCH_SIZE = 1000           # rows per transaction
+FLUSH_INTERVAL_MS = 250     # max time a tick waits before it is committed
+MAX_QUEUE = 100000          # submit() blocks when this many ticks are pending
+DEAD_LETTERS = 1000         # rows that failed even on their own, kept for inspection
+
+# Duplicate handling (tick_data is unique on symbol, timestamp, source)
+ON_CONFLICT = {
+    'ignore': 'OR IGNORE',     # keep the stored row (re-sent history is dropped)
+    'replace': 'OR REPLACE',   # upsert: the newest copy wins
+    None: None,                # plain INSERT: a duplicate fails the whole batch
+}
+
+_FLUSH = object()
+_STOP = object()
+
+class TickWriter:
+    """
+    Bounded write-behind queue for TickData rows (and other ingest tables).
+
+    Producers call submit() and return immediately. A dedicated writer thread
+    groups pending rows and commits them with one bulk INSERT per table in a
+    single transaction, so the disk sees one fsync per batch instead of one
+    per tick or order book update.
+    """
+
+    def __init__(self, engine=None, batch_size=BATCH_SIZE, flush_interval_ms=FLUSH_INTERVAL_MS,
+                 max_queue=MAX_QUEUE, table=None, on_conflict='ignore'):
+        """
+        Args:
+            engine: SQLAlchemy engine to write to (defaults to the 'ingest' role engine).
+            batch_size (int): Flush as soon as this many rows are pending.
+            flush_interval_ms (int): Flush at most this long after the first pending row arrived.
+            max_queue (int): Queue capacity; producers block when it is full.
+            table: Default target table for submit() (defaults to tick_data).
+            on_conflict (str | None): 'ignore', 'replace' or None, see ON_CONFLICT.
+        """
+        if engine is None:
+            from core.database import get_engine
+            engine = get_engine('ingest')
+        self.engine = engine
+        self.table = table if table is not None else TickData.__table__
+        self.batch_size = batch_size
+        if on_conflict not in ON_CONFLICT:
+            raise ValueError(f"on_conflict must be one of {list(ON_CONFLICT)}")
+        self.on_conflict = on_conflict
+        self._statements = {}
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.queue = queue.Queue(maxsize=max_queue)
+
+        self._thread = None
+        self._lock = threading.Lock()
+        self._count_lock = threading.Lock()
+        self._closed = False
+
+        # Counters
+        self.rows_submitted = 0
+        self.rows_written = 0
+        self.rows_failed = 0
+        self.rows_ignored = 0
+        self.rows_retried = 0
+        self.flushes = 0
+        # (table name, row, error) of rows no retry could write
+        self.dead_letters = deque(maxlen=DEAD_LETTERS)
+        self.max_queue_depth = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="tick-writer", daemon=True)
+                self._thread.start()
+        return self
+
+    def submit(self, row, block=True, timeout=None, table=None):
+        """
+        Queues one row (dict of column values) for the next batch.
+
+        Args:
+            row (dict): Column values.
+            table: Target table; defaults to the writer's table (tick_data).
+
+        Returns:
+            bool: False if the writer is closed or the queue stayed full past `timeout`.
+        """
+        if self._closed:
+            return False
+        if self._thread is None:
+            self.start()
+        try:
+            self.queue.put((table if table is not None else self.table, row), block=block, timeout=timeout)
+        except queue.Full:
+            return False
+
+        depth = self.queue.qsize()
+        with self._count_lock:
+            self.rows_submitted += 1
+            if depth > self.max_queue_depth:
+                self.max_queue_depth = depth
+        return True
+
+    def flush(self, timeout=None):
+        """Commits everything submitted so far and waits until it is on disk."""
+        if self._thread is None or self._closed:
+            return
+        done = threading.Event()
+        self.queue.put((_FLUSH, done))
+        done.wait(timeout)
+
+    def close(self, timeout=None):
+        """Flush-on-shutdown: drains the queue, commits the last batch and stops the thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        if self._thread is not None:
+            self.queue.put(_STOP)
+            self._thread.join(timeout)
+
+    def stats(self):
+        return {
+            'queue_depth': self.queue.qsize(),
+            'max_queue_depth': self.max_queue_depth,
+            'rows_submitted': self.rows_submitted,
+            'rows_written': self.rows_written,
+            'rows_failed': self.rows_failed,
+            'rows_ignored': self.rows_ignored,
+            'rows_retried': self.rows_retried,
+            'dead_letters': len(self.dead_letters),
+            'flushes': self.flushes,
+            'last_flush_ms': self.last_flush_ms,
+            'avg_flush_ms': self._total_flush_ms / self.flushes if self.flushes else 0.0,
+            'max_flush_ms': self.max_flush_ms,
+        }
+
+    def _run(self):
+        batch = []
+        deadline = None
+        while True:
+            if batch:
+                wait = max(0.0, deadline - time.monotonic())
+            else:
+                wait = None
+
+            try:
+                item = self.queue.get(timeout=wait)
+            except queue.Empty:
+                # Time limit reached for the oldest pending row
+                self._write(batch)
+                batch = []
+                continue
+
+            if item is _STOP:
+                self._write(batch)
+                return
+
+            if item[0] is _FLUSH:
+                self._write(batch)
+                batch = []
+                item[1].set()
+                continue
+
+            if not batch:
+                deadline = time.monotonic() + self.flush_interval
+            batch.append(item)
+
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                batch = []
+
+    def _insert(self, table):
+        stmt = self._statements.get(table)
+        if stmt is None and table is OHLCVBar.__table__:
+            # Partial bars of one bucket (e.g. around a restart) merge instead of conflicting
+            stmt = self._statements[table] = bar_upsert()
+        elif stmt is None:
+            stmt = table.insert()
+            prefix = ON_CONFLICT[self.on_conflict]
+            if prefix:
+                stmt = stmt.prefix_with(prefix, dialect='sqlite')
+            self._statements[table] = stmt
+        return stmt
+
+    def _write(self, items):
+        if not items:
+            return
+        by_table = {}
+        for table, row in items:
+            by_table.setdefault(table, []).append(row)
+
+        start = time.perf_counter()
+        try:
+            self._commit(by_table)
+        except Exception as e:
+            # One bad statement must not cost the rest of the batch: retry each
+            # table in its own transaction, then the rows of a failing table one by one
+            print(f"[!] Tick writer flush failed ({len(items)} rows), retrying per table: {e}")
+            self.rows_retried += len(items)
+            for table, rows in by_table.items():
+                self._write_isolated(table, rows)
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.flushes += 1
+        self.last_flush_ms = elapsed_ms
+        self._total_flush_ms += elapsed_ms
+        if elapsed_ms > self.max_flush_ms:
+            self.max_flush_ms = elapsed_ms
+
+    def _commit(self, by_table):
+        """One transaction, one bulk statement per table; updates the written/ignored counters."""
+        ignored = 0
+        with self.engine.begin() as conn:
+            for table, rows in by_table.items():
+                result = conn.execute(self._insert(table), rows)
+                if result.rowcount >= 0:
+                    ignored += len(rows) - result.rowcount
+        self.rows_written += sum(len(rows) for rows in by_table.values()) - ignored
+        self.rows_ignored += ignored
+
+    def _write_isolated(self, table, rows):
+        try:
+            self._commit({table: rows})
+            return
+        except Exception:
+            pass
+        for row in rows:
+            try:
+                self._commit({table: [row]})
+            except Exception as e:
+                self.rows_failed += 1
+                self.dead_letters.append((table.name, row, str(e)))
+                print(f"[!] Tick writer dropped a {table.name} row: {e}")
+
+_default_writer = None
+_default_lock = threading.Lock()
+
+def get_tick_writer():
+    """Returns the process-wide writer, starting it on first use."""
+    global _default_writer
+    with _default_lock:
+        if _default_writer is None:
+            _default_writer = TickWriter().start()
+            atexit.register(_default_writer.close)
+    return _default_writer
+
+def close_tick_writer():
+    """Flushes and stops the process-wide writer (safe to call if it never started)."""
+    global _default_writer
+    with _default_lock:
+        writer, _default_writer = _default_writer, None
+    if writer is not None:
+        writer.close()
+        print(f"[*] Tick writer closed: {writer.stats()}")
+        print(f"[*] Write-lock waits: {lock_stats('ingest')}")
@@ -10,8 +10,12 @@ from datetime import datetime
 
 # Resolve paths
 sys.path.append(os.getcwd())
+# Analysis process: read-only database access, no schema setup on every rerun
+os.environ.setdefault('BIST_DB_READ_ONLY', '1')
 
-from core.feature_engine import fetch_and_process_data
+from core.feature_engine import fetch_and_process_data, fetch_ohlcv, fetch_many, add_indicators
+from core.tick_bus import BarCache
+from core.panel_features import BarPanel, feature_tensor
 from models.lstm_price.definitions import BISTLSTM
 
 # --- Configuration & Custom CSS ---
@@ -127,12 +131,42 @@ def run_inference(model, df):
         
     return prob
 
+@st.cache_resource
+def get_bar_cache():
+    """Live 1min bars pushed by the ingestion server (shared by all sessions)."""
+    from core.config_symbols import ALL_SYMBOLS
+    return BarCache('1min', ALL_SYMBOLS, maxlen=2000).start()
+
 def get_data(symbol):
-    """Fetches and processes data from database."""
+    """Fetches and processes data from the live bar cache, or the database."""
     # We need enough data for indicators (200 for EMA) + plotting
-    df = fetch_and_process_data(symbol, timeframe='1min', limit=2000)
+    bar_cache = get_bar_cache()
+    if bar_cache.connected:
+        if not bar_cache.is_seeded(symbol):
+            bar_cache.seed(symbol, fetch_ohlcv(symbol, timeframe='1min', limit=2000, role='dashboard'))
+        bars = bar_cache.frame(symbol)
+        return add_indicators(bars) if not bars.empty else bars
+    df = fetch_and_process_data(symbol, timeframe='1min', limit=2000, role='dashboard')
     return df
 
+def get_bars_many(symbols):
+    """OHLCV bars for a symbol list ({symbol: frame}) from the bar cache, or one batched database read."""
+    bar_cache = get_bar_cache()
+    if not bar_cache.connected:
+        return fetch_many(symbols, timeframe='1min', lookback=2000, role='dashboard')
+    unseeded = [s for s in symbols if not bar_cache.is_seeded(s)]
+    if unseeded:
+        history = fetch_many(unseeded, timeframe='1min', lookback=2000, role='dashboard')
+        for sym in unseeded:
+            if sym in history:
+                bar_cache.seed(sym, history[sym])
+    frames = {}
+    for sym in symbols:
+        bars = bar_cache.frame(sym)
+        if not bars.empty:
+            frames[sym] = bars
+    return frames
+
 # --- UI Layout ---
 
 # Sidebar
@@ -203,18 +237,23 @@ def scan_whole_market():
     scan_model = load_model()
     if not scan_model: return []
 
-    for sym in AVAILABLE_SYMBOLS:
+    # Fetch sufficient data for indicators (EMA200) + Sequence (60) for every symbol in one read,
+    # then compute every symbol's indicators in one panel pass and score them in one batch
+    try:
+        panel = BarPanel.from_frames(get_bars_many(AVAILABLE_SYMBOLS))
+        batch, symbols = feature_tensor(panel, window=SEQUENCE_LENGTH)
+    except Exception as e:
+        print(f"Scanner Error: {e}")
+        return []
+
+    if symbols:
         try:
-            # Fetch sufficient data for indicators (EMA200) + Sequence (60)
-            # Increased limit to 2000 to ensure we cover enough history even with gaps
-            d = fetch_and_process_data(sym, timeframe='1min', limit=2000) 
-            if not d.empty and len(d) >= SEQUENCE_LENGTH:
-                prob = run_inference(scan_model, d)
-                results.append({'symbol': sym, 'prob': prob})
+            with torch.no_grad():
+                probs = scan_model(torch.from_numpy(batch)).reshape(-1).tolist()
+            results = [{'symbol': sym, 'prob': prob} for sym, prob in zip(symbols, probs)]
         except Exception as e:
-            print(f"Scanner Error for {sym}: {e}")
-            pass
-    
+            print(f"Scanner Error: {e}")
+
     # Sort by Probability Descending
     return sorted(results, key=lambda x: x['prob'], reverse=True)
 
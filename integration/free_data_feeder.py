@@ -3,6 +3,7 @@ import time
 import json
 import datetime
 import sys
+import argparse
 
 # Kütüphane kontrolü ve yükleme talimatı
 try:
@@ -20,6 +21,7 @@ if project_root not in sys.path:
     sys.path.append(project_root)
 
 from core.config_symbols import ALL_SYMBOLS
+from integration.matriks_bridge.wire_protocol import negotiate_binary
 
 # Konfigürasyon
 HOST = '127.0.0.1'
@@ -31,19 +33,27 @@ WATCHLIST = [f"{s}.IS" for s in ALL_SYMBOLS]
 INTERVAL_SECONDS = 60  # Tüm liste döndükten sonra ne kadar beklenecek
 SYMBOL_DELAY = 2       # Her hisse sorgusu arası bekleme (Engel yememek için)
 
-def connect_to_server():
+def connect_to_server(binary=False):
+    """
+    Returns:
+        tuple: (socket, BinaryTickEncoder or None when JSON lines are used)
+    """
     while True:
         try:
             s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             s.connect((HOST, PORT))
             print(f"[+] Sunucuya bağlanıldı: {HOST}:{PORT}")
-            return s
+            encoder = None
+            if binary:
+                encoder = negotiate_binary(s, source="YahooFinance")
+                print("[+] Binary protokol aktif")
+            return s, encoder
         except ConnectionRefusedError:
             print("[!] Sunucu bulunamadı. Tekrar deneniyor... (socket_server.py çalışıyor mu?)")
             time.sleep(5)
 
-def fetch_and_send():
-    s = connect_to_server()
+def fetch_and_send(binary=False):
+    s, encoder = connect_to_server(binary)
     
     print(f"--- Yahoo Finance Veri Akışı Başlatılıyor ({len(WATCHLIST)} Hisse) ---")
     
@@ -69,7 +79,17 @@ def fetch_and_send():
 
                 if not df.empty:
                     # İlk turda tüm geçmişi gönder
-                    if first_run:
+                    if first_run and encoder:
+                        # Tüm geçmişi tek bir binary frame içinde gönder
+                        ticks = [
+                            (sys_symbol, float(close), int(volume), index.replace(tzinfo=None))
+                            for index, close, volume in zip(df.index, df['Close'], df['Volume'])
+                        ]
+                        s.sendall(encoder.encode(ticks))
+                        print(f"[{sys_symbol}] {len(ticks)} adet geçmiş veri yüklendi (binary). ✅")
+                        time.sleep(0.1)
+
+                    elif first_run:
                         records_sent = 0
                         for index, row in df.iterrows():
                             # Timestamp timezone convert
@@ -102,8 +122,11 @@ def fetch_and_send():
                             "source": "YahooFinance"
                         }
                         
-                        json_str = json.dumps(data)
-                        s.sendall((json_str + "\n").encode('utf-8'))
+                        if encoder:
+                            s.sendall(encoder.encode([(sys_symbol, data['price'], data['volume'], timestamp)]))
+                        else:
+                            json_str = json.dumps(data)
+                            s.sendall((json_str + "\n").encode('utf-8'))
                         print(f"[{timestamp}] {sys_symbol} Canlı Veri Gönderildi -> {float(last_quote['Close']):.2f} TL")
                     
                 else:
@@ -126,10 +149,13 @@ def fetch_and_send():
         except (BrokenPipeError, ConnectionResetError):
             print("[!] Bağlantı koptu. Yeniden bağlanılıyor...")
             s.close()
-            s = connect_to_server()
+            s, encoder = connect_to_server(binary)
         except Exception as e:
             print(f"[!] Hata: {e}")
             time.sleep(5)
 
 if __name__ == "__main__":
-    fetch_and_send()
+    parser = argparse.ArgumentParser(description="Yahoo Finance -> socket_server.py veri besleyici")
+    parser.add_argument('--binary', action='store_true', help="JSON yerine binary framed protokol kullan")
+    args = parser.parse_args()
+    fetch_and_send(binary=args.binary)
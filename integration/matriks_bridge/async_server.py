@@ -0,0 +1,221 @@
+import asyncio
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Resolve project root absolute path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(current_dir))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from integration.matriks_bridge import socket_server
+from integration.matriks_bridge.socket_server import HOST, PORT, parse_message, save_to_db, flush_open_bars
+from integration.matriks_bridge.wire_protocol import (
+    MAGIC, VERSION as WIRE_VERSION, ProtocolError, BinaryFrameDecoder,
+    build_ack, could_be_binary, parse_hello
+)
+from core.tick_writer import close_tick_writer
+
+# Parsed ticks waiting for the writer stage. When it is full, readers stop
+# reading from their sockets and TCP flow control pushes back on the feeders.
+QUEUE_SIZE = 10000
+# Maximum ticks handed to the writer thread in one executor call
+WRITE_BATCH = 500
+
+class AsyncTickServer:
+    """
+    Single event loop tick ingestion server.
+
+    Every feeder (Matriks bridge, free_data_feeder, replay tools) is served by
+    a coroutine on the same loop. Parsing happens on the loop, handing rows to
+    the sink happens in a separate writer stage on a dedicated thread, so a
+    full write-behind queue or a slow SQLite commit never stalls the readers.
+    """
+
+    def __init__(self, host=HOST, port=PORT, sink=save_to_db, queue_size=QUEUE_SIZE):
+        """
+        Args:
+            host (str): Interface to bind.
+            port (int): TCP port to listen on.
+            sink (callable): Called with each parsed message dict on the writer thread.
+            queue_size (int): Capacity of the parse -> write queue.
+        """
+        self.host = host
+        self.port = port
+        self.sink = sink
+        self.queue_size = queue_size
+
+        self.queue = None
+        self.server = None
+        self.clients = 0
+        self.ticks_parsed = 0
+        self.ticks_written = 0
+
+        # One writer thread keeps SQLite writes serialized
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tick-sink")
+        self._writer_task = None
+
+    async def start(self):
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self._writer_task = asyncio.create_task(self._writer_stage())
+        self.server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        print(f"[*] Async server listening on {self.host}:{self.port}")
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def stop(self):
+        """Stops accepting connections and drains the writer stage."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+        if self.queue is not None:
+            await self.queue.join()
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+        self._executor.shutdown(wait=True)
+        if self.sink is save_to_db:
+            # Flush the write-behind queue before the process goes away
+            flush_open_bars()
+            close_tick_writer()
+        print(f"[*] Server stopped. Parsed: {self.ticks_parsed} | Written: {self.ticks_written}")
+
+    async def _handle_client(self, reader, writer):
+        addr = writer.get_extra_info('peername')
+        self.clients += 1
+        print(f"[+] Accepted connection from {addr}")
+        try:
+            # Binary clients open with wire_protocol.MAGIC, JSON clients with '{'
+            head = b""
+            while len(head) < len(MAGIC) and could_be_binary(head):
+                chunk = await reader.read(len(MAGIC) - len(head))
+                if not chunk:
+                    break
+                head += chunk
+
+            if len(head) >= len(MAGIC) and could_be_binary(head):
+                await self._handle_binary(reader, writer, head)
+                return
+
+            async for line in _iter_lines(reader, head):
+                line = line.strip()
+                if not line:
+                    continue
+
+                data = parse_message(line)
+                if data is None:
+                    continue
+                self.ticks_parsed += 1
+                await self.queue.put(data)
+
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            print("[-] Connection reset by client")
+        except ValueError as e:
+            # StreamReader raises ValueError when a line exceeds its limit
+            print(f"[!] Oversized message, dropping client: {e}")
+        except Exception as e:
+            print(f"[!] Error handling client: {e}")
+        finally:
+            self.clients -= 1
+            writer.close()
+            print("[-] Connection closed")
+
+    async def _handle_binary(self, reader, writer, head):
+        buf = bytearray(head)
+        hello = parse_hello(buf)
+        while hello is None:
+            chunk = await reader.read(256)
+            if not chunk:
+                return
+            buf += chunk
+            hello = parse_hello(buf)
+
+        version, source, used = hello
+        if version != WIRE_VERSION:
+            print(f"[!] Unsupported binary protocol version {version}")
+            writer.write(build_ack(status=1))
+            await writer.drain()
+            return
+        writer.write(build_ack())
+        await writer.drain()
+        print(f"[+] Binary protocol v{version} negotiated (source: {source or '-'})")
+
+        decoder = BinaryFrameDecoder(source)
+        data = bytes(buf[used:])
+        while True:
+            try:
+                arrays = decoder.feed(data)
+            except ProtocolError as e:
+                print(f"[!] Binary protocol error, dropping client: {e}")
+                return
+
+            for arr in arrays:
+                messages = decoder.to_messages(arr)
+                self.ticks_parsed += len(messages)
+                for msg in messages:
+                    await self.queue.put(msg)
+
+            data = await reader.read(65536)
+            if not data:
+                break
+
+    async def _writer_stage(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < WRITE_BATCH and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+
+            try:
+                await loop.run_in_executor(self._executor, self._write_batch, batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def _write_batch(self, batch):
+        for data in batch:
+            try:
+                self.sink(data)
+                self.ticks_written += 1
+            except Exception as e:
+                print(f"[!] Error writing tick: {e}")
+
+async def _iter_lines(reader, head):
+    """Yields newline-delimited records, starting with the bytes already sniffed."""
+    while b"\n" in head:
+        line, head = head.split(b"\n", 1)
+        yield line
+    if head:
+        yield head + await reader.readline()
+    while True:
+        line = await reader.readline()
+        if not line:
+            return
+        yield line
+
+def run_async_server(host=HOST, port=PORT, verbose=None):
+    """Runs the asyncio server until interrupted."""
+    if verbose is not None:
+        socket_server.VERBOSE = verbose
+
+    server = AsyncTickServer(host, port)
+
+    async def _main():
+        await server.start()
+        try:
+            await server.serve_forever()
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(_main())
+    except KeyboardInterrupt:
+        print("\n[*] Server stopping...")
+
+if __name__ == "__main__":
+    run_async_server()
@@ -1,21 +1,144 @@
+"""
+Synthetic tick feeder for socket_server.py.
+
+Default mode sends one tick every 100 ms over a single connection. With
+--rate it becomes a load generator: N connections (one process each) share
+a target rate, prices follow a per-symbol random walk on the BIST price
+grid, and optional bursts model the opening rush. Each tick carries its send
+time as `timestamp`, so a probe subscribed to the server's tick bus measures
+send -> ingest latency.
+
+Usage:
+    python integration/matriks_bridge/mock_data_feeder.py
+    python integration/matriks_bridge/mock_data_feeder.py --spawn async --connections 8 --rate 100000 \
+        --duration 20 --burst-factor 3 --burst-duration 2 --burst-every 10
+"""
 import socket
 import json
 import time
 import random
-from datetime import datetime
+import argparse
+import itertools
+import multiprocessing
+import sqlite3
+import subprocess
+import sys
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Resolve project root absolute path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(current_dir))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from core.config_symbols import ALL_SYMBOLS
+from core.tick_bus import connect_tick_bus
+from integration.matriks_bridge.wire_protocol import negotiate_binary
 
 HOST = '127.0.0.1'
 PORT = 5555
 
 SYMBOLS = ['THYAO', 'ASELS', 'GARAN', 'AKBNK', 'EREGL']
 
+SERVER_SCRIPT = os.path.join(current_dir, 'socket_server.py')
+SEND_SLICE = 0.005   # Load mode pacing granularity (seconds)
+
+# BIST price steps: (upper bound of the price band, tick size)
+PRICE_STEPS = [
+    (20.0, 0.01), (50.0, 0.02), (100.0, 0.05), (250.0, 0.10),
+    (500.0, 0.25), (1000.0, 0.50), (2500.0, 1.00), (float('inf'), 2.50),
+]
+
+def price_step(price):
+    for upper, step in PRICE_STEPS:
+        if price < upper:
+            return step
+
+def snap_price(price):
+    """Rounds a price onto the BIST grid of its band."""
+    step = price_step(price)
+    return round(max(step, round(price / step) * step), 2)
+
+class RandomWalk:
+    """
+    Per-symbol price process for synthetic feeds.
+
+    Each symbol moves a few price steps per trade (Gaussian, with its own
+    volatility) and stays on the price grid. Trade frequency follows a
+    Zipf-like weighting, so a handful of names print far more often than the
+    rest, as in a real session.
+    """
+
+    def __init__(self, symbols, seed=None):
+        self.rng = random.Random(seed)
+        self.symbols = list(symbols)
+        self.prices = {s: snap_price(self.rng.uniform(10.0, 500.0)) for s in self.symbols}
+        self.volatility = {s: self.rng.uniform(0.5, 3.0) for s in self.symbols}  # steps per trade
+        weights = [1.0 / rank for rank in range(1, len(self.symbols) + 1)]
+        self.rng.shuffle(weights)
+        self._cum_weights = list(itertools.accumulate(weights))
+
+    def _move(self, symbol):
+        price = self.prices[symbol]
+        move = round(self.rng.gauss(0.0, self.volatility[symbol]))
+        price = snap_price(price + move * price_step(price))
+        self.prices[symbol] = price
+        return price
+
+    def next_tick(self):
+        """Returns (symbol, price, volume) for one trade."""
+        symbol = self.rng.choices(self.symbols, cum_weights=self._cum_weights)[0]
+        return symbol, self._move(symbol), self._volume()
+
+    def ticks(self, n, timestamp):
+        """
+        Returns `n` (symbol, price, volume, timestamp) tuples. Ticks are spaced
+        1 microsecond apart from `timestamp` so each one has a distinct key.
+        """
+        symbols = self.rng.choices(self.symbols, cum_weights=self._cum_weights, k=n)
+        if timestamp is None:
+            return [(s, self._move(s), self._volume(), None) for s in symbols]
+        return [(s, self._move(s), self._volume(), timestamp + timedelta(microseconds=i))
+                for i, s in enumerate(symbols)]
+
+    def _volume(self):
+        return max(1, int(self.rng.lognormvariate(4.0, 1.2)))
+
+class BurstSchedule:
+    """
+    Target tick rate over time: `rate`, multiplied by `factor` during the
+    first `duration` seconds (the opening rush) and again at the start of
+    every `every` seconds if that is set.
+    """
+
+    def __init__(self, rate, factor=1.0, duration=0.0, every=0.0):
+        self.rate = rate
+        self.factor = factor
+        self.duration = duration
+        self.every = every
+
+    def rate_at(self, t):
+        if self.duration > 0 and self.factor != 1.0:
+            phase = t % self.every if self.every > 0 else t
+            if phase < self.duration:
+                return self.rate * self.factor
+        return self.rate
+
+    def scaled(self, share):
+        return BurstSchedule(self.rate * share, self.factor, self.duration, self.every)
+
+_walk = RandomWalk(SYMBOLS)
+
 def generate_mock_data():
     """
     Generates a random market data packet.
     """
-    symbol = random.choice(SYMBOLS)
-    price = round(random.uniform(10.0, 500.0), 2)
-    volume = random.randint(1, 1000)
+    symbol, price, volume = _walk.next_tick()
     
     return {
         "symbol": symbol,
@@ -24,9 +147,13 @@ def generate_mock_data():
         "timestamp": datetime.now().isoformat()
     }
 
-def run_feeder():
+def run_feeder(binary=False, batch=1):
     """
     Connects to the server and sends data continuously.
+
+    Args:
+        binary (bool): Negotiate the length-prefixed binary protocol instead of JSON lines.
+        batch (int): Ticks packed into each binary frame (ignored for JSON).
     """
     while True:
         try:
@@ -35,11 +162,21 @@ def run_feeder():
             client_socket.connect((HOST, PORT))
             print("[+] Connected to server!")
 
+            encoder = None
+            if binary:
+                encoder = negotiate_binary(client_socket, source="MockFeeder")
+                print("[+] Binary protocol negotiated")
+
             while True:
-                data = generate_mock_data()
-                json_data = json.dumps(data) + "\n" # Add newline as delimiter
-                
-                client_socket.sendall(json_data.encode('utf-8'))
+                if encoder:
+                    ticks = [generate_mock_data() for _ in range(batch)]
+                    frame = encoder.encode((d['symbol'], d['price'], d['volume'], d['timestamp']) for d in ticks)
+                    client_socket.sendall(frame)
+                else:
+                    data = generate_mock_data()
+                    json_data = json.dumps(data) + "\n" # Add newline as delimiter
+
+                    client_socket.sendall(json_data.encode('utf-8'))
                 # print(f"Sent: {data}") # Optional debug print
                 
                 time.sleep(0.1) # 100ms interval
@@ -58,5 +195,242 @@ def run_feeder():
              if 'client_socket' in locals():
                 client_socket.close()
 
+def _load_worker(conn_id, host, port, symbols, schedule, duration, binary, seed, results):
+    """One load connection: sends paced batches until `duration` elapses."""
+    walk = RandomWalk(symbols, seed=seed)
+    sent = 0
+    max_lag = 0.0
+    try:
+        sock = socket.create_connection((host, port))
+        encoder = negotiate_binary(sock, source=f"load-{conn_id}") if binary else None
+
+        start = last = time.perf_counter()
+        credit = 0.0
+        while True:
+            now = time.perf_counter()
+            t = now - start
+            if t >= duration:
+                break
+            credit += schedule.rate_at(t) * (now - last)
+            last = now
+            n = int(credit)
+            if n:
+                credit -= n
+                # Send time doubles as the tick timestamp (naive local, like the live feeders)
+                ticks = walk.ticks(n, datetime.now())
+                if encoder:
+                    payload = encoder.encode(ticks)
+                else:
+                    payload = "".join(
+                        json.dumps({"symbol": sym, "price": price, "volume": vol, "timestamp": ts.isoformat(),
+                                    "source": f"load-{conn_id}"}) + "\n"
+                        for sym, price, vol, ts in ticks
+                    ).encode('utf-8')
+                sock.sendall(payload)
+                sent += n
+
+            delay = SEND_SLICE - (time.perf_counter() - now)
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                max_lag = max(max_lag, -delay)
+        elapsed = time.perf_counter() - start
+        sock.close()
+    except Exception as e:
+        print(f"[!] Load connection {conn_id} failed: {e}")
+        elapsed = 0.0
+    results.put({'conn': conn_id, 'sent': sent, 'elapsed': elapsed, 'max_lag_ms': max_lag * 1000})
+
+class LatencyProbe(threading.Thread):
+    """
+    Subscribes to the server's tick bus and records send -> publish latency
+    (now - tick timestamp) for a few symbols.
+    """
+
+    def __init__(self, symbols, address=None):
+        super().__init__(daemon=True)
+        self.sub = connect_tick_bus(['tick'], symbols, address)
+        self.latencies_ms = []
+        self._stop_event = threading.Event()
+
+    def run(self):
+        if self.sub is None:
+            return
+        try:
+            while not self._stop_event.is_set():
+                for msg in self.sub.recv(timeout=0.2):
+                    lag = datetime.now() - datetime.fromisoformat(msg['timestamp'])
+                    self.latencies_ms.append(lag.total_seconds() * 1000)
+        except (ConnectionError, OSError):
+            pass
+
+    def stop(self):
+        self._stop_event.set()
+        self.join(2)
+        if self.sub is not None:
+            self.sub.close()
+
+def count_rows(db_path):
+    try:
+        conn = sqlite3.connect(db_path, timeout=30)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM tick_data").fetchone()[0]
+        finally:
+            conn.close()
+    except sqlite3.OperationalError:
+        return 0
+
+def _wait_for_port(host, port, timeout=15.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+def spawn_server(mode, port):
+    """
+    Starts socket_server.py against a scratch database, tick bus and bar rings.
+
+    Returns:
+        tuple: (process, db_path, bus_address)
+    """
+    tmp_dir = tempfile.mkdtemp(prefix="bist_load_")
+    db_path = os.path.join(tmp_dir, 'market_data.db')
+    bus_address = os.path.join(tmp_dir, 'bus.sock') if hasattr(socket, 'AF_UNIX') else f"127.0.0.1:{port + 1}"
+    env = dict(os.environ, BIST_DB_PATH=db_path, BIST_BUS_ADDRESS=bus_address,
+               BIST_RING_DIR=os.path.join(tmp_dir, 'bar_rings'))
+    proc = subprocess.Popen(
+        [sys.executable, SERVER_SCRIPT, '--mode', mode, '--port', str(port), '--quiet'],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    if not _wait_for_port(HOST, port):
+        proc.kill()
+        raise RuntimeError(f"{mode} server did not start")
+    return proc, db_path, bus_address
+
+def stop_server(proc, timeout=30.0):
+    """Stops a spawn_server() process, giving it `timeout` seconds to flush."""
+    proc.terminate()
+    try:
+        proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+def run_load(connections, schedule, duration, host=HOST, port=PORT, binary=False,
+             symbols=ALL_SYMBOLS, db_path=None, bus_address=None, probe_symbols=5,
+             drain_timeout=120.0, seed=None):
+    """
+    Drives `connections` feeder processes at `schedule` for `duration` seconds.
+
+    Returns:
+        dict: Sent / persisted counts, throughput and latency percentiles (ms).
+    """
+    if bus_address is not None:
+        os.environ['BIST_BUS_ADDRESS'] = bus_address
+    probe = LatencyProbe(list(symbols)[:probe_symbols])
+    probe.start()
+    time.sleep(0.2)  # Let the subscription register before the first tick
+
+    # Disjoint symbol partitions keep every symbol's walk on one connection
+    results = multiprocessing.Queue()
+    workers = []
+    for c in range(connections):
+        part = list(symbols)[c::connections] if len(symbols) >= connections else list(symbols)
+        seed_c = None if seed is None else seed + c
+        w = multiprocessing.Process(
+            target=_load_worker,
+            args=(c, host, port, part, schedule.scaled(1.0 / connections), duration, binary, seed_c, results)
+        )
+        workers.append(w)
+
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    stats = [results.get() for _ in workers]
+    for w in workers:
+        w.join()
+    send_elapsed = time.perf_counter() - start
+    sent = sum(s['sent'] for s in stats)
+
+    persisted = None
+    persist_elapsed = None
+    if db_path:
+        deadline = time.time() + drain_timeout
+        persisted = count_rows(db_path)
+        while persisted < sent and time.time() < deadline:
+            time.sleep(0.05)
+            persisted = count_rows(db_path)
+        persist_elapsed = time.perf_counter() - start
+
+    time.sleep(0.2)
+    probe.stop()
+    lat = np.asarray(probe.latencies_ms)
+
+    return {
+        'connections': connections,
+        'sent': sent,
+        'send_elapsed': send_elapsed,
+        'send_rate': sent / send_elapsed if send_elapsed else 0.0,
+        'max_sender_lag_ms': max((s['max_lag_ms'] for s in stats), default=0.0),
+        'persisted': persisted,
+        'persist_rate': persisted / persist_elapsed if persisted else None,
+        'latency_samples': len(lat),
+        'p50_ms': float(np.percentile(lat, 50)) if len(lat) else None,
+        'p99_ms': float(np.percentile(lat, 99)) if len(lat) else None,
+        'max_ms': float(lat.max()) if len(lat) else None,
+    }
+
+def print_report(res, schedule, duration):
+    print("-" * 72)
+    burst = ""
+    if schedule.duration > 0 and schedule.factor != 1.0:
+        every = f" every {schedule.every:g}s" if schedule.every > 0 else " at open"
+        burst = f" (x{schedule.factor:g} for {schedule.duration:g}s{every})"
+    print(f"Connections: {res['connections']} | Target: {schedule.rate:,.0f} ticks/s{burst} | Duration: {duration:g}s")
+    print(f"Sent:        {res['sent']:,} ticks | {res['send_rate']:,.0f} ticks/s "
+          f"| max sender lag {res['max_sender_lag_ms']:.1f} ms")
+    if res['persisted'] is not None:
+        print(f"Persisted:   {res['persisted']:,} rows | sustained {res['persist_rate'] or 0:,.0f} rows/s")
+    if res['latency_samples']:
+        print(f"Latency (send -> tick bus, {res['latency_samples']:,} samples): "
+              f"p50 {res['p50_ms']:.2f} ms | p99 {res['p99_ms']:.2f} ms | max {res['max_ms']:.2f} ms")
+    else:
+        print("Latency:     no samples (is the server publishing on the tick bus?)")
+    print("-" * 72)
+
 if __name__ == "__main__":
-    run_feeder()
+    parser = argparse.ArgumentParser(description="Random tick feeder / load generator for socket_server.py")
+    parser.add_argument('--binary', action='store_true', help="Use the binary framed protocol")
+    parser.add_argument('--batch', type=int, default=1, help="Ticks per binary frame (single feeder mode)")
+    parser.add_argument('--rate', type=float, help="Load mode: target ticks/s across all connections")
+    parser.add_argument('--connections', type=int, default=4, help="Load mode: concurrent connections")
+    parser.add_argument('--duration', type=float, default=30.0, help="Load mode: seconds to send")
+    parser.add_argument('--burst-factor', type=float, default=1.0, help="Rate multiplier during bursts")
+    parser.add_argument('--burst-duration', type=float, default=0.0, help="Seconds per burst (first one at t=0)")
+    parser.add_argument('--burst-every', type=float, default=0.0, help="Seconds between burst starts (0 = open only)")
+    parser.add_argument('--spawn', choices=['threaded', 'async'],
+                        help="Start socket_server.py on a scratch DB/bus and report persisted throughput")
+    parser.add_argument('--db', help="Database the target server writes to (for persisted throughput)")
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+
+    if args.rate is None:
+        run_feeder(binary=args.binary, batch=args.batch)
+    else:
+        schedule = BurstSchedule(args.rate, args.burst_factor, args.burst_duration, args.burst_every)
+        proc = None
+        db_path, bus_address = args.db, None
+        if args.spawn:
+            proc, db_path, bus_address = spawn_server(args.spawn, args.port)
+        try:
+            res = run_load(args.connections, schedule, args.duration, port=args.port, binary=args.binary,
+                           db_path=db_path, bus_address=bus_address, seed=args.seed)
+            print_report(res, schedule, args.duration)
+        finally:
+            if proc is not None:
+                stop_server(proc)
@@ -2,6 +2,8 @@ import socket
 import json
 import sys
 import os
+import argparse
+import signal
 import threading
 from datetime import datetime
 
@@ -11,53 +13,148 @@ project_root = os.path.dirname(os.path.dirname(current_dir))
 if project_root not in sys.path:
     sys.path.append(project_root)
 
-from core.database import SessionLocal, TickData
+from core.database import OrderBookSnapshot, OHLCVBar
+from core.bar_builder import BarBuilder
+from core.bar_ring import get_bar_rings, start_bar_rings, close_bar_rings
+from core.orderflow import BOOK_DEPTH, calculate_imbalance, calculate_weighted_imbalance, pack_levels
+from core.tick_bus import get_tick_bus, start_tick_bus, close_tick_bus
+from core.tick_writer import get_tick_writer, close_tick_writer
+from integration.matriks_bridge.wire_protocol import (
+    MAGIC, VERSION as WIRE_VERSION, ProtocolError, BinaryFrameDecoder, LineFramer,
+    build_ack, could_be_binary, parse_hello
+)
 
 HOST = '127.0.0.1'
 PORT = 5555
 
+# Per-tick console echo. Disable with --quiet when running load tests.
+VERBOSE = True
+
+# Bars for ohlcv_bars are built by the tick bus when it runs, otherwise here
+_bar_builder = None
+_bar_lock = threading.Lock()
+
+def parse_timestamp(data_dict):
+    # Parse timestamp from ISO format or use current time if missing
+    ts_str = data_dict.get('timestamp')
+    if isinstance(ts_str, datetime):
+        # Binary frames already carry a decoded timestamp
+        ts = ts_str
+    elif ts_str:
+        try:
+            # Handle ISO format variations if necessary
+            ts = datetime.fromisoformat(ts_str)
+        except ValueError:
+            ts = datetime.utcnow()
+    else:
+        ts = datetime.utcnow()
+    return ts
+
+def build_tick_row(data_dict):
+    """
+    Converts a parsed message into a tick_data row dict.
+    """
+    return {
+        'symbol': data_dict.get('symbol'),
+        'price': float(data_dict.get('price', 0.0)),
+        'volume': float(data_dict.get('volume', 0.0)),
+        'timestamp': parse_timestamp(data_dict),
+        'source': data_dict.get('source') or '',
+        'received_at': datetime.utcnow()
+    }
+
+def build_book_row(data_dict):
+    """
+    Converts a depth message (bids/asks + imbalance from parse_message) into
+    an order_book_snapshots row dict with the top BOOK_DEPTH levels packed.
+    """
+    bids = data_dict['bids'][:BOOK_DEPTH]
+    asks = data_dict['asks'][:BOOK_DEPTH]
+    return {
+        'symbol': data_dict.get('symbol'),
+        'timestamp': parse_timestamp(data_dict),
+        'depth': max(len(bids), len(asks)),
+        'bids': pack_levels(bids),
+        'asks': pack_levels(asks),
+        'imbalance': data_dict.get('imbalance'),
+        'weighted_imbalance': data_dict.get('weighted_imbalance'),
+        'received_at': datetime.utcnow()
+    }
+
 def save_to_db(data_dict):
     """
     Saves the parsed market data to the database.
+
+    The row is handed to the write-behind queue (core.tick_writer) which
+    commits ticks in batches; call close_tick_writer() on shutdown to flush.
+    Depth messages also queue an order book snapshot on the same writer, so
+    they share its batches instead of committing on their own.
+
+    When the tick bus is running (core.tick_bus), the same data is pushed to
+    live subscribers right after it is queued. Every bar the tick closes is
+    queued for ohlcv_bars (core.bar_store) as well, and appended to the
+    shared-memory bar rings (core.bar_ring) when they are enabled.
     """
     try:
-        session = SessionLocal()
-        
-        # Parse timestamp from ISO format or use current time if missing
-        ts_str = data_dict.get('timestamp')
-        if ts_str:
-            try:
-                # Handle ISO format variations if necessary
-                ts = datetime.fromisoformat(ts_str)
-            except ValueError:
-                ts = datetime.utcnow()
-        else:
-            ts = datetime.utcnow()
-
-        tick = TickData(
-            symbol=data_dict.get('symbol'),
-            price=float(data_dict.get('price', 0.0)),
-            volume=float(data_dict.get('volume', 0.0)),
-            timestamp=ts,
-            received_at=datetime.utcnow()
-        )
-        
-        session.add(tick)
-        session.commit()
-        session.close()
+        writer = get_tick_writer()
+        bus = get_tick_bus()
+        is_depth = 'bids' in data_dict and 'asks' in data_dict
+        if is_depth:
+            book = build_book_row(data_dict)
+            writer.submit(book, table=OrderBookSnapshot.__table__)
+            if bus is not None:
+                bus.publish('book', book['symbol'], {
+                    'timestamp': book['timestamp'],
+                    'imbalance': book['imbalance'],
+                    'weighted_imbalance': book['weighted_imbalance'],
+                    'bids': data_dict['bids'][:BOOK_DEPTH],
+                    'asks': data_dict['asks'][:BOOK_DEPTH],
+                })
+        # Pure depth updates carry no trade; don't record them as price=0 ticks
+        if not is_depth or 'price' in data_dict:
+            row = build_tick_row(data_dict)
+            writer.submit(row)
+            rings = get_bar_rings()
+            for bar in update_bars(bus, row):
+                writer.submit(bar, table=OHLCVBar.__table__)
+                if rings is not None:
+                    rings.append(bar)
     except Exception as e:
         print(f"[!] Database Error: {e}")
-        # Make sure session is closed on error if created
-        if 'session' in locals():
-            session.close()
 
-def start_server():
+def update_bars(bus, row):
+    """Feeds a tick to the bar builder (the bus's own when it runs) and returns the bars it closed."""
+    if bus is not None:
+        return bus.publish_tick(row['symbol'], row['price'], row['volume'], row['timestamp'])
+    global _bar_builder
+    with _bar_lock:
+        if _bar_builder is None:
+            _bar_builder = BarBuilder()
+        return _bar_builder.update(row['symbol'], row['price'], row['volume'], row['timestamp'])
+
+def flush_open_bars():
+    """
+    Queues the unfinished bars on shutdown. If the server restarts within the
+    same bucket, the rest of the bar is merged into the stored part.
+    """
+    bus = get_tick_bus()
+    if bus is not None:
+        bars = bus.open_bars()
+    else:
+        with _bar_lock:
+            bars = _bar_builder.open_bars() if _bar_builder is not None else []
+    if bars:
+        writer = get_tick_writer()
+        for bar in bars:
+            writer.submit(bar, table=OHLCVBar.__table__)
+
+def start_server(host=HOST, port=PORT):
     try:
         server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        server_socket.bind((HOST, PORT))
+        server_socket.bind((host, port))
         server_socket.listen(5)
-        print(f"[*] Server listening on {HOST}:{PORT}")
+        print(f"[*] Server listening on {host}:{port}")
     except Exception as e:
         print(f"[!] Failed to bind server: {e}")
         return
@@ -78,27 +175,37 @@ def start_server():
             print(f"[!] Error accepting connection: {e}")
 
     server_socket.close()
+    # Commit whatever is still waiting in the write-behind queue
+    flush_open_bars()
+    close_tick_writer()
 
 def handle_client(client_socket):
-    buffer = ""
+    framer = LineFramer()
     try:
-        while True:
+        # Binary clients open with wire_protocol.MAGIC, JSON clients with '{'
+        pending = b""
+        while len(pending) < len(MAGIC) and could_be_binary(pending):
             data = client_socket.recv(4096)
             if not data:
                 break
-            
-            try:
-                decoded_data = data.decode('utf-8')
-                buffer += decoded_data
-                
-                while "\n" in buffer:
-                    message, buffer = buffer.split("\n", 1)
-                    if message.strip():
-                        process_message(message)
-            except UnicodeDecodeError:
-                print("[!] Decoding error, skipping chunk")
-                continue
-                
+            pending += data
+
+        if len(pending) >= len(MAGIC) and could_be_binary(pending):
+            handle_binary_client(client_socket, pending)
+            return
+
+        # Complete records are sliced out of one reusable receive buffer;
+        # nothing is decoded until a full line is available.
+        messages = framer.feed(pending)
+        while True:
+            for message in messages:
+                if message.strip():
+                    process_message(message)
+
+            n, messages = framer.recv_from(client_socket)
+            if n == 0:
+                break
+
     except ConnectionResetError:
         print("[-] Connection reset by client")
     except Exception as e:
@@ -107,32 +214,145 @@ def handle_client(client_socket):
         client_socket.close()
         print("[-] Connection closed")
 
-def process_message(message_str):
+def handle_binary_client(client_socket, initial):
+    """
+    Serves a client that negotiated the length-prefixed binary protocol.
+    """
+    buf = bytearray(initial)
+    hello = parse_hello(buf)
+    while hello is None:
+        data = client_socket.recv(4096)
+        if not data:
+            return
+        buf += data
+        hello = parse_hello(buf)
+
+    version, source, used = hello
+    if version != WIRE_VERSION:
+        print(f"[!] Unsupported binary protocol version {version}")
+        client_socket.sendall(build_ack(status=1))
+        return
+    client_socket.sendall(build_ack())
+    print(f"[+] Binary protocol v{version} negotiated (source: {source or '-'})")
+
+    decoder = BinaryFrameDecoder(source)
+    data = bytes(buf[used:])
+    while True:
+        try:
+            for arr in decoder.feed(data):
+                process_tick_array(decoder, arr)
+        except ProtocolError as e:
+            print(f"[!] Binary protocol error, dropping client: {e}")
+            return
+
+        data = client_socket.recv(65536)
+        if not data:
+            break
+
+def process_tick_array(decoder, arr):
+    """Saves every tick of one decoded binary frame."""
+    messages = decoder.to_messages(arr)
+    if VERBOSE:
+        print(f"CANLI VERI ALINDI: {len(messages)} tick (binary)")
+    for data in messages:
+        save_to_db(data)
+
+def parse_message(message_str):
+    """
+    Decodes one JSON message and enriches it with derived fields.
+
+    Shared by the threaded and the asyncio servers so both apply the same
+    validation and order book analysis before anything is written.
+
+    Args:
+        message_str (str | bytes | bytearray): A single newline-stripped JSON record.
+
+    Returns:
+        dict | None: The decoded message, or None if it could not be parsed.
+    """
     try:
         data = json.loads(message_str)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        print(f"[!] Invalid JSON received: {message_str}")
+        return None
+    if not isinstance(data, dict):
+        print(f"[!] Message is not a JSON object: {message_str}")
+        return None
+
+    if VERBOSE:
         print(f"CANLI VERI ALINDI: {data}")
-        
-        # --- NEW: Order Book Analysis ---
-        # Check if this message contains specific Depth Data (Matriks sends this differently usually)
-        if 'bids' in data and 'asks' in data:
-            try:
-                from core.orderflow import calculate_imbalance
-                imbalance = calculate_imbalance(data['bids'], data['asks'])
-                # Add to data dict to save to DB (needs DB schema update later) or just log for now
-                data['imbalance'] = imbalance
+
+    # --- NEW: Order Book Analysis ---
+    # Check if this message contains specific Depth Data (Matriks sends this differently usually)
+    if 'bids' in data and 'asks' in data:
+        try:
+            imbalance = calculate_imbalance(data['bids'], data['asks'])
+            # Stored with the snapshot in order_book_snapshots (see save_to_db)
+            data['imbalance'] = imbalance
+            data['weighted_imbalance'] = calculate_weighted_imbalance(data['bids'], data['asks'])
+            if VERBOSE:
                 print(f"[*] Order Book Imbalance: {imbalance:.2f}")
-            except ImportError:
-                pass # core.orderflow might not be ready in some envs
-        # --------------------------------
-        
-        # Save to DB - simplistic 'fire and forget' in main thread for now (or separate thread if blocking is an issue)
-        # For high frequency, a queue + worker thread is better, but per instructions we keep it simple.
+        except (TypeError, ValueError, IndexError) as e:
+            print(f"[!] Invalid order book in message: {e}")
+            del data['bids'], data['asks']
+            # A pure depth update has nothing else to store (no price=0 tick)
+            if 'price' not in data:
+                return None
+    # --------------------------------
+
+    return data
+
+def process_message(message_str):
+    try:
+        data = parse_message(message_str)
+        if data is None:
+            return
+
+        # Queue for the batched writer; the commit happens on the writer thread
         save_to_db(data)
-        
-    except json.JSONDecodeError:
-        print(f"[!] Invalid JSON received: {message_str}")
+
     except Exception as e:
         print(f"[!] Error processing message: {e}")
 
+def _raise_keyboard_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+def main():
+    parser = argparse.ArgumentParser(description="BIST tick ingestion server")
+    parser.add_argument('--mode', choices=['threaded', 'async'], default='threaded',
+                        help="threaded: one OS thread per client (legacy). async: single event loop + writer stage.")
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--quiet', action='store_true', help="Do not echo every tick to the console.")
+    parser.add_argument('--no-bus', action='store_true',
+                        help="Do not publish ticks/bars on the local tick bus (core/tick_bus.py).")
+    parser.add_argument('--no-rings', action='store_true',
+                        help="Do not write closed bars to the shared-memory bar rings (core/bar_ring.py).")
+    args = parser.parse_args()
+
+    global VERBOSE
+    VERBOSE = not args.quiet
+
+    # Treat SIGTERM like Ctrl+C so pending ticks are flushed on shutdown
+    signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+
+    if not args.no_bus:
+        bus = start_tick_bus()
+        if bus is not None:
+            print(f"[*] Tick bus publishing on {bus.address}")
+    if not args.no_rings:
+        rings = start_bar_rings()
+        print(f"[*] Bar rings in {rings.directory}")
+
+    try:
+        if args.mode == 'async':
+            from integration.matriks_bridge.async_server import run_async_server
+            run_async_server(args.host, args.port, verbose=VERBOSE)
+        else:
+            start_server(args.host, args.port)
+    finally:
+        close_tick_bus()
+        close_bar_rings()
+
 if __name__ == "__main__":
-    start_server()
+    main()
@@ -0,0 +1,417 @@
+"""
+Deterministic historical replay into the ingestion pipeline.
+
+Reads stored ticks from the tick store (or an archive file) for a date range and
+symbol set and streams them, in (timestamp, id) order, either into a running
+socket_server (JSON lines or the binary protocol) or straight onto a tick bus
+that run_bot / dashboard / predict subscribe to. Inter-tick gaps are kept and
+divided by the speed multiple; --speed max sends as fast as the sink accepts.
+
+--find-max-speed replays successive slices at increasing speeds and reports
+the highest one at which downstream keeps up:
+    bus target:    no subscriber backlog builds up and nothing is dropped
+    socket target: ticks come back out of the server's tick bus within --lag-limit
+
+Usage:
+    python integration/replay.py --start 2025-01-02 --end 2025-01-03 --symbols THYAO GARAN --speed 10
+    python integration/replay.py --start 2025-01-02 --end 2025-01-03 --target bus --find-max-speed
+    python integration/replay.py --archive ticks.parquet --spawn async --speed max
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Resolve project root absolute path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from core.tick_bus import TickBus, connect_tick_bus
+from integration.matriks_bridge.wire_protocol import negotiate_binary, to_epoch_ns
+
+HOST = '127.0.0.1'
+PORT = 5555
+
+SEND_CHUNK = 5000          # Max ticks handed to the sink per call
+MAX_IDLE_SLEEP = 0.05      # Upper bound on one pacing sleep (seconds)
+SPEED_LADDER = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+def load_ticks(start=None, end=None, symbols=None, archive=None, engine=None):
+    """
+    Loads ticks for [start, end) in deterministic replay order.
+
+    Args:
+        start, end (datetime | str | None): Time range (end exclusive).
+        symbols (list | None): Restrict to these symbols.
+        archive (str | None): CSV or Parquet file with symbol/price/volume/timestamp
+            columns, used instead of the tick store.
+        engine: SQLAlchemy engine (defaults to the 'analytics' role engine).
+
+    Returns:
+        pd.DataFrame: symbol, price, volume, timestamp (sorted, fresh RangeIndex).
+    """
+    start = pd.Timestamp(start) if start is not None else None
+    end = pd.Timestamp(end) if end is not None else None
+
+    if archive:
+        if archive.endswith('.parquet'):
+            df = pd.read_parquet(archive, columns=['symbol', 'price', 'volume', 'timestamp'])
+        else:
+            df = pd.read_csv(archive, usecols=['symbol', 'price', 'volume', 'timestamp'])
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        if start is not None:
+            df = df[df['timestamp'] >= start]
+        if end is not None:
+            df = df[df['timestamp'] < end]
+        if symbols:
+            df = df[df['symbol'].isin(symbols)]
+        # Stable sort keeps the file order for equal timestamps
+        df = df.sort_values('timestamp', kind='stable')
+    else:
+        from core.tick_store import TickStore, get_tick_store
+        store = TickStore(engine=engine) if engine is not None else get_tick_store('analytics')
+        df = store.query(list(symbols) if symbols else None, start, end)
+        df = df[['symbol', 'price', 'volume', 'timestamp']]
+
+    df['volume'] = df['volume'].fillna(0.0)
+    return df.reset_index(drop=True)
+
+class ListSink:
+    """Collects replayed ticks in memory (tests, dry runs)."""
+
+    def __init__(self):
+        self.ticks = []
+
+    def send(self, ticks):
+        self.ticks.extend(ticks)
+
+    def close(self):
+        pass
+
+class SocketSink:
+    """Feeds a running socket_server like any other feeder."""
+
+    def __init__(self, host=HOST, port=PORT, binary=False):
+        self.sock = socket.create_connection((host, port))
+        self.encoder = negotiate_binary(self.sock, source="Replay") if binary else None
+
+    def send(self, ticks):
+        if self.encoder:
+            payload = self.encoder.encode(ticks)
+        else:
+            payload = "".join(
+                json.dumps({"symbol": s, "price": p, "volume": v, "timestamp": ts.isoformat(),
+                            "source": "Replay"}) + "\n"
+                for s, p, v, ts in ticks
+            ).encode('utf-8')
+        self.sock.sendall(payload)
+
+    def close(self):
+        self.sock.close()
+
+class BusSink:
+    """Publishes ticks (and the bars they close) on a tick bus owned by the replay."""
+
+    def __init__(self, bus):
+        self.bus = bus
+
+    def send(self, ticks):
+        for s, p, v, ts in ticks:
+            self.bus.publish_tick(s, p, v, ts)
+
+    def close(self):
+        pass
+
+class TickReplayer:
+    """
+    Paces a tick frame into a sink.
+
+    Tick i is due at t0 + (ts[i] - ts[first]) / speed on the wall clock.
+    Everything already due is sent in one call, so pacing overhead does not
+    grow with the tick rate; `max_lag_s` records how late (vs. schedule) the
+    slowest tick was handed over to the sink.
+    """
+
+    def __init__(self, ticks, sink):
+        self.sink = sink
+        self.symbols = ticks['symbol'].to_numpy(dtype=object)
+        self.prices = ticks['price'].to_numpy(dtype=np.float64)
+        self.volumes = ticks['volume'].to_numpy(dtype=np.float64)
+        self.ts_ns = ticks['timestamp'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+        self.timestamps = list(ticks['timestamp'].dt.to_pydatetime())
+        # Schedule of the replay in progress (read by lag probes)
+        self.t0 = None
+        self.ts0_ns = None
+        self.speed = None
+
+    def __len__(self):
+        return len(self.ts_ns)
+
+    def due_at(self, ts_ns):
+        """Wall-clock (perf_counter) time at which a tick with this timestamp is due."""
+        if self.speed is None:
+            return self.t0
+        return self.t0 + (ts_ns - self.ts0_ns) / 1e9 / self.speed
+
+    def run(self, speed=1.0, start=0, stop=None, max_wall=None):
+        """
+        Replays ticks[start:stop].
+
+        Args:
+            speed (float | None): Speed multiple; None = as fast as possible.
+            max_wall (float | None): Stop after this many wall-clock seconds.
+
+        Returns:
+            dict: sent, next index, wall seconds, achieved speed, max sender lag.
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        if start >= stop:
+            return {'sent': 0, 'next': start, 'wall_s': 0.0, 'speed': 0.0, 'max_lag_s': 0.0}
+
+        ts = self.ts_ns
+        self.ts0_ns = int(ts[start])
+        self.speed = speed
+        self.t0 = time.perf_counter()
+        i = start
+        max_lag = 0.0
+        while i < stop:
+            now = time.perf_counter()
+            elapsed = now - self.t0
+            if max_wall is not None and elapsed >= max_wall:
+                break
+            if speed is None:
+                j = min(i + SEND_CHUNK, stop)
+            else:
+                horizon = self.ts0_ns + int(elapsed * speed * 1e9)
+                j = min(int(np.searchsorted(ts, horizon, side='right')), stop, i + SEND_CHUNK)
+                if j == i:
+                    wait = (ts[i] - self.ts0_ns) / 1e9 / speed - elapsed
+                    time.sleep(min(max(wait, 0.0), MAX_IDLE_SLEEP))
+                    continue
+
+            self.sink.send(list(zip(self.symbols[i:j].tolist(), self.prices[i:j].tolist(),
+                                    self.volumes[i:j].tolist(), self.timestamps[i:j])))
+            if speed is not None:
+                # The oldest tick of the batch is the latest one to reach the sink
+                lag = time.perf_counter() - self.due_at(ts[i])
+                if lag > max_lag:
+                    max_lag = lag
+            i = j
+
+        wall = time.perf_counter() - self.t0
+        span = (ts[i - 1] - ts[start]) / 1e9 if i > start else 0.0
+        return {
+            'sent': i - start,
+            'next': i,
+            'wall_s': wall,
+            'speed': span / wall if wall > 0 else float('inf'),
+            'max_lag_s': max_lag,
+        }
+
+class LagProbe(threading.Thread):
+    """
+    Socket target: watches the server's tick bus and measures how late each
+    replayed tick comes out relative to its replay schedule.
+    """
+
+    def __init__(self, replayer, symbols=None):
+        super().__init__(daemon=True)
+        self.replayer = replayer
+        self.sub = connect_tick_bus(['tick'], symbols)
+        self.lags = []
+        self._stop_event = threading.Event()
+
+    def run(self):
+        if self.sub is None:
+            return
+        try:
+            while not self._stop_event.is_set():
+                for msg in self.sub.recv(timeout=0.2):
+                    r = self.replayer
+                    ts_ns = to_epoch_ns(msg['timestamp'])
+                    if r.t0 is None or ts_ns < r.ts0_ns:
+                        continue  # Left over from the previous trial
+                    self.lags.append(time.perf_counter() - r.due_at(ts_ns))
+        except (ConnectionError, OSError):
+            pass
+
+    def take(self):
+        lags, self.lags = self.lags, []
+        return lags
+
+    def stop(self):
+        self._stop_event.set()
+        self.join(2)
+        if self.sub is not None:
+            self.sub.close()
+
+class BacklogMonitor(threading.Thread):
+    """Bus target: samples the replay bus' subscriber backlog."""
+
+    def __init__(self, bus, interval=0.01):
+        super().__init__(daemon=True)
+        self.bus = bus
+        self.interval = interval
+        self.max_backlog = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.max_backlog = max(self.max_backlog, self.bus.stats()['backlog'])
+
+    def take(self):
+        value, self.max_backlog = self.max_backlog, 0
+        return value
+
+    def stop(self):
+        self._stop_event.set()
+        self.join(2)
+
+def find_max_speed(replayer, trial_seconds=5.0, settle_seconds=1.0, lag_limit=1.0,
+                   backlog_limit=1000, bus=None, probe=None, speeds=SPEED_LADDER):
+    """
+    Replays consecutive slices at increasing speeds until downstream falls behind.
+
+    Returns:
+        tuple: (highest sustainable speed or None, list of per-trial result dicts)
+    """
+    monitor = BacklogMonitor(bus) if bus is not None else None
+    if monitor:
+        monitor.start()
+    results = []
+    best = None
+    pos = 0
+    try:
+        for speed in speeds:
+            if pos >= len(replayer):
+                print("[*] Out of data; rerun with a wider date range to try higher speeds.")
+                break
+            dropped_before = bus.stats()['dropped'] if bus else 0
+            if monitor:
+                monitor.take()
+            if probe:
+                probe.take()
+
+            res = replayer.run(speed, start=pos, max_wall=trial_seconds)
+            pos = res['next']
+            time.sleep(settle_seconds)
+
+            res['target'] = speed
+            res['sender_ok'] = res['max_lag_s'] <= lag_limit
+            ok = res['sender_ok']
+            if bus is not None:
+                res['max_backlog'] = monitor.take()
+                res['dropped'] = bus.stats()['dropped'] - dropped_before
+                ok = ok and res['dropped'] == 0 and res['max_backlog'] <= backlog_limit
+            if probe is not None:
+                lags = probe.take()
+                res['samples'] = len(lags)
+                res['p99_lag_s'] = float(np.percentile(lags, 99)) if lags else None
+                ok = ok and bool(lags) and res['p99_lag_s'] <= lag_limit
+            res['ok'] = ok
+            results.append(res)
+            print_trial(res)
+            if not ok:
+                break
+            best = speed
+    finally:
+        if monitor:
+            monitor.stop()
+    return best, results
+
+def print_trial(res):
+    line = (f"  x{res['target']:<6g} sent {res['sent']:>9,} in {res['wall_s']:6.2f}s "
+            f"(achieved x{res['speed']:.1f}, sender lag {res['max_lag_s'] * 1000:.1f} ms)")
+    if 'max_backlog' in res:
+        line += f" | backlog {res['max_backlog']:,} dropped {res['dropped']:,}"
+    if 'p99_lag_s' in res:
+        p99 = f"{res['p99_lag_s'] * 1000:.1f} ms" if res['p99_lag_s'] is not None else "n/a"
+        line += f" | p99 ingest lag {p99}"
+    print(line + ("" if res['ok'] else "  <- falling behind"))
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay stored ticks into socket_server or the tick bus")
+    parser.add_argument('--start', help="Range start (inclusive), e.g. 2025-01-02 or 2025-01-02T10:00")
+    parser.add_argument('--end', help="Range end (exclusive)")
+    parser.add_argument('--symbols', nargs='+', help="Symbols to replay (default: all)")
+    parser.add_argument('--archive', help="CSV/Parquet tick archive instead of tick_data")
+    parser.add_argument('--speed', default='1', help="Speed multiple (1, 10, ...) or 'max'")
+    parser.add_argument('--target', choices=['socket', 'bus'], default='socket')
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--binary', action='store_true', help="Socket target: use the binary protocol")
+    parser.add_argument('--spawn', choices=['threaded', 'async'],
+                        help="Socket target: start socket_server.py on a scratch database first")
+    parser.add_argument('--find-max-speed', action='store_true',
+                        help="Step through increasing speeds and report the fastest one downstream sustains")
+    parser.add_argument('--trial-seconds', type=float, default=5.0)
+    parser.add_argument('--lag-limit', type=float, default=1.0, help="Seconds behind schedule that count as falling behind")
+    parser.add_argument('--backlog-limit', type=int, default=1000, help="Bus target: queued messages per trial")
+    args = parser.parse_args()
+
+    ticks = load_ticks(args.start, args.end, args.symbols, args.archive)
+    if ticks.empty:
+        print("[!] No ticks in the selected range.")
+        return
+    span = (ticks['timestamp'].iloc[-1] - ticks['timestamp'].iloc[0]).total_seconds()
+    print(f"[*] {len(ticks):,} ticks, {ticks['symbol'].nunique()} symbols, "
+          f"{ticks['timestamp'].iloc[0]} -> {ticks['timestamp'].iloc[-1]} ({span:,.0f}s of market time)")
+
+    proc = None
+    bus = None
+    probe = None
+    if args.target == 'bus':
+        bus = TickBus().start()
+        print(f"[*] Publishing on tick bus {bus.address}; start consumers now.")
+        sink = BusSink(bus)
+    else:
+        if args.spawn:
+            from integration.matriks_bridge.mock_data_feeder import spawn_server, stop_server
+            proc, db_path, bus_address = spawn_server(args.spawn, args.port)
+            os.environ['BIST_BUS_ADDRESS'] = bus_address
+            print(f"[*] Spawned {args.spawn} server writing to {db_path}")
+        sink = SocketSink(args.host, args.port, binary=args.binary)
+
+    replayer = TickReplayer(ticks, sink)
+    try:
+        if args.find_max_speed:
+            if args.target == 'socket':
+                probe = LagProbe(replayer)
+                if probe.sub is None:
+                    print("[!] Server tick bus not reachable; only the sender's own lag is checked.")
+                    probe = None
+                else:
+                    probe.start()
+            print(f"[*] Finding max sustainable speed ({args.trial_seconds:g}s trials, lag limit {args.lag_limit:g}s)")
+            best, _ = find_max_speed(replayer, args.trial_seconds, lag_limit=args.lag_limit,
+                                     backlog_limit=args.backlog_limit, bus=bus, probe=probe)
+            print("-" * 72)
+            print(f"Max sustainable replay speed: x{best:g}" if best else "Downstream fell behind even at x1")
+            print("-" * 72)
+        else:
+            speed = None if args.speed == 'max' else float(args.speed)
+            res = replayer.run(speed)
+            print(f"[*] Replayed {res['sent']:,} ticks in {res['wall_s']:.2f}s "
+                  f"(x{res['speed']:.1f} market time, max sender lag {res['max_lag_s'] * 1000:.1f} ms)")
+    except KeyboardInterrupt:
+        print("\n[*] Replay interrupted.")
+    finally:
+        if probe:
+            probe.stop()
+        sink.close()
+        if bus:
+            bus.close()
+        if proc is not None:
+            stop_server(proc)
+
+if __name__ == "__main__":
+    main()
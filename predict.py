@@ -1,12 +1,16 @@
 import torch
 import sys
 import os
+import argparse
 import pandas as pd
 import numpy as np
 
 sys.path.append(os.getcwd())
+# Analysis process: read-only database access, no schema setup at startup
+os.environ.setdefault('BIST_DB_READ_ONLY', '1')
 
-from core.feature_engine import fetch_and_process_data
+from core.feature_engine import fetch_and_process_data, fetch_ohlcv, add_indicators
+from core.tick_bus import BarCache
 from models.lstm_price.definitions import BISTLSTM
 
 # Configuration
@@ -14,7 +18,7 @@ SYMBOL = "THYAO"
 SEQUENCE_LENGTH = 60
 MODEL_PATH = "models/checkpoints/lstm_model.pth"
 
-def predict_next_move():
+def predict_next_move(follow=False):
     print("--- AI Prediction Engine ---")
     
     # 1. Load Model
@@ -39,9 +43,27 @@ def predict_next_move():
 
     # 2. Fetch Latest Data
     print(f"Fetching latest data for {SYMBOL}...")
-    # Increase limit to ensure we have enough data for 200-period EMA + Sequence Length
-    df = fetch_and_process_data(SYMBOL, timeframe='1s', limit=2000)
-    
+    # Exactly the bars the indicators' warm-up (EMA 200) needs for one sequence
+    df = fetch_and_process_data(SYMBOL, timeframe='1s', rows=SEQUENCE_LENGTH)
+
+    if not follow:
+        predict_from_frame(model, device, df)
+        return
+
+    # 2b. Follow mode: re-predict on every 1s bar pushed by the ingestion server
+    bar_cache = BarCache('1s', [SYMBOL], maxlen=2000).start()
+    bar_cache.seed(SYMBOL, fetch_ohlcv(SYMBOL, timeframe='1s', limit=2000))
+    print("[*] Waiting for live bars on the tick bus (Ctrl+C to stop)...")
+    try:
+        while True:
+            if bar_cache.wait(timeout=5.0):
+                predict_from_frame(model, device, add_indicators(bar_cache.frame(SYMBOL)))
+            elif not bar_cache.connected:
+                print("[!] Tick bus not reachable. Is socket_server.py running?")
+    except KeyboardInterrupt:
+        bar_cache.stop()
+
+def predict_from_frame(model, device, df):
     if len(df) < SEQUENCE_LENGTH:
         print(f"[!] Not enough recent data ({len(df)} rows). Need last {SEQUENCE_LENGTH} bars.")
         return
@@ -78,4 +100,8 @@ def predict_next_move():
     print("-" * 30)
 
 if __name__ == "__main__":
-    predict_next_move()
+    parser = argparse.ArgumentParser(description="LSTM next-move prediction")
+    parser.add_argument('--follow', action='store_true',
+                        help="Keep running and predict on every new bar from the tick bus.")
+    args = parser.parse_args()
+    predict_next_move(follow=args.follow)
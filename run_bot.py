@@ -7,7 +7,10 @@ from datetime import datetime
 
 sys.path.append(os.getcwd())
 
-from core.feature_engine import fetch_and_process_data
+from core.feature_engine import fetch_many
+from core.tick_bus import BarCache
+from core.streaming_indicators import IndicatorStreams
+from core.panel_features import BarPanel, feature_frames
 from models.lstm_price.definitions import BISTLSTM
 from core.trader import PaperTrader
 from core.news_agent import NewsAgent
@@ -25,6 +28,39 @@ CONFIDENCE_SELL = 0.40
 # Optimization Settings
 SLEEP_BETWEEN_CYCLES = 60    # 1 Minute (Matches bar close)
 NEWS_UPDATE_INTERVAL = 15    # Update news every 15 cycles (15 mins)
+BAR_TIMEFRAME = '1s'
+HISTORY_BARS = 2000          # Live bars kept per symbol
+
+# Running indicator state per symbol, advanced by each closed bar from the bus
+indicator_streams = IndicatorStreams(maxlen=SEQUENCE_LENGTH)
+
+def get_features_many(symbols, bar_cache):
+    """
+    Indicator frames for all symbols ({symbol: frame}). Uses bars pushed by
+    the ingestion server's tick bus when it is reachable (the DB is read once,
+    in one fetch_many call, to warm up every unseeded symbol) and only feeds
+    the new closed bars to indicator_streams; otherwise re-reads the whole
+    list with fetch_many each cycle (the newest resampled bar may still be
+    forming there, so the indicators are recomputed, for all symbols at once).
+    """
+    if not bar_cache.connected:
+        # All symbols' indicators in one panel pass instead of add_indicators per symbol
+        return feature_frames(BarPanel.from_frames(fetch_many(symbols, timeframe=BAR_TIMEFRAME, rows=SEQUENCE_LENGTH)))
+
+    unseeded = [s for s in symbols if not bar_cache.is_seeded(s)]
+    if unseeded:
+        history = fetch_many(unseeded, timeframe=BAR_TIMEFRAME, rows=SEQUENCE_LENGTH)
+        for symbol in unseeded:
+            if symbol in history:
+                bar_cache.seed(symbol, history[symbol])
+    features = {}
+    for symbol in symbols:
+        stream = indicator_streams.get(symbol, BAR_TIMEFRAME)
+        stream.update_frame(bar_cache.frame(symbol, since=stream.last_timestamp))
+        df = stream.frame(tail=SEQUENCE_LENGTH)
+        if not df.empty:
+            features[symbol] = df
+    return features
 
 def load_ai_model():
     if not os.path.exists(MODEL_PATH):
@@ -54,6 +90,9 @@ def run_bot():
     
     # Initialize News Agent
     news_agent = NewsAgent()
+
+    # Live bars from the ingestion server (falls back to DB polling if it is not running)
+    bar_cache = BarCache(BAR_TIMEFRAME, SYMBOLS, maxlen=HISTORY_BARS).start()
     
     if not model:
         return
@@ -75,11 +114,12 @@ def run_bot():
              print(">> [INFO] Haberler ve Duygu Analizleri Güncelleniyor...")
 
         try:
+            # --- MARKET DATA & TECHNICAL --- (one batched read for the whole list)
+            features = get_features_many(SYMBOLS, bar_cache)
             for symbol in SYMBOLS:
-                # --- MARKET DATA & TECHNICAL ---
-                df = fetch_and_process_data(symbol, timeframe='1s', limit=2000)
+                df = features.get(symbol)
                 
-                if len(df) < SEQUENCE_LENGTH:
+                if df is None or len(df) < SEQUENCE_LENGTH:
                     continue
                     
                 last_price = df['close'].iloc[-1]
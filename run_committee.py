@@ -12,6 +12,7 @@ from agents.technical_agent import technical_analyst_node
 from agents.fundamental_agent import fundamental_analyst_node
 from agents.risk_agent import risk_manager_node
 from agents.head_trader import head_trader_node
+from core.macro_service import get_macro_service
 
 def run_committee_simulation(symbol="THYAO"):
     print(f"\n🏛️ YATIRIM KOMİTESİ TOPLANIYOR (LangGraph Simulation) - {symbol}...")
@@ -42,7 +43,7 @@ def run_committee_simulation(symbol="THYAO"):
     initial_state = {
         "symbol": symbol,
         "market_data": {}, # Mocked inside agents
-        "macro_data": {"inflation_cpi": 65},
+        "macro_data": {"inflation_cpi": 65, **get_macro_service().latest()},  # Stored EVDS/TEFAS values override the default
         "news_sentiment": 0.85, # Strong Positive News
         "votes": {},
         "reasoning": {}
@@ -0,0 +1,39 @@
+"""
+Builds ohlcv_bars from the tick history stored before bars were recorded.
+
+The ingestion server keeps the table current from then on. By default only
+days before today are rebuilt, so the bars the running server is building
+are left alone.
+
+Usage:
+    python scripts/backfill_bars.py
+    python scripts/backfill_bars.py --start 2025-01-01 --symbols THYAO GARAN --timeframes 1min 5min
+"""
+import argparse
+import os
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from core.bar_builder import BAR_TIMEFRAMES
+from core.bar_store import backfill_bars
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild stored OHLCV bars from ticks")
+    parser.add_argument('--start', help="First timestamp to rebuild (inclusive)")
+    parser.add_argument('--end', help="Last timestamp to rebuild (exclusive, default: today 00:00)")
+    parser.add_argument('--symbols', nargs='+', help="Default: all symbols in core/config_symbols.py")
+    parser.add_argument('--timeframes', nargs='+', default=list(BAR_TIMEFRAMES), choices=list(BAR_TIMEFRAMES))
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    written = backfill_bars(args.timeframes, args.start, args.end, args.symbols)
+    for timeframe, n in written.items():
+        print(f"[+] {timeframe}: {n:,} bars")
+    print(f"[*] Done in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Multi-symbol OHLCV read benchmark: the per-symbol loop the bot and dashboard
+used (one tick query + one resample per symbol) against the batched path
+behind feature_engine.fetch_many (TickStore.latest_many + one grouped
+resample_ticks_many pass), and the same for stored bars (fetch_bars vs
+fetch_bars_many).
+
+Runs against a scratch database so it measures the read path only; the
+indicator step is identical on both sides and left out (it also needs
+pandas_ta).
+
+Usage:
+    python scripts/benchmark_fetch.py --symbols 40 400 --ticks 2000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+def build_db(path, n_symbols, n_ticks, seed=7):
+    """n_ticks ticks per symbol on one day, ~1 per second, plus their 1s/1min bars."""
+    from sqlalchemy import create_engine
+    from core.database import Base, TickData
+    from core.bar_store import backfill_bars
+    from core.tick_store import TickStore
+
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    rng = np.random.default_rng(seed)
+    start = datetime(2025, 1, 2, 10, 0, 0)
+    symbols = [f"S{i:04d}" for i in range(n_symbols)]
+    offsets = pd.to_timedelta(np.arange(n_ticks) * 997, unit='ms')
+    for sym in symbols:
+        prices = 100 + np.cumsum(rng.normal(0, 0.05, n_ticks))
+        rows = pd.DataFrame({'symbol': sym, 'price': prices.round(2), 'volume': rng.integers(1, 100, n_ticks).astype(float),
+                             'timestamp': (pd.Timestamp(start) + offsets).to_pydatetime(), 'source': 'bench'})
+        with engine.begin() as conn:
+            conn.execute(TickData.__table__.insert(), rows.to_dict('records'))
+    store = TickStore(engine=engine, archive_dir=None)
+    backfill_bars(timeframes=('1s', '1min'), end=pd.Timestamp(date(2025, 1, 3)), symbols=symbols, store=store, engine=engine)
+    return engine, store, symbols
+
+def timed(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-symbol vs batched OHLCV reads")
+    parser.add_argument('--symbols', type=int, nargs='+', default=[40, 400])
+    parser.add_argument('--ticks', type=int, default=2000, help="Ticks per symbol (also the lookback)")
+    parser.add_argument('--timeframe', default='1min')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    # core.database opens the default engine at import; keep it off the real database
+    os.environ.setdefault('BIST_DB_PATH', os.path.join(tempfile.mkdtemp(), 'market_data.db'))
+    from core.bar_builder import resample_ticks, resample_ticks_many, split_panel
+    from core.bar_store import fetch_bars, fetch_bars_many
+
+    for n in args.symbols:
+        engine, store, symbols = build_db(os.path.join(tempfile.mkdtemp(), 'bench.db'), n, args.ticks)
+        lookback = args.ticks
+
+        def loop_ticks():
+            return {s: resample_ticks(store.latest(s, limit=lookback)[['timestamp', 'price', 'volume']], args.timeframe)
+                    for s in symbols}
+
+        def many_ticks():
+            ticks = store.latest_many(symbols, limit=lookback)
+            bars = resample_ticks_many(ticks[['symbol', 'timestamp', 'price', 'volume']], args.timeframe)
+            return split_panel(bars)
+
+        def loop_bars():
+            return {s: fetch_bars(s, '1s', limit=lookback, engine=engine) for s in symbols}
+
+        def many_bars():
+            return fetch_bars_many(symbols, '1s', limit=lookback, engine=engine)
+
+        print(f"--- {n} symbols, {args.ticks} ticks each ---")
+        for label, loop, many in (("ticks -> bars", loop_ticks, many_ticks), ("stored 1s bars", loop_bars, many_bars)):
+            t_loop, a = timed(loop, args.repeat)
+            t_many, b = timed(many, args.repeat)
+            assert all(a[s].equals(b[s]) for s in symbols), "batched result differs"
+            print(f"{label:15s} loop {t_loop * 1000:8.1f} ms | many {t_many * 1000:8.1f} ms | x{t_loop / t_many:.1f}")
+        engine.dispose()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Indicator microbenchmark: per-call latency of the numba kernels
+(core/indicator_kernels.py) against pandas_ta on one close series.
+
+Without pandas_ta installed the pandas side runs the same pandas calls
+pandas_ta makes (see benchmark_panel_features.pandas_reference) minus its
+wrapper overhead, so the speed-up shown is a lower bound. Kernels are
+compiled (or loaded from numba's cache) before timing.
+
+Usage:
+    python scripts/benchmark_indicator_kernels.py --bars 2000 20000 200000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from core import indicator_kernels as kernels
+
+def pandas_calls():
+    """{indicator: f(close Series)} with pandas_ta, else its pandas code path."""
+    try:
+        import pandas_ta as ta
+        return {
+            'rsi_14': lambda c: ta.rsi(c, length=14),
+            'sma_50': lambda c: ta.sma(c, length=50),
+            'ema_200': lambda c: ta.ema(c, length=200),
+            'macd_12_26_9': lambda c: ta.macd(c, fast=12, slow=26, signal=9),
+            'bbands_20_2': lambda c: ta.bbands(c, length=20, std=2.0),
+        }, "pandas_ta"
+    except ImportError:
+        pass
+
+    def ema(c, n):
+        c = c.copy()
+        seed = c.iloc[:n].mean()
+        c.iloc[:n - 1] = np.nan
+        c.iloc[n - 1] = seed
+        return c.ewm(span=n, adjust=False).mean()
+
+    def rsi(c, n=14):
+        change = c.diff()
+        gains = change.clip(lower=0).ewm(alpha=1 / n, min_periods=n).mean()
+        losses = change.clip(upper=0).ewm(alpha=1 / n, min_periods=n).mean()
+        return 100 * gains / (gains + losses.abs())
+
+    def macd(c):
+        line = ema(c, 12) - ema(c, 26)
+        signal = ema(line.loc[line.first_valid_index():], 9)
+        return pd.concat([line, line - signal, signal], axis=1)
+
+    def bbands(c):
+        mid = c.rolling(20).mean()
+        dev = 2.0 * c.rolling(20).var(0).apply(np.sqrt)
+        return pd.concat([mid - dev, mid, mid + dev, 100 * 2 * dev / mid, (c - mid + dev) / (2 * dev)], axis=1)
+
+    return {
+        'rsi_14': rsi,
+        'sma_50': lambda c: c.rolling(50).mean(),
+        'ema_200': lambda c: ema(c, 200),
+        'macd_12_26_9': macd,
+        'bbands_20_2': bbands,
+    }, "pandas reference"
+
+KERNELS = {
+    'rsi_14': lambda x: kernels.rsi(x, 14),
+    'sma_50': lambda x: kernels.sma(x, 50),
+    'ema_200': lambda x: kernels.ema(x, 200),
+    'macd_12_26_9': lambda x: kernels.macd(x, 12, 26, 9),
+    'bbands_20_2': lambda x: kernels.bbands(x, 20, 2.0),
+}
+
+def per_call(func, arg, min_time=0.2):
+    """Best-of-5 seconds per call, each sample looping for ~min_time/5."""
+    func(arg)
+    start = time.perf_counter()
+    func(arg)
+    loops = max(1, int(min_time / 5 / max(time.perf_counter() - start, 1e-7)))
+    best = float('inf')
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func(arg)
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="numba kernels vs pandas_ta, per-call latency")
+    parser.add_argument('--bars', type=int, nargs='+', default=[2000, 20000, 200000])
+    args = parser.parse_args()
+
+    reference, label = pandas_calls()
+    start = time.perf_counter()
+    for kernel in KERNELS.values():
+        kernel(np.linspace(1.0, 2.0, 300))
+    print(f"numba available: {kernels.NUMBA_AVAILABLE}, compile/load {time.perf_counter() - start:.2f} s")
+
+    rng = np.random.default_rng(7)
+    for n in args.bars:
+        close = pd.Series(np.round(100 + np.cumsum(rng.normal(0, 0.05, n)), 2))
+        values = close.to_numpy()
+        print(f"\n{n} bars")
+        total_ref = total_kernel = 0.0
+        for name, kernel in KERNELS.items():
+            t_ref = per_call(reference[name], close)
+            t_kernel = per_call(kernel, values)
+            total_ref += t_ref
+            total_kernel += t_kernel
+            print(f"  {name:13s} {label} {t_ref * 1e6:10.1f} us | numba {t_kernel * 1e6:9.1f} us | x{t_ref / t_kernel:6.1f}")
+        print(f"  {'all':13s} {label} {total_ref * 1e6:10.1f} us | numba {total_kernel * 1e6:9.1f} us | "
+              f"x{total_ref / total_kernel:6.1f}")
+
+if __name__ == '__main__':
+    main()
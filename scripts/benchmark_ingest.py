@@ -0,0 +1,145 @@
+"""
+Ingestion server throughput benchmark.
+
+Starts socket_server.py in each mode against a scratch database, connects
+several feeders at once, pushes a fixed number of ticks through every
+connection and reports how fast they end up persisted in tick_data.
+
+Usage:
+    python scripts/benchmark_ingest.py --clients 4 --ticks 5000
+"""
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+SERVER_SCRIPT = os.path.join(project_root, 'integration', 'matriks_bridge', 'socket_server.py')
+SYMBOLS = ['THYAO', 'ASELS', 'GARAN', 'AKBNK', 'EREGL']
+
+def wait_for_port(host, port, timeout=15.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+def build_payload(client_id, n_ticks):
+    """Pre-encodes every message so the feeders measure the server, not json.dumps."""
+    lines = []
+    start = datetime.now()
+    for i in range(n_ticks):
+        data = {
+            "symbol": SYMBOLS[(client_id + i) % len(SYMBOLS)],
+            "price": 100.0 + (i % 500) * 0.01,
+            "volume": 1 + i % 1000,
+            "timestamp": (start + timedelta(microseconds=i)).isoformat(),
+            "source": f"bench-{client_id}"
+        }
+        lines.append(json.dumps(data) + "\n")
+    return "".join(lines).encode('utf-8')
+
+def feeder(host, port, payload):
+    s = socket.create_connection((host, port))
+    try:
+        s.sendall(payload)
+    finally:
+        s.close()
+
+def count_rows(db_path):
+    try:
+        conn = sqlite3.connect(db_path, timeout=30)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM tick_data").fetchone()[0]
+        finally:
+            conn.close()
+    except sqlite3.OperationalError:
+        return 0
+
+def run_mode(mode, port, n_clients, n_ticks, timeout):
+    tmp_dir = tempfile.mkdtemp(prefix=f"bist_bench_{mode}_")
+    db_path = os.path.join(tmp_dir, 'market_data.db')
+    env = dict(os.environ, BIST_DB_PATH=db_path, BIST_RING_DIR=os.path.join(tmp_dir, 'bar_rings'))
+
+    proc = subprocess.Popen(
+        [sys.executable, SERVER_SCRIPT, '--mode', mode, '--port', str(port), '--quiet'],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        if not wait_for_port('127.0.0.1', port):
+            print(f"[!] {mode} server did not start")
+            return None
+
+        payloads = [build_payload(c, n_ticks) for c in range(n_clients)]
+        expected = n_clients * n_ticks
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=feeder, args=('127.0.0.1', port, p)) for p in payloads]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        sent_elapsed = time.perf_counter() - start
+
+        persisted = 0
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            persisted = count_rows(db_path)
+            if persisted >= expected:
+                break
+            time.sleep(0.05)
+        elapsed = time.perf_counter() - start
+
+        return {
+            'mode': mode,
+            'expected': expected,
+            'persisted': persisted,
+            'send_s': sent_elapsed,
+            'total_s': elapsed,
+            'ticks_per_s': persisted / elapsed if elapsed > 0 else 0.0,
+        }
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+def main():
+    parser = argparse.ArgumentParser(description="Threaded vs asyncio ingestion throughput")
+    parser.add_argument('--clients', type=int, default=4, help="Concurrent feeder connections")
+    parser.add_argument('--ticks', type=int, default=2000, help="Ticks sent per connection")
+    parser.add_argument('--port', type=int, default=5655, help="Base port (each mode uses its own)")
+    parser.add_argument('--timeout', type=float, default=300.0, help="Seconds to wait for persistence")
+    parser.add_argument('--modes', nargs='+', default=['threaded', 'async'])
+    args = parser.parse_args()
+
+    print(f"[*] {args.clients} clients x {args.ticks} ticks per mode")
+    results = []
+    for i, mode in enumerate(args.modes):
+        res = run_mode(mode, args.port + i, args.clients, args.ticks, args.timeout)
+        if res:
+            results.append(res)
+
+    print("-" * 72)
+    print(f"{'Mode':<10} {'Persisted':>12} {'Send (s)':>10} {'Total (s)':>10} {'Ticks/s':>12}")
+    for r in results:
+        print(f"{r['mode']:<10} {r['persisted']:>6}/{r['expected']:<5} {r['send_s']:>10.2f} "
+              f"{r['total_s']:>10.2f} {r['ticks_per_s']:>12.0f}")
+    print("-" * 72)
+
+if __name__ == "__main__":
+    main()
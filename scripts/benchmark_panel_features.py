@@ -0,0 +1,97 @@
+"""
+Indicator benchmark: add_indicators() symbol by symbol against the panel
+engine (core/panel_features.py) computing every symbol in one pass.
+
+Without pandas_ta installed the per-symbol side runs the same pandas calls
+pandas_ta makes (ewm / rolling, see pandas_reference) minus its wrapper
+overhead, so the speed-up shown is a lower bound. The per-symbol loop is
+timed on at most --loop-limit symbols and scaled linearly beyond that.
+
+Usage:
+    python scripts/benchmark_panel_features.py --symbols 40 400 4000 --bars 2000
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from core.panel_features import BarPanel, feature_tensor
+
+def make_frames(n_symbols, n_bars, seed=11):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(datetime(2025, 1, 2, 10), periods=n_bars, freq='1s', name='timestamp')
+    frames = {}
+    for i in range(n_symbols):
+        close = np.round(100 + np.cumsum(rng.normal(0, 0.05, n_bars)), 2)
+        frames[f"S{i:04d}"] = pd.DataFrame({'open': close, 'high': close + 0.02, 'low': close - 0.02, 'close': close,
+                                            'volume': rng.integers(1, 100, n_bars).astype(float)}, index=index)
+    return frames
+
+def pandas_reference(bars):
+    """pandas_ta's non-TA-Lib code path for the add_indicators() columns."""
+    close = bars['close']
+
+    def ema(x, n):
+        x = x.copy()
+        seed = x.iloc[:n].mean()
+        x.iloc[:n - 1] = np.nan
+        x.iloc[n - 1] = seed
+        return x.ewm(span=n, adjust=False).mean()
+
+    change = close.diff()
+    gains = change.clip(lower=0).ewm(alpha=1 / 14, min_periods=14).mean()
+    losses = change.clip(upper=0).ewm(alpha=1 / 14, min_periods=14).mean()
+    macd = ema(close, 12) - ema(close, 26)
+    signal = ema(macd.loc[macd.first_valid_index():], 9)
+    mid = close.rolling(20).mean()
+    dev = 2.0 * close.rolling(20).var(0).apply(np.sqrt)
+    out = bars.assign(RSI_14=100 * gains / (gains + losses.abs()), SMA_50=close.rolling(50).mean(),
+                      EMA_200=ema(close, 200), MACD_12_26_9=macd, MACDh_12_26_9=macd - signal,
+                      MACDs_12_26_9=signal, **{'BBL_20_2.0': mid - dev, 'BBM_20_2.0': mid, 'BBU_20_2.0': mid + dev,
+                                               'BBB_20_2.0': 100 * 2 * dev / mid,
+                                               'BBP_20_2.0': (close - mid + dev) / (2 * dev)})
+    return out.dropna()
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-symbol vs panel indicator computation")
+    parser.add_argument('--symbols', type=int, nargs='+', default=[40, 400, 4000])
+    parser.add_argument('--bars', type=int, default=2000, help="Bars per symbol")
+    parser.add_argument('--window', type=int, default=60, help="Model sequence length")
+    parser.add_argument('--loop-limit', type=int, default=400)
+    args = parser.parse_args()
+
+    try:
+        from core.feature_engine import add_indicators
+        per_symbol, label = (lambda df: add_indicators(df.copy())), "add_indicators"
+    except ImportError:
+        per_symbol, label = pandas_reference, "pandas reference"
+
+    for n in args.symbols:
+        frames = make_frames(n, args.bars)
+        sample = list(frames.items())[:args.loop_limit]
+        t0 = time.perf_counter()
+        loop_out = {s: per_symbol(df).tail(args.window).to_numpy(np.float32) for s, df in sample}
+        t_loop = (time.perf_counter() - t0) * len(frames) / len(sample)
+
+        t0 = time.perf_counter()
+        panel = BarPanel.from_frames(frames)
+        t_build = time.perf_counter() - t0
+        tensor, symbols = feature_tensor(panel, window=args.window)
+        t_panel = time.perf_counter() - t0
+
+        worst = max(np.max(np.abs(tensor[symbols.index(s)] - x) / np.maximum(np.abs(x), 1)) for s, x in loop_out.items())
+        scaled = " (scaled)" if len(sample) < n else ""
+        print(f"{n:5d} symbols x {args.bars} bars: {label} loop {t_loop * 1000:9.1f} ms{scaled} | "
+              f"panel {t_panel * 1000:8.1f} ms (build {t_build * 1000:.1f}) | x{t_loop / t_panel:.1f} | "
+              f"tensor {tensor.shape} | max rel diff {worst:.1e}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Resampling benchmark: resample_ticks() / resample_ticks_many() (bucket ids
+plus reduceat, core/bar_builder.py) against the pandas paths they replaced
+(DataFrame.resample().agg() + dropna, groupby on dt.floor buckets).
+
+Usage:
+    python scripts/benchmark_resample.py --ticks 10000 100000 1000000 --timeframes 1s 1min
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from core.bar_builder import (_resample_ticks_many_pandas, _resample_ticks_pandas, resample_ticks,
+                              resample_ticks_many)
+
+def make_ticks(n, symbols=20, seed=2):
+    # One trading day's worth of ticks per symbol, ~sparse at 1s for small n
+    rng = np.random.default_rng(seed)
+    offsets = np.sort(rng.integers(0, 8 * 3600 * 1000, n)).astype('timedelta64[ms]')
+    return pd.DataFrame({
+        'symbol': np.sort(rng.integers(0, symbols, n)).astype(str),
+        'timestamp': pd.to_datetime(np.datetime64(datetime(2025, 1, 2, 10)) + offsets),
+        'price': np.round(100 + np.cumsum(rng.normal(0, 0.05, n)), 2),
+        'volume': rng.integers(1, 1000, n).astype(float),
+    })
+
+def best_of(func, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="reduceat resampler vs pandas resample")
+    parser.add_argument('--ticks', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--timeframes', nargs='+', default=['1s', '1min'])
+    args = parser.parse_args()
+
+    for n in args.ticks:
+        ticks = make_ticks(n)
+        ticks = ticks.sort_values(['symbol', 'timestamp'], kind='stable').reset_index(drop=True)
+        one = ticks[['timestamp', 'price', 'volume']].sort_values('timestamp', kind='stable')
+        indexed = one.set_index('timestamp')
+        for timeframe in args.timeframes:
+            t_pandas = best_of(lambda: _resample_ticks_pandas(indexed, timeframe))
+            t_fast = best_of(lambda: resample_ticks(one, timeframe))
+            t_many_pandas = best_of(lambda: _resample_ticks_many_pandas(ticks, timeframe))
+            t_many_fast = best_of(lambda: resample_ticks_many(ticks, timeframe))
+            same = resample_ticks(one, timeframe).equals(_resample_ticks_pandas(indexed, timeframe))
+            print(f"{n:8d} ticks {timeframe:>5s}: resample {t_pandas * 1000:8.2f} ms -> {t_fast * 1000:7.2f} ms "
+                  f"(x{t_pandas / t_fast:5.1f}) | many {t_many_pandas * 1000:8.2f} ms -> {t_many_fast * 1000:7.2f} ms "
+                  f"(x{t_many_pandas / t_many_fast:5.1f}) | identical: {same}")
+
+if __name__ == '__main__':
+    main()
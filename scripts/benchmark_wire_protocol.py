@@ -0,0 +1,93 @@
+"""
+Parse throughput: newline-delimited JSON vs the binary framed protocol.
+
+Both paths start from the bytes a server receives and end with the tick
+dicts that are handed to the writer (symbol, price, volume, datetime).
+
+Usage:
+    python scripts/benchmark_wire_protocol.py --ticks 200000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from core.config_symbols import ALL_SYMBOLS
+from integration.matriks_bridge.wire_protocol import BinaryTickEncoder, BinaryFrameDecoder
+
+CHUNK = 65536  # bytes per simulated recv()
+
+def make_ticks(n):
+    start = datetime(2025, 1, 2, 10, 0, 0)
+    return [
+        (random.choice(ALL_SYMBOLS), round(random.uniform(10, 500), 2),
+         random.randint(1, 1000), start + timedelta(milliseconds=i))
+        for i in range(n)
+    ]
+
+def bench_json(ticks):
+    payload = "".join(
+        json.dumps({"symbol": s, "price": p, "volume": v, "timestamp": ts.isoformat()}) + "\n"
+        for s, p, v, ts in ticks
+    ).encode('utf-8')
+
+    start = time.perf_counter()
+    out = 0
+    buffer = b""
+    for i in range(0, len(payload), CHUNK):
+        buffer += payload[i:i + CHUNK]
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            data = json.loads(line)
+            data['timestamp'] = datetime.fromisoformat(data['timestamp'])
+            out += 1
+    elapsed = time.perf_counter() - start
+    return out, elapsed, len(payload)
+
+def bench_binary(ticks, batch, expand=True):
+    encoder = BinaryTickEncoder("bench")
+    payload = b"".join(encoder.encode(ticks[i:i + batch]) for i in range(0, len(ticks), batch))
+
+    decoder = BinaryFrameDecoder("bench")
+    start = time.perf_counter()
+    out = 0
+    for i in range(0, len(payload), CHUNK):
+        for arr in decoder.feed(payload[i:i + CHUNK]):
+            if expand:
+                out += len(decoder.to_messages(arr))
+            else:
+                out += len(arr)
+    elapsed = time.perf_counter() - start
+    return out, elapsed, len(payload)
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON vs binary tick parse throughput")
+    parser.add_argument('--ticks', type=int, default=200000)
+    args = parser.parse_args()
+
+    random.seed(42)
+    ticks = make_ticks(args.ticks)
+
+    rows = [("JSON lines", *bench_json(ticks))]
+    for batch in (1, 100, 1000):
+        rows.append((f"Binary batch={batch} -> dicts", *bench_binary(ticks, batch)))
+    rows.append(("Binary batch=1000 -> numpy", *bench_binary(ticks, 1000, expand=False)))
+
+    print(f"[*] {args.ticks} ticks, {CHUNK} byte recv chunks")
+    print("-" * 78)
+    print(f"{'Path':<32} {'Ticks/s':>14} {'Bytes/tick':>12} {'Speedup':>10}")
+    base = rows[0][1] / rows[0][2]
+    for name, n, elapsed, size in rows:
+        rate = n / elapsed
+        print(f"{name:<32} {rate:>14,.0f} {size / n:>12.1f} {rate / base:>9.1f}x")
+    print("-" * 78)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+One-off deduplication of tick_data.
+
+Deletes repeated (symbol, timestamp, source) rows left behind by feeder
+restarts and history reloads, then creates the unique index so the tick
+writer ignores re-sent ticks from now on.
+
+Usage:
+    python scripts/compact_ticks.py --legacy-source YahooFinance --vacuum
+"""
+import argparse
+import os
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from sqlalchemy import text
+
+from core.database import DB_PATH, engine, compact_tick_data
+
+def main():
+    parser = argparse.ArgumentParser(description="Remove duplicate ticks from tick_data in place")
+    parser.add_argument('--keep', choices=['first', 'last'], default='first',
+                        help="Which copy of a duplicate survives (by insertion order)")
+    parser.add_argument('--legacy-source',
+                        help="Source name for rows stored before the source column existed "
+                             "(history from free_data_feeder / populate_real_history is 'YahooFinance')")
+    parser.add_argument('--vacuum', action='store_true', help="Reclaim the freed disk space afterwards")
+    args = parser.parse_args()
+
+    print(f"[*] Compacting {DB_PATH}")
+    start = time.perf_counter()
+    res = compact_tick_data(keep=args.keep, legacy_source=args.legacy_source)
+    print(f"[+] {res['rows_before']:,} -> {res['rows_after']:,} rows "
+          f"({res['removed']:,} duplicates removed) in {time.perf_counter() - start:.1f}s")
+
+    if args.vacuum:
+        size = os.path.getsize(DB_PATH)
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("VACUUM"))
+        print(f"[+] VACUUM: {size / 1e6:,.1f} MB -> {os.path.getsize(DB_PATH) / 1e6:,.1f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Exports stored ticks and resampled bars to the Parquet archive used for training.
+
+Files land under data/archive/parquet/ (see core/parquet_archive.py),
+partitioned by symbol and date. Re-running an export for the same days
+replaces their files, so a nightly run over the last few days is safe.
+
+Usage:
+    python scripts/export_parquet.py --start 2025-01-01 --end 2025-04-01
+    python scripts/export_parquet.py --start 2025-03-01 --symbols THYAO GARAN --bars 1min 5min --no-ticks
+"""
+import argparse
+import os
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from core.parquet_archive import PARQUET_DIR, export_ticks, export_bars
+
+def main():
+    parser = argparse.ArgumentParser(description="Export ticks and bars to partitioned Parquet files")
+    parser.add_argument('--start', help="First timestamp to export (inclusive)")
+    parser.add_argument('--end', help="Last timestamp to export (exclusive)")
+    parser.add_argument('--symbols', nargs='+', help="Default: all symbols in core/config_symbols.py")
+    parser.add_argument('--bars', nargs='*', default=['1min'], help="Bar timeframes to export")
+    parser.add_argument('--no-ticks', action='store_true', help="Only export bars")
+    parser.add_argument('--root', default=PARQUET_DIR)
+    args = parser.parse_args()
+
+    if not args.no_ticks:
+        start = time.perf_counter()
+        written = export_ticks(args.start, args.end, args.symbols, root=args.root)
+        elapsed = time.perf_counter() - start
+        total = sum(written.values())
+        print(f"[+] Ticks: {total:,} rows for {len(written)} symbols in {elapsed:.1f}s "
+              f"({total / elapsed if elapsed else 0:,.0f} rows/s)")
+
+    for timeframe in args.bars:
+        start = time.perf_counter()
+        written = export_bars(timeframe, args.start, args.end, args.symbols, root=args.root)
+        print(f"[+] {timeframe} bars: {sum(written.values()):,} rows for {len(written)} symbols "
+              f"in {time.perf_counter() - start:.1f}s")
+
+    print(f"[*] Archive: {args.root}")
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ if project_root not in sys.path:
 
 from integration.evds_client import EvdsClient
 from core.database import SessionLocal, MacroData, init_db
+from core.macro_service import invalidate_macro_cache
 
 # USER API KEY
 API_KEY = "qr7BBmch3C"
@@ -63,6 +64,7 @@ def save_macro_data(data):
             print(f"[+] Saved USD/TRY: {data['usd_try']}")
 
         session.commit()
+        invalidate_macro_cache()
         print("[*] Database updated successfully.")
         
     except Exception as e:
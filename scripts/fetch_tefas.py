@@ -10,6 +10,7 @@ if project_root not in sys.path:
 
 from integration.tefas_client import TefasClient
 from core.database import SessionLocal, FundFlow, init_db
+from core.macro_service import invalidate_macro_cache
 
 def save_fund_data(data_list):
     if not data_list:
@@ -40,6 +41,7 @@ def save_fund_data(data_list):
                 print(f"[*] {item['fund_code']} for {item['date']} already exists. Skipping.")
 
         session.commit()
+        invalidate_macro_cache()
     except Exception as e:
         print(f"[!] DB Error: {e}")
         session.rollback()
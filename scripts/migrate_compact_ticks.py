@@ -0,0 +1,68 @@
+"""
+Copies tick_data (and its day partitions) into the compact tick schema
+(core.compact_ticks) and reports the size and load time of both.
+
+Safe to re-run: ticks already copied are skipped, so it can run after every
+partition roll. tick_data itself is left untouched.
+
+Usage:
+    python scripts/migrate_compact_ticks.py
+    python scripts/migrate_compact_ticks.py --target data/database/ticks_compact.db --keep-received
+"""
+import argparse
+import os
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from sqlalchemy import create_engine, text
+
+from core.database import DB_PATH, get_engine
+from core.tick_store import get_tick_store
+from core.compact_ticks import load_compact, migrate_tick_data
+
+def table_bytes(engine, tables):
+    """On-disk bytes of tables and their indexes (SQLite dbstat)."""
+    with engine.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT SUM(pgsize) FROM dbstat WHERE name IN (SELECT name FROM sqlite_master "
+            f"WHERE tbl_name IN ({', '.join(repr(t) for t in tables)}))"
+        )).scalar()
+    return rows or 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate tick_data into the compact tick schema")
+    parser.add_argument('--target', help="Write ticks_compact to this SQLite file instead of the main database")
+    parser.add_argument('--batch', type=int, default=100_000, help="Ticks per read/insert batch")
+    parser.add_argument('--keep-received', action='store_true', help="Also keep the received_at column")
+    args = parser.parse_args()
+
+    store = get_tick_store('analytics')
+    target = create_engine(f"sqlite:///{args.target}") if args.target else get_engine('ingest')
+
+    print(f"[*] Migrating ticks from {DB_PATH} -> {args.target or 'ticks_compact'}")
+    start = time.perf_counter()
+    res = migrate_tick_data(store=store, engine=target, batch_size=args.batch, keep_received=args.keep_received)
+    elapsed = time.perf_counter() - start
+    print(f"[+] {res['rows_read']:,} ticks read from {len(res['tables'])} tables, "
+          f"{res['rows_written']:,} new in {elapsed:.1f}s")
+
+    source_bytes = table_bytes(get_engine('analytics'), ['tick_data'] + [p.table for p in store.partitions() if p.path is None])
+    compact_bytes = table_bytes(target, ['ticks_compact'])
+    if res['rows_read']:
+        print(f"[+] Size: {source_bytes / 1e6:,.1f} MB ({source_bytes / res['rows_read']:.0f} B/tick) -> "
+              f"{compact_bytes / 1e6:,.1f} MB ({compact_bytes / res['rows_read']:.0f} B/tick)")
+
+    start = time.perf_counter()
+    old = store.query()
+    t_old = time.perf_counter() - start
+    start = time.perf_counter()
+    new = load_compact(engine=target)
+    t_new = time.perf_counter() - start
+    print(f"[+] Full load: TickStore.query {t_old:.2f}s ({len(old):,} rows) | load_compact {t_new:.2f}s ({len(new):,} rows)")
+
+if __name__ == '__main__':
+    main()
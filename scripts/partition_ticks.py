@@ -0,0 +1,59 @@
+"""
+Daily maintenance of the partitioned tick store (core/tick_store.py).
+
+Moves closed trading days out of tick_data into day partitions, archives
+partitions older than --hot-days to data/archive/ticks/ and deletes archived
+days older than --keep-days. Run it after the session closes (e.g. 18:30).
+
+Usage:
+    python scripts/partition_ticks.py
+    python scripts/partition_ticks.py --per-symbol --hot-days 10 --keep-days 365 --vacuum
+    python scripts/partition_ticks.py --list
+"""
+import argparse
+import os
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from sqlalchemy import text
+
+from core.database import DB_PATH, engine
+from core.tick_store import TickStore, ARCHIVE_DIR, HOT_DAYS, KEEP_DAYS
+
+def main():
+    parser = argparse.ArgumentParser(description="Roll, archive and expire tick partitions")
+    parser.add_argument('--per-symbol', action='store_true', help="Create one partition per day and symbol")
+    parser.add_argument('--hot-days', type=int, default=HOT_DAYS,
+                        help="Day partitions younger than this stay in the main database")
+    parser.add_argument('--keep-days', type=int, default=KEEP_DAYS,
+                        help="Delete partitions older than this (default: keep forever)")
+    parser.add_argument('--archive-dir', default=ARCHIVE_DIR)
+    parser.add_argument('--vacuum', action='store_true', help="Reclaim the freed disk space afterwards")
+    parser.add_argument('--list', action='store_true', help="Only list the stored partitions")
+    args = parser.parse_args()
+
+    store = TickStore(engine=engine, archive_dir=args.archive_dir, per_symbol=args.per_symbol)
+    if args.list:
+        for part in store.partitions():
+            print(f"{part.table:<32} {part.path or 'main database'}")
+        return
+
+    start = time.perf_counter()
+    moved = store.roll()
+    print(f"[+] Rolled {sum(moved.values()):,} ticks into {len(moved)} partitions")
+    res = store.apply_retention(hot_days=args.hot_days, keep_days=args.keep_days)
+    print(f"[+] Archived {len(res['archived'])}, deleted {len(res['deleted'])} partitions "
+          f"in {time.perf_counter() - start:.1f}s")
+
+    if args.vacuum:
+        size = os.path.getsize(DB_PATH)
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("VACUUM"))
+        print(f"[+] VACUUM: {size / 1e6:,.1f} MB -> {os.path.getsize(DB_PATH) / 1e6:,.1f} MB")
+
+if __name__ == "__main__":
+    main()
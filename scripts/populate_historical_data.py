@@ -1,15 +1,15 @@
-import random
 from datetime import datetime, timedelta
 import sys
 import os
 import numpy as np
+import pandas as pd
 
 # Resolve project root
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if project_root not in sys.path:
     sys.path.append(project_root)
 
-from core.database import SessionLocal, TickData
+from core.bulk_loader import bulk_load
 from core.config_symbols import ALL_SYMBOLS as SYMBOLS
 
 # Starting prices for simulation (Approximate realistic values)
@@ -19,70 +19,45 @@ START_PRICES = {
     'CIMSA': 35.0, 'SAHOL': 90.0, 'OTKAR': 450.0
 }
 
+def generate_symbol(symbol, start_time, end_time, rng):
+    """
+    Synthetic ticks of one symbol as columns: 3 to 5 ticks per minute at
+    random seconds, price a +/- 0.5% random walk per tick.
+    """
+    n_minutes = int((end_time - start_time).total_seconds() // 60)
+    per_minute = rng.integers(3, 6, n_minutes)
+    minute = np.repeat(np.arange(n_minutes), per_minute)
+    offset_us = minute * 60_000_000 + rng.integers(0, 60, len(minute)) * 1_000_000 + rng.integers(0, 1_000_000, len(minute))
+    timestamps = np.datetime64(start_time, 'us') + offset_us.astype('timedelta64[us]')
+
+    # Random Walk: +/- 0.5%
+    walk = START_PRICES.get(symbol, 100.0) * np.cumprod(1.0 + rng.uniform(-0.005, 0.005, len(minute)))
+    return {
+        'symbol': symbol,
+        'price': np.round(np.maximum(walk, 0.1), 2),
+        'volume': rng.integers(10, 10001, len(minute)),
+        'timestamp': timestamps,
+    }
+
 def populate_data():
     print("--- Starting Historical Data Population (Portfolio Mode) ---")
     
-    session = SessionLocal()
-    
     # Time settings
     # UTC now is safer for database timestamps
     end_time = datetime.utcnow()
     start_time = end_time - timedelta(hours=24)
+    rng = np.random.default_rng()
     
-    total_ticks_all = 0
-    
+    frames = []
     for symbol in SYMBOLS:
         print(f"Generating data for {symbol}...")
-        
-        current_time = start_time
-        current_price = START_PRICES.get(symbol, 100.0) # Default 100 if missing
-        
-        ticks_to_save = []
-        symbol_ticks = 0
-        
-        while current_time < end_time:
-            # Generate 3 to 5 ticks per minute per symbol (less density for portfolio performance)
-            num_ticks = random.randint(3, 5)
-            
-            for _ in range(num_ticks):
-                # Random time within the minute
-                tick_time = current_time + timedelta(seconds=random.randint(0, 59), microseconds=random.randint(0, 999999))
-                
-                # Random Walk: +/- 0.5%
-                change_pct = random.uniform(-0.005, 0.005)
-                current_price *= (1.0 + change_pct)
-                
-                if current_price < 0.1: current_price = 0.1
-                    
-                tick = TickData(
-                    symbol=symbol,
-                    price=round(current_price, 2),
-                    volume=random.randint(10, 10000),
-                    timestamp=tick_time,
-                    received_at=datetime.utcnow()
-                )
-                ticks_to_save.append(tick)
-                
-            # Bulk save periodically
-            if len(ticks_to_save) >= 2000:
-                session.bulk_save_objects(ticks_to_save)
-                session.commit()
-                symbol_ticks += len(ticks_to_save)
-                ticks_to_save = []
-                
-            current_time += timedelta(minutes=1)
-            
-        # Save remaining for this symbol
-        if ticks_to_save:
-            session.bulk_save_objects(ticks_to_save)
-            session.commit()
-            symbol_ticks += len(ticks_to_save)
-            
-        print(f" -> {symbol_ticks} records added for {symbol}.")
-        total_ticks_all += symbol_ticks
+        frames.append(pd.DataFrame(generate_symbol(symbol, start_time, end_time, rng)))
+        print(f" -> {len(frames[-1])} records generated for {symbol}.")
 
-    session.close()
-    print(f"\n[+] Veritabanına başarıyla toplam {total_ticks_all} adet geçmiş veri eklendi.")
+    # One transaction for the whole portfolio
+    res = bulk_load(pd.concat(frames, ignore_index=True).assign(source='Synthetic', received_at=datetime.utcnow()))
+    print(f"\n[+] Veritabanına başarıyla toplam {res['inserted']} adet geçmiş veri eklendi "
+          f"({res['rows']} satır, {res['seconds']:.2f}s, {res['rows_per_s']:,.0f} satır/sn).")
 
 if __name__ == "__main__":
     populate_data()
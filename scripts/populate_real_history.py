@@ -1,13 +1,16 @@
 import yfinance as yf
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
 import sys
 import os
 
 # Proje kök dizinini ekle
 sys.path.append(os.getcwd())
 
-from core.database import SessionLocal, TickData
+from core.bulk_loader import bulk_load
+
+# Same source name the live feeder uses, so re-sent minutes dedup against these
+SOURCE = 'YahooFinance'
 
 # Yahoo Finance Sembolleri
 SYMBOLS = [
@@ -15,12 +18,27 @@ SYMBOLS = [
     'ENKAI.IS', 'FROTO.IS', 'KRDMD.IS', 'CIMSA.IS', 'SAHOL.IS', 'OTKAR.IS'
 ]
 
+def to_columns(df, sys_symbol):
+    """yfinance 1m frame -> tick_data columns (no per-row loop)."""
+    # yfinance bazen MultiIndex kolon döndürür (Price, Ticker); tek sembol için ilk kolonu al
+    close = df['Close']
+    volume = df['Volume']
+    if isinstance(close, pd.DataFrame):
+        close, volume = close.iloc[:, 0], volume.iloc[:, 0]
+
+    # Timestamp timezone bilgisini temizle (SQLite karmaşasını önlemek için)
+    index = df.index.tz_localize(None) if df.index.tz is not None else df.index
+    return pd.DataFrame({
+        'symbol': sys_symbol,
+        'price': close.to_numpy(dtype=float),
+        'volume': volume.to_numpy(dtype=float),
+        'timestamp': index,
+    }).dropna(subset=['price'])
+
 def populate_real_data():
     print("--- GERÇEK GEÇMİŞ VERİ YÜKLEME BAŞLATILIYOR (YAHOO FINANCE) ---")
     
-    session = SessionLocal()
-    total_added = 0
-    
+    frames = []
     for yahoo_symbol in SYMBOLS:
         # Sistemdeki sembol adı (.IS olmadan)
         sys_symbol = yahoo_symbol.replace('.IS', '')
@@ -35,50 +53,24 @@ def populate_real_data():
                 print(f"[!] {sys_symbol} için veri bulunamadı.")
                 continue
                 
-            # 2. Verileri Dönüştür ve Kaydet
-            ticks_to_save = []
-            
-            # DataFrame index'i datetime'dır
-            for index, row in df.iterrows():
-                # Timestamp timezone bilgisini temizle (SQLite karmaşasını önlemek için)
-                ts = index.replace(tzinfo=None) if index.tzinfo else index
-                
-                # Fiyat ve Hacim
-                # yfinance bazen MultiIndex döndürür, tek sembol indirdiğimiz için .iloc gerekebilir 
-                # ama download tek sembolse düz kolon gelir. Garanti olsun diye float çeviriyoruz.
-                try:
-                    price = float(row['Close'])
-                    volume = int(row['Volume'])
-                except:
-                    # Bazen Series olarak gelebilir
-                    price = float(row['Close'].iloc[0]) if hasattr(row['Close'], 'iloc') else float(row['Close'])
-                    volume = int(row['Volume'].iloc[0]) if hasattr(row['Volume'], 'iloc') else int(row['Volume'])
-
-                # DB Objesi
-                tick = TickData(
-                    symbol=sys_symbol,
-                    price=price,
-                    volume=volume,
-                    timestamp=ts,
-                    received_at=datetime.utcnow()
-                )
-                ticks_to_save.append(tick)
-            
-            # 3. Toplu Kayıt (Bulk Save)
-            if ticks_to_save:
-                session.bulk_save_objects(ticks_to_save)
-                session.commit()
-                count = len(ticks_to_save)
-                print(f" -> {count} adet veri eklendi.")
-                total_added += count
-            else:
-                print(" -> Eklenecek veri yok.")
+            # 2. Verileri Dönüştür
+            frames.append(to_columns(df, sys_symbol))
+            print(f" -> {len(frames[-1])} satır indirildi.")
                 
         except Exception as e:
             print(f"[!] Hata ({sys_symbol}): {e}")
-            session.rollback()
 
-    session.close()
+    # 3. Toplu Kayıt (Bulk Insert), tek transaction
+    # Daha önce yüklenmiş dakikalar (symbol, timestamp, source) atlanır
+    total_added = 0
+    if frames:
+        res = bulk_load(pd.concat(frames, ignore_index=True).assign(source=SOURCE, received_at=datetime.utcnow()))
+        total_added = res['inserted']
+        print(f"\n -> {total_added} adet veri eklendi ({res['rows'] - total_added} tekrar atlandı), "
+              f"{res['rows_per_s']:,.0f} satır/sn.")
+    else:
+        print(" -> Eklenecek veri yok.")
+
     print("-" * 50)
     print(f"TAMAMLANDI. Toplam {total_added} satır veri veritabanına işlendi.")
     print("-" * 50)
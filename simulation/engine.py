@@ -21,7 +21,7 @@ def run_simulation(symbol, strategy_class, cash=100000, commission=0.002, timefr
         cash (int): Initial capital.
         commission (float): Transaction cost (e.g., 0.002 for 0.2%).
         timeframe (str): Data timeframe.
-        limit (int): Amount of historical data to fetch.
+        limit (int): Number of bars to fetch (the newest ones, see fetch_ohlcv).
         
     Returns:
         stats (pd.Series): Backtest performance statistics.
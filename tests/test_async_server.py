@@ -0,0 +1,70 @@
+import unittest
+import asyncio
+import json
+import sys
+import os
+import tempfile
+
+# Resolve project root
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+# Keep the test away from the real market database
+os.environ.setdefault('BIST_DB_PATH', os.path.join(tempfile.mkdtemp(), 'test_market.db'))
+
+from integration.matriks_bridge import socket_server
+from integration.matriks_bridge.async_server import AsyncTickServer
+
+class TestAsyncServer(unittest.TestCase):
+
+    def setUp(self):
+        socket_server.VERBOSE = False
+
+    def test_many_clients_reach_writer_stage(self):
+        received = []
+        server = AsyncTickServer(host='127.0.0.1', port=0, sink=received.append)
+
+        async def scenario():
+            await server.start()
+            port = server.server.sockets[0].getsockname()[1]
+
+            async def client(client_id):
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                for i in range(50):
+                    msg = {"symbol": "THYAO", "price": 100.0 + i, "volume": client_id}
+                    writer.write((json.dumps(msg) + "\n").encode('utf-8'))
+                # Garbage line must be skipped without killing the connection
+                writer.write(b"not json\n")
+                await writer.drain()
+                writer.close()
+                await writer.wait_closed()
+
+            await asyncio.gather(*(client(c) for c in range(5)))
+            # Let the handlers read everything before draining
+            while server.ticks_parsed < 250:
+                await asyncio.sleep(0.01)
+            await server.stop()
+
+        asyncio.run(scenario())
+
+        self.assertEqual(len(received), 250)
+        self.assertEqual(server.ticks_written, 250)
+        self.assertEqual(sorted({r['volume'] for r in received}), [0, 1, 2, 3, 4])
+
+    def test_depth_message_gets_imbalance(self):
+        data = socket_server.parse_message('{"symbol": "GARAN", "bids": [[10, 300]], "asks": [[10.1, 100]]}')
+        self.assertAlmostEqual(data['imbalance'], 0.5)
+
+    def test_invalid_book_without_trade_is_dropped(self):
+        self.assertIsNone(socket_server.parse_message('{"symbol": "GARAN", "bids": [["x"]], "asks": 5}'))
+        data = socket_server.parse_message('{"symbol": "GARAN", "price": 10.1, "bids": [["x"]], "asks": 5}')
+        self.assertEqual(data, {'symbol': 'GARAN', 'price': 10.1})
+
+    def test_non_object_json_is_dropped(self):
+        for line in ('123', '[]', '"THYAO"', 'null'):
+            self.assertIsNone(socket_server.parse_message(line))
+
+if __name__ == '__main__':
+    unittest.main()
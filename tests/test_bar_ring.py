@@ -0,0 +1,102 @@
+import unittest
+import sys
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta
+
+# Resolve project root
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+import numpy as np
+
+from core.bar_ring import BarRing, BarRings, ring_path, open_bar_ring, read_ring_bars
+
+START = datetime(2025, 1, 2, 10, 0, 0)
+
+def make_bar(i, symbol='THYAO', timeframe='1s'):
+    # Every field derives from i, so a torn read is detectable
+    return {'symbol': symbol, 'timeframe': timeframe, 'start': START + timedelta(seconds=i),
+            'open': float(i), 'high': i + 0.5, 'low': i - 0.5, 'close': float(i), 'volume': 10.0 * i, 'tick_count': i}
+
+class TestBarRing(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = ring_path('THYAO', '1s', self.dir)
+
+    def test_last_window_across_wrap(self):
+        ring = BarRing.create(self.path, capacity=8)
+        for i in range(5):
+            ring.append(make_bar(i))
+        self.assertEqual(ring.last(10)['close'].tolist(), [0, 1, 2, 3, 4])
+
+        for i in range(5, 21):
+            ring.append(make_bar(i))
+        reader = BarRing.open(self.path)
+        self.assertEqual(reader.count, 21)
+        window = reader.last(6)
+        self.assertEqual(window['close'].tolist(), [15, 16, 17, 18, 19, 20])
+        # Zero-copy: the window is a read-only view of the mapping
+        self.assertFalse(window.flags.writeable)
+        self.assertIsNotNone(window.base)
+        self.assertEqual(len(reader.last(100)), 8)
+
+        frame = reader.frame(3)
+        self.assertEqual(list(frame.columns), ['open', 'high', 'low', 'close', 'volume'])
+        self.assertEqual(frame.index[-1], START + timedelta(seconds=20))
+        reader.close()
+        ring.close()
+
+    def test_reopen_keeps_history(self):
+        ring = BarRing.create(self.path, capacity=16)
+        for i in range(3):
+            ring.append(make_bar(i))
+        ring.close()
+        ring = BarRing.create(self.path, capacity=16)
+        ring.append(make_bar(3))
+        self.assertEqual(ring.last(4)['close'].tolist(), [0, 1, 2, 3])
+        ring.close()
+
+    def test_concurrent_reader_sees_consistent_windows(self):
+        ring = BarRing.create(self.path, capacity=64)
+        reader = BarRing.open(self.path)
+        errors = []
+        stop = threading.Event()
+
+        def read():
+            while not stop.is_set():
+                window = reader.last(32, copy=True)
+                if len(window) > 1:
+                    closes = window['close']
+                    if not (np.all(np.diff(closes) == 1) and np.all(window['volume'] == 10 * closes)):
+                        errors.append(closes)
+
+        thread = threading.Thread(target=read)
+        thread.start()
+        for i in range(20000):
+            ring.append(make_bar(i))
+        stop.set()
+        thread.join()
+        self.assertEqual(errors, [])
+        reader.close()
+        ring.close()
+
+    def test_writer_side_and_helpers(self):
+        rings = BarRings(self.dir, capacity=32, timeframes=('1s',))
+        for i in range(40):
+            rings.append(make_bar(i))
+        rings.append(make_bar(0, timeframe='1min'))  # Not a ring timeframe: ignored
+        self.assertIsNone(open_bar_ring('THYAO', '1min', self.dir))
+
+        bars = read_ring_bars('THYAO', '1s', 20, directory=self.dir)
+        self.assertEqual(bars['close'].tolist(), list(map(float, range(20, 40))))
+        self.assertIsNone(read_ring_bars('THYAO', '1s', 60, directory=self.dir))
+        self.assertIsNone(read_ring_bars('GARAN', '1s', 10, directory=self.dir))
+        rings.close()
+
+if __name__ == '__main__':
+    unittest.main()
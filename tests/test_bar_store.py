@@ -0,0 +1,193 @@
+import unittest
+import sys
+import os
+import tempfile
+from datetime import datetime, timedelta
+from unittest import mock
+
+# Resolve project root
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+# Keep the test away from the real market database
+os.environ.setdefault('BIST_DB_PATH', os.path.join(tempfile.mkdtemp(), 'test_market.db'))
+
+import numpy as np
+from sqlalchemy import create_engine, text
+from core.database import Base, OHLCVBar, TickData
+import pandas as pd
+from core.bar_builder import (BIST_SESSION, BarBuilder, _resample_ticks_many_pandas, _resample_ticks_pandas,
+                               bucket_width_ns, resample_ticks, resample_ticks_many, split_panel)
+from core.bar_store import backfill_bars, fetch_bars, fetch_bars_many
+from core.tick_store import TickStore
+from core.tick_writer import TickWriter
+from integration.matriks_bridge import socket_server
+
+START = datetime(2025, 1, 2, 10, 0, 0)
+
+def make_ticks(n=600, seed=3):
+    rng = np.random.default_rng(seed)
+    ticks = []
+    for i in range(n):
+        ts = START + timedelta(milliseconds=int(i * 997))
+        ticks.append(('THYAO', round(250 + rng.normal(), 2), float(rng.integers(1, 50)), ts))
+    return ticks
+
+class TestBarStore(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bars.db')}")
+        Base.metadata.create_all(self.engine)
+        self.writer = TickWriter(engine=self.engine, flush_interval_ms=10).start()
+
+    def tearDown(self):
+        self.writer.close()
+        self.engine.dispose()
+
+    def stored(self, timeframe):
+        with self.engine.connect() as conn:
+            return conn.execute(text(
+                "SELECT start, open, high, low, close, volume, tick_count FROM ohlcv_bars "
+                "WHERE timeframe = :tf ORDER BY start"
+            ), {'tf': timeframe}).all()
+
+    def test_incremental_bars_match_backfill(self):
+        builder = BarBuilder()
+        for sym, price, vol, ts in make_ticks():
+            self.writer.submit({'symbol': sym, 'price': price, 'volume': vol, 'timestamp': ts, 'source': 'test'})
+            for bar in builder.update(sym, price, vol, ts):
+                self.writer.submit(bar, table=OHLCVBar.__table__)
+        for bar in builder.open_bars():
+            self.writer.submit(bar, table=OHLCVBar.__table__)
+        self.writer.flush()
+        incremental = {tf: self.stored(tf) for tf in ('1s', '1min', '5min')}
+        self.assertEqual(len(incremental['1min']), 10)
+
+        with self.engine.begin() as conn:
+            conn.execute(text("DELETE FROM ohlcv_bars"))
+        written = backfill_bars(start=START, end=START + timedelta(hours=1), symbols=['THYAO'],
+                                store=TickStore(engine=self.engine, archive_dir=None), engine=self.engine)
+        self.assertEqual(written['5min'], 2)
+        for tf in ('1s', '1min', '5min'):
+            self.assertEqual(self.stored(tf), incremental[tf])
+
+    def test_partial_bars_of_one_bucket_merge(self):
+        first = {'symbol': 'THYAO', 'timeframe': '1min', 'start': START,
+                 'open': 10.0, 'high': 12.0, 'low': 9.0, 'close': 11.0, 'volume': 5.0, 'tick_count': 3}
+        rest = dict(first, open=11.5, high=11.5, low=8.0, close=10.5, volume=2.0, tick_count=2)
+        self.writer.submit(first, table=OHLCVBar.__table__)
+        self.writer.flush()
+        self.writer.submit(rest, table=OHLCVBar.__table__)
+        self.writer.flush()
+        self.assertEqual(self.stored('1min'), [(START.isoformat(sep=' ') + '.000000', 10.0, 12.0, 8.0, 10.5, 7.0, 5)])
+
+        bars = fetch_bars('THYAO', '1min', engine=self.engine)
+        self.assertEqual(bars.index[0], START)
+        self.assertEqual(list(bars.columns), ['open', 'high', 'low', 'close', 'volume'])
+
+    def test_batched_reads_match_per_symbol(self):
+        ticks = pd.DataFrame([t for t in make_ticks(300)] + [('GARAN', p, v, ts) for _, p, v, ts in make_ticks(200, seed=4)],
+                             columns=['symbol', 'price', 'volume', 'timestamp'])
+        panel = resample_ticks_many(ticks, '1min')
+        for sym, group in ticks.groupby('symbol'):
+            single = resample_ticks(group[['timestamp', 'price', 'volume']], '1min')
+            self.assertEqual(panel.loc[sym].values.tolist(), single.values.tolist())
+            self.assertEqual(list(panel.loc[sym].index), list(single.index))
+
+        with self.engine.begin() as conn:
+            conn.execute(TickData.__table__.insert(), ticks.assign(source='test').to_dict('records'))
+        backfill_bars(start=START, end=START + timedelta(hours=1), symbols=['THYAO', 'GARAN'],
+                      store=TickStore(engine=self.engine, archive_dir=None), engine=self.engine)
+        many = fetch_bars_many(['THYAO', 'AKBNK', 'GARAN'], '1s', limit=50, engine=self.engine)
+        self.assertEqual(list(many), ['THYAO', 'GARAN'])
+        for sym, bars in many.items():
+            single = fetch_bars(sym, '1s', limit=50, engine=self.engine)
+            self.assertEqual(len(bars), 50)
+            self.assertTrue(bars.equals(single))
+
+    def test_ingest_path_queues_closed_bars(self):
+        submitted = []
+
+        class FakeWriter:
+            def submit(self, row, table=None):
+                submitted.append((table.name if table is not None else 'tick_data', row))
+
+        with mock.patch.object(socket_server, 'get_tick_writer', FakeWriter), \
+             mock.patch.object(socket_server, 'get_tick_bus', lambda: None), \
+             mock.patch.object(socket_server, '_bar_builder', None):
+            socket_server.save_to_db({'symbol': 'GARAN', 'price': 80.0, 'volume': 1, 'timestamp': '2025-01-02T10:00:00'})
+            socket_server.save_to_db({'symbol': 'GARAN', 'price': 81.0, 'volume': 1, 'timestamp': '2025-01-02T10:00:01'})
+            socket_server.flush_open_bars()
+
+        tables = [t for t, _ in submitted]
+        self.assertEqual(tables.count('tick_data'), 2)
+        bars = [row for t, row in submitted if t == 'ohlcv_bars']
+        # One closed 1s bar, then the open 1s/1min/5min bars on shutdown
+        self.assertEqual(sorted(b['timeframe'] for b in bars), ['1min', '1s', '1s', '5min'])
+        self.assertEqual(bars[0]['close'], 80.0)
+
+def random_ticks(n=5000, days=3, seed=8):
+    """Ticks over several days with gaps, duplicate timestamps and a few NaN volumes, sorted by time."""
+    rng = np.random.default_rng(seed)
+    offsets = np.sort(rng.integers(0, days * 86_400_000, n))
+    ts = pd.to_datetime(np.datetime64(START.date()) + offsets.astype('timedelta64[ms]'))
+    volume = rng.integers(1, 500, n).astype(float)
+    volume[rng.choice(n, 10, replace=False)] = np.nan
+    return pd.DataFrame({'timestamp': ts, 'price': np.round(100 + np.cumsum(rng.normal(0, 0.1, n)), 2),
+                         'volume': volume, 'symbol': rng.choice(['THYAO', 'GARAN', 'AKBNK'], n)})
+
+class TestResample(unittest.TestCase):
+
+    def setUp(self):
+        self.ticks = random_ticks()
+        # A few ticks without a price: they still count for volume
+        self.ticks.loc[self.ticks.sample(20, random_state=2).index, 'price'] = np.nan
+
+    def test_matches_pandas_resample(self):
+        ticks = self.ticks[['timestamp', 'price', 'volume']]
+        for timeframe in ('1s', '1min', '7min', '5min', '1h'):
+            for tick_count in (False, True):
+                expected = _resample_ticks_pandas(ticks.set_index('timestamp'), timeframe, tick_count)
+                pd.testing.assert_frame_equal(resample_ticks(ticks, timeframe, tick_count), expected, check_freq=False)
+        # Unsorted input is sorted stably first; calendar timeframes fall back to pandas
+        shuffled = ticks.sample(frac=1, random_state=1)
+        pd.testing.assert_frame_equal(resample_ticks(shuffled, '1min'),
+                                      _resample_ticks_pandas(shuffled.set_index('timestamp'), '1min'), check_freq=False)
+        pd.testing.assert_frame_equal(resample_ticks(ticks, '1D'), _resample_ticks_pandas(ticks.set_index('timestamp'), '1D'))
+        self.assertTrue(resample_ticks(ticks.head(0), '1min').empty)
+
+    def test_many_matches_groupby(self):
+        for timeframe in ('1s', '1min', '7min'):
+            ticks = self.ticks.sort_values(['symbol', 'timestamp'], kind='stable')
+            expected = _resample_ticks_many_pandas(ticks, timeframe)
+            pd.testing.assert_frame_equal(resample_ticks_many(ticks, timeframe), expected)
+            pd.testing.assert_frame_equal(resample_ticks_many(self.ticks, timeframe), expected)
+
+    def test_single_and_many_share_the_grid(self):
+        many = split_panel(resample_ticks_many(self.ticks, '7min'))
+        for symbol, ticks in self.ticks.groupby('symbol'):
+            pd.testing.assert_frame_equal(resample_ticks(ticks[['timestamp', 'price', 'volume']], '7min'),
+                                          many[symbol], check_freq=False)
+
+    def test_session_buckets(self):
+        day = START.date()
+        ts = pd.to_datetime([f"{day} {t}" for t in ('09:50:00', '10:00:00', '10:44:59', '10:45:00',
+                                                    '17:59:00', '18:05:00', '18:09:59', '18:10:00')])
+        ticks = pd.DataFrame({'timestamp': ts, 'price': np.arange(1.0, 9.0), 'volume': 1.0})
+        bars = resample_ticks(ticks, '45min', tick_count=True, session=BIST_SESSION)
+        # Grid from the 10:00 open; 17:30-18:15 is cut at the 18:10 close; pre-open and 18:10 ticks dropped
+        self.assertEqual([str(t.time()) for t in bars.index], ['10:00:00', '10:45:00', '17:30:00'])
+        self.assertEqual(bars['tick_count'].tolist(), [2, 1, 3])
+        self.assertEqual(bars.loc[bars.index[-1], ['open', 'close']].tolist(), [5.0, 7.0])
+
+    def test_bucket_widths(self):
+        self.assertEqual(bucket_width_ns('90s'), 90 * 10**9)
+        self.assertEqual(bucket_width_ns(timedelta(minutes=7)), 420 * 10**9)
+        for timeframe in ('1D', '1W', 'nonsense'):
+            with self.assertRaises(ValueError):
+                bucket_width_ns(timeframe)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import sys
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+# Resolve project root
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+# Keep the test away from the real market database
+os.environ.setdefault('BIST_DB_PATH', os.path.join(tempfile.mkdtemp(), 'test_market.db'))
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from sqlalchemy import create_engine, inspect, text
+from core.database import Base, TickData
+from core.bulk_loader import bulk_load
+from core.tick_store import TickStore
+
+START = datetime(2025, 1, 2, 10, 0, 0)
+
+def make_frame(n=100, symbol='THYAO'):
+    return pd.DataFrame({
+        'symbol': symbol,
+        'price': 100.0 + np.arange(n) * 0.01,
+        'volume': np.arange(n, dtype=float),
+        'timestamp': pd.Timestamp(START) + pd.to_timedelta(np.arange(n), unit='s'),
+        'source': 'Synthetic',
+    })
+
+class TestBulkLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bulk.db')}")
+        Base.metadata.create_all(self.engine)
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def rows(self, sql="SELECT symbol, price, volume, timestamp, source FROM tick_data ORDER BY id"):
+        with self.engine.connect() as conn:
+            return conn.execute(text(sql)).all()
+
+    def test_rows_match_orm_inserts(self):
+        df = make_frame(3)
+        df.loc[1, 'volume'] = np.nan
+        res = bulk_load(df, engine=self.engine)
+        self.assertEqual((res['rows'], res['inserted']), (3, 3))
+        loaded = self.rows()
+
+        with self.engine.begin() as conn:
+            conn.execute(text("DELETE FROM tick_data"))
+            conn.execute(TickData.__table__.insert(), [
+                {k: (None if k == 'volume' and pd.isna(v) else v) for k, v in row.items()}
+                for row in df.assign(timestamp=df['timestamp'].dt.to_pydatetime()).to_dict('records')
+            ])
+        self.assertEqual(loaded, self.rows())
+        self.assertIsNone(loaded[1][2])
+        # Defaults of missing columns are filled in
+        self.assertIsNotNone(self.rows("SELECT received_at FROM tick_data")[0][0])
+
+    def test_input_formats_and_dedup(self):
+        df = make_frame(50)
+        bulk_load(pa.Table.from_pandas(df.iloc[:20]), engine=self.engine)
+        arrays = {c: df[c].to_numpy() for c in ('price', 'volume', 'timestamp')}
+        res = bulk_load(dict(arrays, symbol='THYAO', source='Synthetic'), engine=self.engine, batch_size=7)
+        self.assertEqual((res['rows'], res['inserted']), (50, 30))
+
+        ticks = TickStore(engine=self.engine, archive_dir=None).query('THYAO', start=START + timedelta(seconds=10))
+        self.assertEqual(len(ticks), 40)
+        self.assertEqual(ticks['timestamp'].iloc[0], START + timedelta(seconds=10))
+
+        with self.assertRaises(ValueError):
+            bulk_load({'bogus': [1]}, engine=self.engine)
+
+    def test_drop_indexes_rebuilds_them(self):
+        before = {i['name'] for i in inspect(self.engine).get_indexes('tick_data')}
+        res = bulk_load(make_frame(200), engine=self.engine, drop_indexes=True)
+        self.assertEqual(res['inserted'], 200)
+        self.assertEqual({i['name'] for i in inspect(self.engine).get_indexes('tick_data')}, before)
+        # The unique index stayed in place, so duplicates are still skipped
+        self.assertEqual(bulk_load(make_frame(200), engine=self.engine, drop_indexes=True)['inserted'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import sys
+import os
+import tempfile
+from datetime import date, datetime, timedelta
+
+# Resolve project root
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+# Keep the test away from the real market database
+os.environ.setdefault('BIST_DB_PATH', os.path.join(tempfile.mkdtemp(), 'test_market.db'))
+
+import numpy as np
+from sqlalchemy import create_engine, text
+from core.database import Base, TickData
+from core.tick_store import TickStore
+from core.compact_ticks import (PRICE_SCALE, encode_prices, load_compact, load_compact_frame,
+                                migrate_tick_data, symbol_ids)
+
+DAYS = [date(2025, 1, 2), date(2025, 1, 3), date(2025, 1, 6)]
+
+class TestCompactTicks(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.tmp_dir, 'ticks.db')}")
+        Base.metadata.create_all(self.engine)
+        rows = []
+        for day in DAYS:
+            for sym in ('THYAO', 'GARAN'):
+                for i in range(10):
+                    rows.append({'symbol': sym, 'price': 100.05 + i * 0.01, 'volume': float(i) if i else None,
+                                 'source': 'test', 'timestamp': datetime.combine(day, datetime.min.time())
+                                 + timedelta(hours=10, seconds=i, microseconds=250)})
+        with self.engine.begin() as conn:
+            conn.execute(TickData.__table__.insert(), rows)
+        self.store = TickStore(engine=self.engine, archive_dir=os.path.join(self.tmp_dir, 'archive'))
+        # Hot table, an in-database partition and an archived one
+        self.store.roll(before=DAYS[-1])
+        self.store.apply_retention(hot_days=2, keep_days=None, today=DAYS[-1])
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def test_migration_round_trip(self):
+        res = migrate_tick_data(store=self.store, engine=self.engine, batch_size=7)
+        self.assertEqual(res['rows_read'], 60)
+        self.assertEqual(res['rows_written'], 60)
+        self.assertEqual(res['tables'], ['tick_data', 'tick_data_20250103', 'tick_data_20250102'])
+        # Re-running skips what is already there
+        self.assertEqual(migrate_tick_data(store=self.store, engine=self.engine)['rows_written'], 0)
+
+        expected = self.store.query('THYAO')
+        ticks = load_compact('THYAO', engine=self.engine)
+        self.assertEqual(len(ticks), 30)
+        self.assertTrue(np.array_equal(ticks['ts'], expected['timestamp'].to_numpy().astype('datetime64[ns]').view(np.int64)))
+        np.testing.assert_allclose(ticks['price'], expected['price'], rtol=0, atol=0.5 / PRICE_SCALE)
+        self.assertEqual(ticks['volume'].tolist(), expected['volume'].fillna(0.0).tolist())
+
+        with self.engine.connect() as conn:
+            stored = conn.execute(text("SELECT price FROM ticks_compact LIMIT 1")).scalar()
+        self.assertIsInstance(stored, int)
+
+    def test_loaders_filter_without_strings(self):
+        migrate_tick_data(store=self.store, engine=self.engine)
+        window = load_compact(['THYAO', 'GARAN'], start=datetime(2025, 1, 3), end=datetime(2025, 1, 4), engine=self.engine)
+        self.assertEqual(len(window), 20)
+        self.assertEqual(window.dtype.names, ('symbol_id', 'ts', 'price', 'volume'))
+        self.assertEqual(len(load_compact('AKBNK', engine=self.engine)), 0)
+
+        frame = load_compact_frame('GARAN', start=datetime(2025, 1, 6), engine=self.engine)
+        self.assertEqual(list(frame.columns), ['symbol', 'timestamp', 'price', 'volume'])
+        self.assertEqual(set(frame['symbol']), {'GARAN'})
+        self.assertEqual(frame['timestamp'].iloc[0], datetime(2025, 1, 6, 10, 0, 0, 250))
+        self.assertEqual(frame['timestamp'].dtype, np.dtype('datetime64[ns]'))
+
+    def test_symbol_dictionary(self):
+        ids = symbol_ids(['THYAO', 'GARAN'], engine=self.engine)
+        self.assertEqual(symbol_ids(['GARAN', 'THYAO'], engine=self.engine), ids)
+        self.assertEqual(symbol_ids(['AKBNK'], engine=self.engine, create=False), {})
+        # Symbols and sources are separate namespaces
+        self.assertNotIn('THYAO', symbol_ids(['test'], kind='source', engine=self.engine))
+        self.assertEqual(encode_prices([100.07, 0.00026]).tolist(), [1_000_700, 3])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import sys
+import os
+import tempfile
+from datetime import datetime
+
+# Resolve project root
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+# Keep the test away from the real market database
+os.environ.setdefault('BIST_DB_PATH', os.path.join(tempfile.mkdtemp(), 'test_market.db'))
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+from core.database import Base, TickData
+from core.feature_cache import FeatureCache
+from core.tick_store import TickStore
+
+def frame(n=100, value=1.0):
+    return pd.DataFrame({'close': np.full(n, value)}, index=pd.RangeIndex(n))
+
+class TestFeatureCache(unittest.TestCase):
+
+    def test_hits_and_misses(self):
+        cache = FeatureCache()
+        calls = []
+        compute = lambda: calls.append(1) or frame()
+        key = ('THYAO', '1min', 'set', 5000, (10, '2025-01-02 10:00:00'))
+        first = cache.get_or_compute(key, compute)
+        second = cache.get_or_compute(key, compute)
+        pd.testing.assert_frame_equal(first, second)
+        self.assertEqual(len(calls), 1)
+        # A new tick is a new key
+        cache.get_or_compute(key[:4] + ((11, '2025-01-02 10:00:01'),), compute)
+        self.assertEqual(len(calls), 2)
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 2, 2))
+        self.assertAlmostEqual(stats['hit_rate'], 1 / 3)
+
+    def test_copies_are_independent(self):
+        cache = FeatureCache()
+        cache.put('k', frame())
+        out = cache.get('k')
+        out['RSI_14'] = 50.0
+        self.assertEqual(list(cache.get('k').columns), ['close'])
+
+    def test_empty_frames_are_not_cached(self):
+        cache = FeatureCache()
+        cache.get_or_compute('k', pd.DataFrame)
+        self.assertEqual(len(cache), 0)
+
+    def test_lru_eviction(self):
+        cache = FeatureCache(max_entries=2)
+        cache.put('a', frame())
+        cache.put('b', frame())
+        cache.get('a')
+        cache.put('c', frame())
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+        size = frame().memory_usage(index=True).sum()
+        cache = FeatureCache(max_bytes=int(2.5 * size))
+        for key in 'abc':
+            cache.put(key, frame())
+        self.assertEqual(len(cache), 2)
+        self.assertLessEqual(cache.stats()['bytes'], cache.max_bytes)
+        # Larger than the whole budget: not stored
+        cache.put('huge', frame(1000))
+        self.assertIsNone(cache.get('huge'))
+
+    def test_invalidate(self):
+        cache = FeatureCache()
+        cache.put(('THYAO', '1min'), frame())
+        cache.put(('GARAN', '1min'), frame())
+        cache.invalidate('THYAO')
+        self.assertIsNone(cache.get(('THYAO', '1min')))
+        self.assertIsNotNone(cache.get(('GARAN', '1min')))
+        cache.invalidate()
+        self.assertEqual(cache.stats()['bytes'], 0)
+
+class TestNewestTick(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.tmp_dir, 'ticks.db')}")
+        Base.metadata.create_all(self.engine)
+        self.store = TickStore(engine=self.engine, archive_dir=os.path.join(self.tmp_dir, 'archive'))
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def insert(self, symbol, second):
+        with self.engine.begin() as conn:
+            conn.execute(TickData.__table__.insert(), [{'symbol': symbol, 'price': 100.0, 'volume': 1.0, 'source': 'test',
+                                                        'timestamp': datetime(2025, 1, 2, 10, 0, second)}])
+
+    def test_version_changes_with_new_ticks(self):
+        self.insert('THYAO', 0)
+        before = self.store.newest(['THYAO', 'GARAN'])
+        self.assertIsNone(before['GARAN'])
+        self.assertEqual(self.store.newest('THYAO'), {'THYAO': before['THYAO']})
+        self.insert('THYAO', 1)
+        self.assertNotEqual(self.store.newest('THYAO')['THYAO'], before['THYAO'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import sys
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+# Resolve project root
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+# Keep the test away from the real market database
+os.environ.setdefault('BIST_DB_PATH', os.path.join(tempfile.mkdtemp(), 'test_market.db'))
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+from core.database import Base, TickData
+from core.feature_registry import FeatureRegistry
+from core.tick_store import TickStore
+from core.bar_builder import resample_ticks
+from tests.test_streaming_indicators import make_bars, ref_bbands, ref_ema, ref_indicators, ref_macd, ref_rsi
+
+def reference_registry():
+    """The add_indicators() set with pandas_ta's formulas and core.feature_engine's declared warm-ups."""
+    registry = FeatureRegistry()
+    registry.register('rsi_14', ['RSI_14'], warmup=14)(lambda bars: ref_rsi(bars['close']))
+    registry.register('sma_50', ['SMA_50'], warmup=49)(lambda bars: bars['close'].rolling(50).mean())
+    registry.register('ema_200', ['EMA_200'], warmup=199)(lambda bars: ref_ema(bars['close'], 200))
+    registry.register('macd_12_26_9', ['MACD_12_26_9', 'MACDh_12_26_9', 'MACDs_12_26_9'],
+                      warmup=33)(lambda bars: np.column_stack(ref_macd(bars['close'])))
+    registry.register('bbands_20_2', ['BBL_20_2.0', 'BBM_20_2.0', 'BBU_20_2.0', 'BBB_20_2.0', 'BBP_20_2.0'],
+                      warmup=19)(lambda bars: np.column_stack(ref_bbands(bars['close'])))
+    return registry
+
+class TestFeatureRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = reference_registry()
+        self.bars = make_bars(600)
+
+    def test_declared_warm_ups_are_exact(self):
+        for indicator in self.registry.select():
+            values = np.asarray(indicator.compute(self.bars), dtype=np.float64).reshape(len(self.bars), -1)
+            first_complete = np.flatnonzero(~np.isnan(values).any(axis=1))[0]
+            self.assertEqual(first_complete, indicator.warmup, indicator.name)
+        self.assertEqual(self.registry.warmup(), 199)
+        self.assertEqual(self.registry.warmup(['rsi_14', 'macd_12_26_9']), 33)
+
+    def test_bars_needed_gives_the_requested_rows(self):
+        for rows in (1, 60):
+            bars = self.bars.tail(self.registry.bars_needed(rows))
+            self.assertEqual(len(self.registry.compute(bars)), rows)
+            # One bar fewer is one row short
+            self.assertEqual(len(self.registry.compute(bars.iloc[1:])), rows - 1)
+
+    def test_compute_matches_add_indicators_columns(self):
+        pd.testing.assert_frame_equal(self.registry.compute(self.bars), ref_indicators(self.bars), check_freq=False)
+        self.assertEqual(list(self.bars.columns), ['open', 'high', 'low', 'close', 'volume'])
+
+    def test_plug_in_indicator(self):
+        self.registry.register('range_5', ['RANGE_5'], warmup=4)(
+            lambda bars: (bars['high'] - bars['low']).rolling(5).mean())
+        self.assertEqual(self.registry.columns()[-1], 'RANGE_5')
+        self.assertIn('RANGE_5', self.registry.compute(self.bars).columns)
+        self.assertEqual(len(self.registry.compute(self.bars.head(30), ['range_5'])), 26)
+        signature = self.registry.signature()
+        self.registry.unregister('range_5')
+        self.assertNotEqual(self.registry.signature(), signature)
+
+    def test_failing_indicator_leaves_no_rows(self):
+        self.registry.register('broken', ['BROKEN'], warmup=0)(lambda bars: None)
+        self.assertTrue(self.registry.compute(self.bars).empty)
+        with self.assertRaises(KeyError):
+            self.registry.select(['missing'])
+
+class TestLatestBars(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.tmp_dir, 'ticks.db')}")
+        Base.metadata.create_all(self.engine)
+        rng = np.random.default_rng(3)
+        start = datetime(2025, 1, 2, 10)
+        rows = []
+        # THYAO: dense (~10 ticks per second), GARAN: sparse (one tick every 7 s), ASELS: 30 ticks
+        for symbol, step, n in (('THYAO', 0.1, 4000), ('GARAN', 7.0, 900), ('ASELS', 1.0, 30)):
+            for i in range(n):
+                rows.append({'symbol': symbol, 'price': 100 + float(rng.normal()), 'volume': 1.0, 'source': 'test',
+                             'timestamp': start + timedelta(seconds=round(i * step, 1))})
+        with self.engine.begin() as conn:
+            conn.execute(TickData.__table__.insert(), rows)
+        self.store = TickStore(engine=self.engine, archive_dir=os.path.join(self.tmp_dir, 'archive'))
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def test_exact_bar_count(self):
+        bars = self.store.latest_bars(['THYAO', 'GARAN', 'ASELS', 'KCHOL'], '1s', 259)
+        self.assertEqual(sorted(bars), ['ASELS', 'GARAN', 'THYAO'])
+        self.assertEqual(len(bars['THYAO']), 259)
+        self.assertEqual(len(bars['GARAN']), 259)
+        self.assertEqual(len(bars['ASELS']), 30)
+        # Same bars as resampling the whole history
+        for symbol in ('THYAO', 'GARAN'):
+            full = resample_ticks(self.store.latest(symbol, limit=10_000)[['timestamp', 'price', 'volume']], '1s')
+            pd.testing.assert_frame_equal(bars[symbol], full.tail(259), check_freq=False, check_names=False)
+
+if __name__ == '__main__':
+    unittest.main()
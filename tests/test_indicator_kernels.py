@@ -0,0 +1,78 @@
+import unittest
+import sys
+import os
+
+# Resolve project root
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+import numpy as np
+import pandas as pd
+
+from core import indicator_kernels as kernels
+from tests.test_streaming_indicators import make_bars, ref_bbands, ref_ema, ref_macd, ref_rsi
+
+class TestIndicatorKernels(unittest.TestCase):
+
+    def setUp(self):
+        self.close = make_bars(3000, seed=9)['close']
+
+    def assert_identical(self, actual, expected):
+        np.testing.assert_array_equal(np.asarray(actual, dtype=np.float64), np.asarray(expected, dtype=np.float64))
+
+    def test_match_pandas_ta_formulas(self):
+        close = self.close
+        self.assert_identical(kernels.rsi(close, 14), ref_rsi(close, 14))
+        self.assert_identical(kernels.sma(close, 50), close.rolling(50).mean())
+        for length in (9, 12, 26, 200):
+            self.assert_identical(kernels.ema(close, length), ref_ema(close, length))
+        for actual, expected in zip(kernels.macd(close, 12, 26, 9), ref_macd(close)):
+            self.assert_identical(actual, expected)
+        for actual, expected in zip(kernels.bbands(close, 20, 2.0), ref_bbands(close)):
+            self.assert_identical(actual, expected)
+
+    def test_short_input(self):
+        close = self.close.head(30)
+        self.assertTrue(np.isnan(kernels.ema(close, 200)).all())
+        self.assertTrue(np.isnan(kernels.macd(close, 12, 26, 9)[2]).all())
+        self.assert_identical(kernels.sma(close, 50), np.full(30, np.nan))
+        self.assertEqual(len(kernels.rsi(np.array([]), 14)), 0)
+
+    def test_flat_prices(self):
+        close = self.close.copy()
+        close.iloc[300:340] = close.iloc[300]
+        lower, mid, upper, _, _ = kernels.bbands(close, 20, 2.0)
+        expected = ref_bbands(close)
+        # pandas 3 leaves ~1e-12 of variance in flat windows; the kernels return 0 like pandas < 3
+        np.testing.assert_allclose(np.column_stack([lower, mid, upper]), np.column_stack(expected[:3]), rtol=0, atol=1e-5)
+        self.assertEqual(lower[330], upper[330])
+        self.assert_identical(kernels.rsi(close, 14), ref_rsi(close, 14))
+
+    def test_match_pandas_ta(self):
+        # Needs pandas_ta (requirements.txt); talib=False as in core.feature_engine
+        import pandas_ta
+
+        close = self.close
+        self.assert_identical(kernels.rsi(close, 14), pandas_ta.rsi(close, length=14, talib=False))
+        self.assert_identical(kernels.sma(close, 50), pandas_ta.sma(close, length=50, talib=False))
+        self.assert_identical(kernels.ema(close, 200), pandas_ta.ema(close, length=200, talib=False))
+        self.assert_identical(np.column_stack(kernels.macd(close, 12, 26, 9)), pandas_ta.macd(close, 12, 26, 9, talib=False))
+        self.assert_identical(np.column_stack(kernels.bbands(close, 20, 2.0)), pandas_ta.bbands(close, 20, 2.0, talib=False))
+
+    def test_numba_backend(self):
+        from core import feature_engine
+
+        bars = make_bars(1200)
+        expected = feature_engine.add_indicators(bars)
+        feature_engine.set_indicator_backend('numba')
+        try:
+            pd.testing.assert_frame_equal(feature_engine.add_indicators(bars), expected, check_exact=True)
+        finally:
+            feature_engine.set_indicator_backend('pandas_ta')
+        with self.assertRaises(ValueError):
+            feature_engine.set_indicator_backend('talib')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import sys
+import os
+from datetime import datetime
+
+# Resolve project root
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from integration.matriks_bridge.mock_data_feeder import RandomWalk, BurstSchedule, price_step, snap_price
+
+class TestRandomWalk(unittest.TestCase):
+
+    def test_prices_stay_on_bist_grid(self):
+        walk = RandomWalk(['THYAO', 'GARAN', 'SASA'], seed=7)
+        for sym, price, volume, ts in walk.ticks(5000, datetime(2025, 1, 2, 10)):
+            step = price_step(price)
+            self.assertGreater(price, 0)
+            self.assertAlmostEqual(price / step, round(price / step), places=6)
+            self.assertGreaterEqual(volume, 1)
+
+    def test_walk_is_per_symbol_and_deterministic(self):
+        a = RandomWalk(['THYAO', 'GARAN'], seed=1).ticks(100, None)
+        b = RandomWalk(['THYAO', 'GARAN'], seed=1).ticks(100, None)
+        self.assertEqual(a, b)
+
+        # Consecutive prints of one symbol move by a few steps, not a fresh uniform draw
+        thyao = [p for s, p, _, _ in a if s == 'THYAO']
+        jumps = [abs(x - y) / price_step(y) for x, y in zip(thyao[1:], thyao)]
+        self.assertLess(max(jumps), 20)
+
+    def test_snap_price(self):
+        self.assertEqual(snap_price(19.994), 19.99)
+        self.assertEqual(snap_price(123.47), 123.5)
+
+class TestBurstSchedule(unittest.TestCase):
+
+    def test_open_and_periodic_bursts(self):
+        schedule = BurstSchedule(1000, factor=3, duration=2, every=10)
+        self.assertEqual(schedule.rate_at(0.5), 3000)
+        self.assertEqual(schedule.rate_at(5), 1000)
+        self.assertEqual(schedule.rate_at(11), 3000)
+        self.assertEqual(schedule.scaled(0.25).rate_at(11), 750)
+
+        open_only = BurstSchedule(1000, factor=3, duration=2)
+        self.assertEqual(open_only.rate_at(1), 3000)
+        self.assertEqual(open_only.rate_at(11), 1000)
+
+if __name__ == '__main__':
+    unittest.main()
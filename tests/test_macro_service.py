@@ -0,0 +1,86 @@
+import unittest
+import sys
+import os
+import tempfile
+from datetime import datetime
+
+# Resolve project root
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+# Keep the test away from the real market database
+os.environ.setdefault('BIST_DB_PATH', os.path.join(tempfile.mkdtemp(), 'test_market.db'))
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+from core.database import Base, FundFlow, MacroData
+from core.macro_service import MacroService
+
+class TestMacroService(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'macro.db')}")
+        Base.metadata.create_all(self.engine)
+        self.insert(MacroData, [
+            {'indicator_name': 'inflation_cpi', 'value': 61.0, 'frequency': 'M', 'timestamp': datetime(2025, 1, 3)},
+            {'indicator_name': 'usd_try', 'value': 35.2, 'frequency': 'D', 'timestamp': datetime(2025, 1, 2, 18)},
+            {'indicator_name': 'usd_try', 'value': 35.4, 'frequency': 'D', 'timestamp': datetime(2025, 1, 3, 18)},
+        ])
+        self.insert(FundFlow, [
+            {'fund_code': 'MAC', 'stock_allocation_pct': 80.0, 'total_value': 1e9, 'date': datetime(2025, 1, 2)},
+            {'fund_code': 'TI2', 'stock_allocation_pct': 60.0, 'total_value': 1e9, 'date': datetime(2025, 1, 3)},
+        ])
+        self.service = MacroService(engine=self.engine, check_interval=0)
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def insert(self, model, rows):
+        with self.engine.begin() as conn:
+            conn.execute(model.__table__.insert(), rows)
+
+    def test_asof_matches_merge_asof(self):
+        bars = pd.DataFrame({'close': np.arange(6.0)},
+                            index=pd.date_range('2025-01-02 10:00', periods=6, freq='12h', name='timestamp'))
+        joined = self.service.join(bars)
+        self.assertEqual(list(joined.columns), ['close', 'fund_MAC_stock_pct', 'fund_TI2_stock_pct',
+                                                'inflation_cpi', 'usd_try', 'fund_stock_pct_mean'])
+
+        series = self.service.series().reset_index()
+        expected = pd.merge_asof(bars.reset_index(), series, on='timestamp', direction='backward').set_index('timestamp')
+        pd.testing.assert_frame_equal(joined, expected, check_freq=False)
+        # Before the first print a series is NaN; afterwards the last value holds
+        self.assertTrue(np.isnan(joined['usd_try'].iloc[0]))
+        self.assertEqual(joined['usd_try'].tolist()[1:], [35.2, 35.2, 35.4, 35.4, 35.4])
+        self.assertEqual(joined['fund_stock_pct_mean'].iloc[-1], 70.0)
+
+        self.assertEqual(list(self.service.asof(bars.index, columns=['usd_try', 'policy_rate']).columns),
+                         ['usd_try', 'policy_rate'])
+
+    def test_reloads_only_after_new_rows(self):
+        self.service.series()
+        self.service.series()
+        self.assertEqual(self.service.loads, 1)
+
+        self.insert(MacroData, [{'indicator_name': 'policy_rate', 'value': 47.5, 'frequency': 'W',
+                                 'timestamp': datetime(2025, 1, 4)}])
+        self.assertEqual(self.service.latest()['policy_rate'], 47.5)
+        self.assertEqual(self.service.loads, 2)
+
+        self.service.invalidate()
+        self.service.series()
+        self.assertEqual(self.service.loads, 3)
+
+    def test_empty_tables(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        service = MacroService(engine=engine)
+        bars = pd.DataFrame({'close': [1.0]}, index=pd.DatetimeIndex([datetime(2025, 1, 2)], name='timestamp'))
+        self.assertEqual(list(service.join(bars).columns), ['close'])
+        self.assertEqual(service.latest(), {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,7 +8,7 @@ project_root = os.path.dirname(current_dir)
 if project_root not in sys.path:
     sys.path.append(project_root)
 
-from core.orderflow import calculate_imbalance, calculate_weighted_imbalance
+from core.orderflow import calculate_imbalance, calculate_weighted_imbalance, pack_levels, unpack_levels
 
 class TestOrderFlow(unittest.TestCase):
     
@@ -44,5 +44,16 @@ class TestOrderFlow(unittest.TestCase):
         result = calculate_weighted_imbalance(bids, asks)
         self.assertGreater(result, 0.5)
 
+    def test_pack_levels_round_trip(self):
+        bids = [[100.5, 1000], [100.25, 10], [100.0, 5]]
+        blob = pack_levels(bids, depth=2)
+
+        # 2 levels x [price, qty] x float64
+        self.assertEqual(len(blob), 32)
+        levels = unpack_levels(blob)
+        self.assertEqual(levels.shape, (2, 2))
+        self.assertEqual(levels[0].tolist(), [100.5, 1000.0])
+        self.assertEqual(unpack_levels(pack_levels([])).shape, (0, 2))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import sys
+import os
+
+# Resolve project root
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+import numpy as np
+import pandas as pd
+
+from core import indicator_kernels as kernels
+from core.panel_features import FEATURE_COLUMNS, BarPanel, feature_frames, feature_tensor, panel_indicators
+from tests.test_streaming_indicators import make_bars, ref_indicators
+
+BBANDS_COLUMNS = ['BBL_20_2.0', 'BBM_20_2.0', 'BBU_20_2.0', 'BBB_20_2.0', 'BBP_20_2.0']
+
+def flat_tail_bars(seed, n=300, flat=25):
+    """make_bars() whose last `flat` closes repeat one price (an illiquid symbol)."""
+    bars = make_bars(n, seed=seed)
+    bars.iloc[-flat:, bars.columns.get_loc('close')] = bars['close'].iloc[-flat - 1]
+    return bars
+
+class TestPanelFeatures(unittest.TestCase):
+
+    def setUp(self):
+        self.frames = {f"S{i}": make_bars(n, seed=i) for i, n in enumerate([900, 600, 300, 250])}
+
+    def test_frames_match_per_symbol_indicators(self):
+        frames = feature_frames(BarPanel.from_frames(self.frames))
+        self.assertEqual(list(frames), list(self.frames))
+        for symbol, bars in self.frames.items():
+            expected = ref_indicators(bars)
+            expected.index = expected.index.as_unit('ns')
+            self.assertEqual(list(frames[symbol].columns), FEATURE_COLUMNS)
+            pd.testing.assert_frame_equal(frames[symbol], expected, check_freq=False, check_exact=False, rtol=1e-9)
+
+    def test_frames_match_add_indicators(self):
+        # Needs pandas_ta (requirements.txt); add_indicators() pins talib=False
+        from core.feature_engine import add_indicators
+
+        frames = feature_frames(BarPanel.from_frames(self.frames))
+        for symbol, bars in self.frames.items():
+            expected = add_indicators(bars.copy())
+            expected.index = expected.index.as_unit('ns')
+            pd.testing.assert_frame_equal(frames[symbol], expected, check_freq=False, check_exact=False, rtol=1e-9)
+
+    def test_flat_tail_bbands(self):
+        frames = {f"S{seed}": flat_tail_bars(seed) for seed in range(40)}
+        indicators = panel_indicators(BarPanel.from_frames(frames).values['close'])
+        for j, bars in enumerate(frames.values()):
+            expected = np.column_stack(kernels.bbands(bars['close'], 20, 2.0))
+            actual = np.column_stack([indicators[c][:, j] for c in BBANDS_COLUMNS])
+            # Windows of one repeated price have no width: exactly pandas' mid and %B = eps / eps
+            np.testing.assert_array_equal(actual[-6:], expected[-6:])
+            self.assertEqual(actual[-1, 4], 1.0)
+            # Near-flat windows divide by a tiny width, so %B/bandwidth keep less precision there
+            np.testing.assert_allclose(actual, expected, rtol=1e-6)
+
+    def test_flat_tail_matches_add_indicators(self):
+        # Needs pandas_ta (requirements.txt). Histories whose flat windows pandas
+        # itself reduces to exactly 0 variance (pandas 3 can leave ~1e-13 residue)
+        from core.feature_engine import add_indicators
+
+        for seed in (0, 4, 8):
+            bars = flat_tail_bars(seed)
+            frame = feature_frames(BarPanel.from_frames({'S': bars}))['S']
+            expected = add_indicators(bars.copy())
+            np.testing.assert_allclose(frame[BBANDS_COLUMNS].to_numpy(), expected[BBANDS_COLUMNS].to_numpy(), rtol=1e-6)
+            self.assertEqual(frame['BBP_20_2.0'].iloc[-1], 1.0)
+
+    def test_tensor_holds_complete_windows_only(self):
+        panel = BarPanel.from_frames(self.frames)
+        tensor, symbols = feature_tensor(panel, window=60)
+        # 250 bars leave 51 rows after the EMA_200/MACD warm-up
+        self.assertEqual(symbols, ['S0', 'S1', 'S2'])
+        self.assertEqual(tensor.shape, (3, 60, len(FEATURE_COLUMNS)))
+        self.assertEqual(tensor.dtype, np.float32)
+        for i, symbol in enumerate(symbols):
+            expected = ref_indicators(self.frames[symbol]).tail(60).to_numpy(np.float32)
+            np.testing.assert_allclose(tensor[i], expected, rtol=1e-6)
+
+        self.assertEqual(feature_tensor(BarPanel.from_frames({}), window=60)[0].shape, (0, 60, len(FEATURE_COLUMNS)))
+
+    def test_panel_alignment(self):
+        frames = dict(self.frames, EMPTY=pd.DataFrame())
+        frames['S3'] = frames['S3'].assign(tick_count=1)
+        panel = BarPanel.from_frames(frames, length=400)
+        self.assertEqual(panel.symbols, ['S0', 'S1', 'S2', 'S3'])
+        self.assertEqual(panel.lengths.tolist(), [400, 400, 300, 250])
+        close = panel.values['close']
+        self.assertEqual(close.shape, (400, 4))
+        # Right-aligned: the last row is every symbol's newest bar, short ones are padded on top
+        np.testing.assert_array_equal(close[-1], [f['close'].iloc[-1] for f in self.frames.values()])
+        self.assertTrue(np.isnan(close[:100, 2]).all() and not np.isnan(close[100:, 2]).any())
+        self.assertTrue(np.isnat(panel.timestamps[0, 3]))
+
+        indicators = panel_indicators(close)
+        self.assertEqual(indicators['EMA_200'].shape, (400, 4))
+        self.assertTrue(np.isnan(indicators['EMA_200'][:100 + 199, 2]).all())
+        self.assertFalse(np.isnan(indicators['EMA_200'][100 + 199, 2]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import sys
+import os
+import tempfile
+from datetime import date, datetime, timedelta
+
+# Resolve project root
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+# Keep the test away from the real market database
+os.environ.setdefault('BIST_DB_PATH', os.path.join(tempfile.mkdtemp(), 'test_market.db'))
+
+from sqlalchemy import create_engine
+from core.database import Base, TickData
+from core.tick_store import TickStore
+from core.parquet_archive import export_ticks, export_bars, load_ticks, load_bars, load_ohlcv
+
+DAYS = [date(2025, 1, 2), date(2025, 1, 3)]
+
+class TestParquetArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.root = os.path.join(self.tmp_dir, 'parquet')
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.tmp_dir, 'ticks.db')}")
+        Base.metadata.create_all(self.engine)
+        # 120 ticks per symbol and day, one every 2 seconds from 10:00
+        rows = []
+        for day in DAYS:
+            for sym in ('THYAO', 'GARAN'):
+                for i in range(120):
+                    rows.append({'symbol': sym, 'price': 100.0 + i % 7, 'volume': 1.0, 'source': 'test',
+                                 'timestamp': datetime.combine(day, datetime.min.time()) + timedelta(hours=10, seconds=2 * i)})
+        with self.engine.begin() as conn:
+            conn.execute(TickData.__table__.insert(), rows)
+        self.store = TickStore(engine=self.engine, archive_dir=None)
+        # Part of the history already lives in a day partition
+        self.store.roll(before=DAYS[1])
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def test_tick_round_trip_with_pushdown(self):
+        written = export_ticks(symbols=['THYAO', 'GARAN'], root=self.root, store=self.store)
+        self.assertEqual(written, {'THYAO': 240, 'GARAN': 240})
+        self.assertTrue(os.path.isdir(os.path.join(self.root, 'ticks', 'symbol=THYAO', 'date=2025-01-03')))
+
+        df = load_ticks('THYAO', start=datetime(2025, 1, 3, 10, 1), end=datetime(2025, 1, 3, 10, 2),
+                        columns=['timestamp', 'price'], root=self.root)
+        self.assertEqual(list(df.columns), ['timestamp', 'price'])
+        self.assertEqual(len(df), 30)
+        self.assertEqual(df['timestamp'].iloc[0], datetime(2025, 1, 3, 10, 1))
+        self.assertTrue(df['timestamp'].is_monotonic_increasing)
+
+        # Re-exporting a day replaces its files instead of appending
+        export_ticks(start=datetime(2025, 1, 3), symbols=['THYAO'], root=self.root, store=self.store)
+        self.assertEqual(len(load_ticks('THYAO', root=self.root)), 240)
+        self.assertEqual(len(load_ticks(root=self.root)), 480)
+
+    def test_bars_match_resampled_ticks(self):
+        export_ticks(symbols=['THYAO'], root=self.root, store=self.store)
+        from_ticks = load_ohlcv('THYAO', '1min', root=self.root)
+
+        export_bars('1min', symbols=['THYAO'], root=self.root, store=self.store)
+        from_bars = load_ohlcv('THYAO', '1min', root=self.root)
+        self.assertEqual(len(from_bars), 8)
+        self.assertEqual(from_bars.values.tolist(), from_ticks.values.tolist())
+        self.assertEqual(list(from_bars.index), list(from_ticks.index))
+
+        bars = load_bars(['THYAO'], '1min', start=datetime(2025, 1, 3), root=self.root)
+        self.assertEqual(len(bars), 4)
+        self.assertEqual(set(bars['symbol']), {'THYAO'})
+
+    def test_missing_archive(self):
+        self.assertTrue(load_ticks('THYAO', root=self.root).empty)
+        self.assertTrue(load_ohlcv('THYAO', root=self.root).empty)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import sys
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Resolve project root
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+# Keep the test away from the real market database
+os.environ.setdefault('BIST_DB_PATH', os.path.join(tempfile.mkdtemp(), 'test_market.db'))
+
+from sqlalchemy import create_engine
+from core.database import Base, TickData
+from integration.replay import load_ticks, TickReplayer, ListSink, find_max_speed
+
+START = datetime(2025, 1, 2, 10, 0, 0)
+
+class SlowSink(ListSink):
+    """Takes 1 ms per tick, so high speeds fall behind schedule."""
+
+    def send(self, ticks):
+        time.sleep(0.001 * len(ticks))
+        super().send(ticks)
+
+class TestReplay(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'ticks.db')}")
+        Base.metadata.create_all(self.engine)
+        rows = []
+        for i in range(200):
+            # Two symbols, 10 ms apart, inserted out of order
+            rows.append({'symbol': 'THYAO' if i % 2 else 'GARAN', 'price': 100.0 + i, 'volume': 1.0,
+                         'timestamp': START + timedelta(milliseconds=10 * (199 - i))})
+        rows.append({'symbol': 'THYAO', 'price': 1.0, 'volume': None, 'timestamp': START + timedelta(days=1)})
+        with self.engine.begin() as conn:
+            conn.execute(TickData.__table__.insert(), rows)
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def test_load_filters_and_orders(self):
+        df = load_ticks(START, START + timedelta(hours=1), ['THYAO'], engine=self.engine)
+        self.assertEqual(len(df), 100)
+        self.assertTrue(df['timestamp'].is_monotonic_increasing)
+        self.assertEqual(set(df['symbol']), {'THYAO'})
+
+        df = load_ticks(engine=self.engine)
+        self.assertEqual(len(df), 201)
+        self.assertEqual(df['volume'].iloc[-1], 0.0)
+
+    def test_archive_source(self):
+        df = load_ticks(engine=self.engine)
+        path = os.path.join(tempfile.mkdtemp(), 'ticks.csv')
+        df.iloc[::-1].to_csv(path, index=False)
+        again = load_ticks(START, START + timedelta(hours=1), archive=path)
+        self.assertEqual(again['price'].tolist(), df['price'].iloc[:200].tolist())
+
+    def test_replay_is_deterministic_and_keeps_timing(self):
+        ticks = load_ticks(START, START + timedelta(hours=1), engine=self.engine)
+
+        fast = ListSink()
+        TickReplayer(ticks, fast).run(speed=None)
+        paced = ListSink()
+        # 1.99s of market time at x10 -> ~0.2s
+        res = TickReplayer(ticks, paced).run(speed=10)
+
+        self.assertEqual(fast.ticks, paced.ticks)
+        self.assertEqual(fast.ticks[0], ('THYAO', 299.0, 1.0, START))
+        self.assertGreater(res['wall_s'], 0.18)
+        self.assertLess(res['wall_s'], 1.0)
+        self.assertAlmostEqual(res['speed'], 10, delta=1.5)
+
+    def test_find_max_speed_stops_when_sender_falls_behind(self):
+        ticks = load_ticks(START, START + timedelta(hours=1), engine=self.engine)
+        best, results = find_max_speed(TickReplayer(ticks, SlowSink()), trial_seconds=0.1,
+                                       settle_seconds=0, lag_limit=0.05, speeds=[1, 1000])
+        self.assertEqual(best, 1)
+        self.assertFalse(results[-1]['ok'])
+
+if __name__ == '__main__':
+    unittest.main()
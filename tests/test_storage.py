@@ -0,0 +1,128 @@
+import unittest
+import sys
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+# Resolve project root
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+# Keep the test away from the real market database
+os.environ.setdefault('BIST_DB_PATH', os.path.join(tempfile.mkdtemp(), 'test_market.db'))
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from core.database import get_engine, lock_stats, reset_lock_stats
+
+def insert_tick(conn, i):
+    conn.execute(text(
+        "INSERT INTO tick_data (symbol, price, volume, timestamp, source) VALUES ('TSTLK', :p, 1, :ts, 'test')"
+    ), {'p': 100.0 + i, 'ts': datetime(2025, 1, 2, 10, 0, 0, i)})
+
+def pragma(engine, name):
+    with engine.connect() as conn:
+        return conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+class TestStorageRoles(unittest.TestCase):
+
+    def setUp(self):
+        with get_engine('ingest').begin() as conn:
+            conn.execute(text("DELETE FROM tick_data WHERE symbol = 'TSTLK'"))
+        reset_lock_stats()
+
+    def test_connection_pragmas(self):
+        self.assertEqual(pragma(get_engine('ingest'), 'journal_mode'), 'wal')
+        self.assertEqual(pragma(get_engine('ingest'), 'synchronous'), 1)  # NORMAL
+        self.assertEqual(pragma(get_engine('analytics'), 'query_only'), 1)
+        self.assertGreater(pragma(get_engine('dashboard'), 'mmap_size'), 0)
+        self.assertEqual(pragma(get_engine('analytics'), 'cache_size'), -128 * 1024)
+
+    def test_readers_cannot_write(self):
+        with self.assertRaises(OperationalError):
+            with get_engine('analytics').begin() as conn:
+                insert_tick(conn, 0)
+        with self.assertRaises(ValueError):
+            get_engine('reporting')
+
+    def test_readers_are_not_blocked_by_open_write(self):
+        writer = get_engine('ingest').connect()
+        trans = writer.begin()
+        insert_tick(writer, 1)
+        try:
+            # The write lock is held; a reader still sees the last committed state immediately
+            started = time.perf_counter()
+            with get_engine('dashboard').connect() as conn:
+                n = conn.execute(text("SELECT COUNT(*) FROM tick_data WHERE symbol = 'TSTLK'")).scalar()
+            self.assertEqual(n, 0)
+            self.assertLess(time.perf_counter() - started, 1.0)
+        finally:
+            trans.commit()
+            writer.close()
+        with get_engine('dashboard').connect() as conn:
+            n = conn.execute(text("SELECT COUNT(*) FROM tick_data WHERE symbol = 'TSTLK'")).scalar()
+        self.assertEqual(n, 1)
+
+    def test_lock_wait_is_recorded(self):
+        held = threading.Event()
+
+        def hold_lock():
+            with get_engine('ingest').begin() as conn:
+                insert_tick(conn, 2)
+                held.set()
+                time.sleep(0.2)
+
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        held.wait(5)
+        with get_engine('ingest').begin() as conn:
+            insert_tick(conn, 3)
+        holder.join()
+
+        stats = lock_stats('ingest')
+        self.assertEqual(stats['transactions'], 2)
+        self.assertEqual(stats['contended'], 1)
+        self.assertGreater(stats['max_wait_ms'], 100)
+        self.assertEqual(stats['busy_errors'], 0)
+
+class TestLazyInit(unittest.TestCase):
+
+    def run_python(self, code, **extra_env):
+        # A fresh interpreter, so the import itself is what is being tested
+        db_path = os.path.join(tempfile.mkdtemp(), 'lazy.db')
+        env = dict(os.environ, BIST_DB_PATH=db_path)
+        env.pop('BIST_DB_READ_ONLY', None)
+        env.update(extra_env)
+        result = subprocess.run([sys.executable, '-c', f"import sys; sys.path.insert(0, {project_root!r}); {code}"],
+                                env=env, capture_output=True, text=True, timeout=60)
+        return result, db_path
+
+    def test_import_does_not_touch_database(self):
+        result, db_path = self.run_python("import core.database")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertFalse(os.path.exists(db_path))
+
+    def test_first_use_creates_schema(self):
+        result, db_path = self.run_python(
+            "from core.database import SessionLocal, TickData; "
+            "session = SessionLocal(); print(session.query(TickData).count())")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), '0')
+        self.assertTrue(os.path.exists(db_path))
+
+    def test_read_only_mode_refuses_writer(self):
+        result, db_path = self.run_python(
+            "from core.database import get_engine\n"
+            "try:\n    get_engine('ingest')\nexcept RuntimeError:\n    print('refused')",
+            BIST_DB_READ_ONLY='1')
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), 'refused')
+        self.assertFalse(os.path.exists(db_path))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import unittest
+import sys
+import os
+from datetime import datetime
+
+# Resolve project root
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+import numpy as np
+import pandas as pd
+
+from core.streaming_indicators import (BBands, EMA, INDICATOR_COLUMNS, IndicatorStream, IndicatorStreams,
+                                       MACD, RSI, SMA)
+
+def make_bars(n=1200, seed=5):
+    rng = np.random.default_rng(seed)
+    close = np.round(100 + np.cumsum(rng.normal(0, 0.3, n)), 2)
+    return pd.DataFrame({'open': close, 'high': close + 0.05, 'low': close - 0.05, 'close': close,
+                         'volume': rng.integers(1, 500, n).astype(float)},
+                        index=pd.date_range(datetime(2025, 1, 2, 10), periods=n, freq='1s', name='timestamp'))
+
+# pandas_ta 0.3.14b's own (talib=False) formulas, so parity is checked without it installed
+def ref_ema(close, length):
+    close = close.copy()
+    seed = close[0:length].mean()
+    close[:length - 1] = np.nan
+    close.iloc[length - 1] = seed
+    return close.ewm(span=length, adjust=False).mean()
+
+def ref_rsi(close, length=14):
+    negative = close.diff()
+    positive = negative.copy()
+    positive[positive < 0] = 0
+    negative[negative > 0] = 0
+    gains = positive.ewm(alpha=1 / length, min_periods=length).mean()
+    losses = negative.ewm(alpha=1 / length, min_periods=length).mean()
+    return 100 * gains / (gains + losses.abs())
+
+def ref_macd(close, fast=12, slow=26, signal=9):
+    macd = ref_ema(close, fast) - ref_ema(close, slow)
+    signal_ma = ref_ema(macd.loc[macd.first_valid_index():], signal).reindex(close.index)
+    return macd, macd - signal_ma, signal_ma
+
+def ref_bbands(close, length=20, std=2.0):
+    def non_zero_range(high, low):
+        diff = high - low
+        return diff + sys.float_info.epsilon if diff.eq(0).any() else diff
+    mid = close.rolling(length).mean()
+    deviations = std * close.rolling(length).var(0).apply(np.sqrt)
+    lower, upper = mid - deviations, mid + deviations
+    width = non_zero_range(upper, lower)
+    return lower, mid, upper, 100 * width / mid, non_zero_range(close, lower) / width
+
+def ref_indicators(bars):
+    close = bars['close']
+    columns = [ref_rsi(close), close.rolling(50).mean(), ref_ema(close, 200), *ref_macd(close), *ref_bbands(close)]
+    return pd.concat([bars] + [c.rename(name) for c, name in zip(columns, INDICATOR_COLUMNS)], axis=1).dropna()
+
+def stream(indicator, values):
+    return np.array([indicator.update(v) for v in values], dtype=np.float64)
+
+class TestStreamingIndicators(unittest.TestCase):
+
+    def setUp(self):
+        self.bars = make_bars()
+        self.close = self.bars['close']
+
+    def assert_identical(self, actual, expected):
+        np.testing.assert_array_equal(np.asarray(actual, dtype=np.float64), np.asarray(expected, dtype=np.float64))
+
+    def test_indicators_match_pandas_ta_formulas(self):
+        self.assert_identical(stream(RSI(14), self.close), ref_rsi(self.close))
+        self.assert_identical(stream(SMA(50), self.close), self.close.rolling(50).mean())
+        self.assert_identical(stream(EMA(200), self.close), ref_ema(self.close, 200))
+        macd = MACD(12, 26, 9)
+        self.assert_identical(np.array([macd.update(c) for c in self.close]), np.column_stack(ref_macd(self.close)))
+        bbands = BBands(20, 2.0)
+        self.assert_identical(np.array([bbands.update(c) for c in self.close]), np.column_stack(ref_bbands(self.close)))
+
+    def test_warm_start_then_updates(self):
+        indicators = IndicatorStream(maxlen=100)
+        indicators.warm_start(self.bars.iloc[:900])
+        for row in self.bars.iloc[900:].itertuples():
+            indicators.update(*row)
+        expected = ref_indicators(self.bars)
+        pd.testing.assert_frame_equal(indicators.frame(), expected.tail(100), check_freq=False)
+        pd.testing.assert_frame_equal(indicators.frame(tail=60), expected.tail(60), check_freq=False)
+
+        # Bars already seen are skipped
+        self.assertEqual(indicators.update_frame(self.bars.iloc[-50:]), 0)
+        self.assertEqual(indicators.bars_seen, len(self.bars))
+
+    def test_warm_up_rows_are_dropped(self):
+        streams = IndicatorStreams(maxlen=2000)
+        self.assertTrue(streams.update('THYAO', '1s', self.bars.iloc[:150]).empty)
+        frame = streams.update('THYAO', '1s', self.bars)
+        self.assertEqual(list(frame.columns), list(ref_indicators(self.bars).columns))
+        self.assertEqual(len(frame), len(ref_indicators(self.bars)))
+        streams.reset('THYAO')
+        self.assertEqual(streams.get('THYAO', '1s').bars_seen, 0)
+
+    def test_flat_prices(self):
+        close = self.close.copy()
+        close.iloc[300:340] = close.iloc[300]
+        bbands = BBands(20, 2.0)
+        actual = np.array([bbands.update(c) for c in close])
+        lower, mid, upper, _, _ = ref_bbands(close)
+        # pandas 3 leaves ~1e-12 of variance in flat windows, i.e. ~1e-6 of band width
+        np.testing.assert_allclose(actual[:, :3], np.column_stack([lower, mid, upper]), rtol=0, atol=1e-5)
+        # A window of one repeated price has no spread at all
+        self.assertEqual(actual[330, 0], actual[330, 2])
+        self.assert_identical(stream(RSI(14), close), ref_rsi(close))
+
+    def test_matches_add_indicators(self):
+        # Needs pandas_ta (requirements.txt); with TA-Lib installed too, this
+        # checks that add_indicators() stays on the talib=False path
+        from core.feature_engine import add_indicators
+
+        indicators = IndicatorStream(maxlen=len(self.bars))
+        indicators.warm_start(self.bars)
+        expected = add_indicators(self.bars.copy())
+        pd.testing.assert_frame_equal(indicators.frame(), expected, check_freq=False, check_exact=False, rtol=1e-12)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import unittest
+import sys
+import os
+import socket
+import tempfile
+import time
+from datetime import datetime
+
+# Resolve project root
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+import pandas as pd
+
+from core.bar_builder import BarBuilder
+from core.tick_bus import TickBus, TickBusSubscriber, BarCache, connect_tick_bus
+
+def scratch_address():
+    if hasattr(socket, 'AF_UNIX'):
+        return os.path.join(tempfile.mkdtemp(), 'bus.sock')
+    return ('127.0.0.1', 0)
+
+class TestBarBuilder(unittest.TestCase):
+
+    def test_bars_close_on_next_bucket(self):
+        builder = BarBuilder(timeframes=('1s', '1min'))
+        self.assertEqual(builder.update('THYAO', 10.0, 1, datetime(2025, 1, 2, 10, 0, 0, 100)), [])
+        builder.update('THYAO', 12.0, 2, datetime(2025, 1, 2, 10, 0, 0, 500000))
+        builder.update('THYAO', 9.0, 3, datetime(2025, 1, 2, 10, 0, 0, 900000))
+
+        closed = builder.update('THYAO', 11.0, 4, datetime(2025, 1, 2, 10, 0, 1))
+        self.assertEqual(len(closed), 1)
+        bar = closed[0]
+        self.assertEqual(bar['timeframe'], '1s')
+        self.assertEqual(bar['start'], datetime(2025, 1, 2, 10, 0, 0))
+        self.assertEqual((bar['open'], bar['high'], bar['low'], bar['close']), (10.0, 12.0, 9.0, 9.0))
+        self.assertEqual((bar['volume'], bar['tick_count']), (6, 3))
+
+        closed = builder.update('THYAO', 11.5, 1, datetime(2025, 1, 2, 10, 1, 0))
+        minute = [b for b in closed if b['timeframe'] == '1min'][0]
+        self.assertEqual((minute['open'], minute['close'], minute['tick_count']), (10.0, 11.0, 4))
+
+    def test_market_clock_closes_quiet_symbols(self):
+        builder = BarBuilder(timeframes=('1s',))
+        builder.update('GARAN', 80.0, 1, datetime(2025, 1, 2, 10, 0, 0))
+        closed = builder.update('THYAO', 250.0, 1, datetime(2025, 1, 2, 10, 0, 5))
+        self.assertEqual([b['symbol'] for b in closed], ['GARAN'])
+
+        # A late GARAN tick for the published 10:00:00 bucket is not published again
+        self.assertEqual(builder.update('GARAN', 81.0, 1, datetime(2025, 1, 2, 10, 0, 0, 500000)), [])
+        self.assertEqual(builder.late_ticks, 1)
+        self.assertEqual([b['symbol'] for b in builder.open_bars()], ['THYAO'])
+        closed = builder.update('GARAN', 82.0, 1, datetime(2025, 1, 2, 10, 0, 6))
+        self.assertEqual([(b['symbol'], b['start'].second) for b in closed], [('THYAO', 5)])
+
+    def test_late_tick_with_a_newer_open_bar(self):
+        builder = BarBuilder(timeframes=('1s', '1min', '5min'))
+        builder.update('THYAO', 100.0, 1, datetime(2025, 1, 2, 10, 1, 5))
+        builder.update('THYAO', 101.0, 1, datetime(2025, 1, 2, 10, 1, 30))
+        # 10:00:59 is behind the open 1s and 1min bars, but inside the open 5min bucket
+        self.assertEqual(builder.update('THYAO', 50.0, 1, datetime(2025, 1, 2, 10, 0, 59)), [])
+        self.assertEqual(builder.late_ticks, 2)
+        bars = {b['timeframe']: b for b in builder.open_bars()}
+        self.assertEqual((bars['1s']['low'], bars['1s']['close']), (101.0, 101.0))
+        self.assertEqual((bars['1min']['low'], bars['1min']['close'], bars['1min']['tick_count']), (100.0, 101.0, 2))
+        five = bars['5min']
+        self.assertEqual((five['open'], five['low'], five['close'], five['tick_count']), (50.0, 50.0, 101.0, 3))
+
+class TestTickBus(unittest.TestCase):
+
+    def setUp(self):
+        self.bus = TickBus(scratch_address(), timeframes=('1s',)).start()
+
+    def tearDown(self):
+        self.bus.close()
+
+    def wait_for_subscribers(self, n):
+        deadline = time.time() + 5
+        while self.bus.stats()['subscribers'] < n and time.time() < deadline:
+            time.sleep(0.005)
+
+    def recv_until(self, sub, n):
+        out = []
+        deadline = time.time() + 5
+        while len(out) < n and time.time() < deadline:
+            out.extend(sub.recv(timeout=0.5))
+        return out
+
+    def test_topic_and_symbol_filters(self):
+        ticks = TickBusSubscriber(['tick'], ['THYAO'], address=self.bus.address)
+        bars = TickBusSubscriber(['bar.1s'], address=self.bus.address)
+        self.wait_for_subscribers(2)
+
+        self.bus.publish_tick('GARAN', 80.0, 1, datetime(2025, 1, 2, 10, 0, 0))
+        self.bus.publish_tick('THYAO', 250.0, 5, datetime(2025, 1, 2, 10, 0, 0, 500000))
+        self.bus.publish_tick('THYAO', 251.0, 5, datetime(2025, 1, 2, 10, 0, 1))
+
+        got = self.recv_until(ticks, 2)
+        self.assertEqual([(m['topic'], m['symbol'], m['price']) for m in got],
+                         [('tick', 'THYAO', 250.0), ('tick', 'THYAO', 251.0)])
+        self.assertEqual(got[0]['timestamp'], '2025-01-02T10:00:00.500000')
+
+        got = self.recv_until(bars, 2)
+        self.assertEqual(sorted(m['symbol'] for m in got), ['GARAN', 'THYAO'])
+        self.assertEqual(got[0]['start'], '2025-01-02T10:00:00')
+        ticks.close()
+        bars.close()
+
+    def test_bar_cache_merges_seed_and_live_bars(self):
+        cache = BarCache('1s', ['THYAO'], maxlen=3, address=self.bus.address).start()
+        self.wait_for_subscribers(1)
+        seed = pd.DataFrame(
+            {'open': [1.0, 2.0], 'high': [1.0, 2.0], 'low': [1.0, 2.0], 'close': [1.0, 2.0], 'volume': [1.0, 1.0]},
+            index=pd.DatetimeIndex([datetime(2025, 1, 2, 9, 59, 58), datetime(2025, 1, 2, 9, 59, 59)], name='timestamp')
+        )
+        cache.seed('THYAO', seed)
+
+        self.bus.publish_tick('THYAO', 3.0, 1, datetime(2025, 1, 2, 10, 0, 0))
+        self.bus.publish_tick('THYAO', 4.0, 1, datetime(2025, 1, 2, 10, 0, 1))
+        self.bus.publish_tick('THYAO', 5.0, 1, datetime(2025, 1, 2, 10, 0, 2))
+        self.assertEqual(cache.wait(timeout=5), {'THYAO'})
+
+        deadline = time.time() + 5
+        while len(cache.frame('THYAO')) < 3 or cache.frame('THYAO').index[-1].second != 1:
+            self.assertLess(time.time(), deadline)
+            cache.wait(timeout=0.1)
+
+        # maxlen=3: the oldest seeded bar is evicted
+        frame = cache.frame('THYAO')
+        self.assertEqual(frame['close'].tolist(), [2.0, 3.0, 4.0])
+        self.assertEqual(list(frame.columns), ['open', 'high', 'low', 'close', 'volume'])
+        cache.stop()
+
+    def test_no_bus_running(self):
+        self.assertIsNone(connect_tick_bus(['tick'], address=scratch_address()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import unittest
+import sys
+import os
+import tempfile
+from datetime import date, datetime, timedelta
+
+# Resolve project root
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+# Keep the test away from the real market database
+os.environ.setdefault('BIST_DB_PATH', os.path.join(tempfile.mkdtemp(), 'test_market.db'))
+
+from sqlalchemy import create_engine, text
+from core.database import Base, TickData
+from core.tick_store import TickStore, partition_name, parse_partition_name
+
+DAYS = [date(2025, 1, 2), date(2025, 1, 3), date(2025, 1, 6)]
+
+class TestTickStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.tmp_dir, 'ticks.db')}")
+        Base.metadata.create_all(self.engine)
+        # 10 ticks per symbol and day, 10:00:00 .. 10:00:09
+        rows = []
+        for day in DAYS:
+            for sym in ('THYAO', 'GARAN'):
+                for i in range(10):
+                    rows.append({'symbol': sym, 'price': 100.0 + i, 'volume': 1.0, 'source': 'test',
+                                 'timestamp': datetime.combine(day, datetime.min.time()) + timedelta(hours=10, seconds=i)})
+        with self.engine.begin() as conn:
+            conn.execute(TickData.__table__.insert(), rows)
+        self.store = TickStore(engine=self.engine, archive_dir=os.path.join(self.tmp_dir, 'archive'))
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def hot_rows(self):
+        with self.engine.connect() as conn:
+            return conn.execute(text("SELECT COUNT(*) FROM tick_data")).scalar()
+
+    def test_partition_names(self):
+        self.assertEqual(partition_name(date(2025, 1, 2)), 'tick_data_20250102')
+        self.assertEqual(partition_name(date(2025, 1, 2), 'thyao'), 'tick_data_20250102_THYAO')
+        self.assertEqual(parse_partition_name('tick_data_20250102_THYAO'), (date(2025, 1, 2), 'THYAO'))
+        self.assertIsNone(parse_partition_name('tick_data'))
+
+    def test_roll_keeps_query_results(self):
+        before = self.store.query('THYAO')
+        moved = self.store.roll(before=DAYS[-1])
+        self.assertEqual(moved, {'tick_data_20250102': 20, 'tick_data_20250103': 20})
+        self.assertEqual(self.hot_rows(), 20)
+        # Rolling again is a no-op
+        self.assertEqual(self.store.roll(before=DAYS[-1]), {})
+
+        after = self.store.query('THYAO')
+        self.assertEqual(len(after), 30)
+        self.assertEqual(after['id'].tolist(), before['id'].tolist())
+        self.assertTrue(after['timestamp'].is_monotonic_increasing)
+
+        window = self.store.query(['THYAO', 'GARAN'], start=datetime(2025, 1, 3), end=datetime(2025, 1, 4))
+        self.assertEqual(len(window), 20)
+        self.assertEqual(set(window['timestamp'].dt.date), {DAYS[1]})
+
+    def test_latest_only_touches_needed_partitions(self):
+        self.store.roll(before=date(2025, 1, 7))
+        reads = []
+        original = self.store._read_partition
+        self.store._read_partition = lambda part, sql, params: reads.append(part.table) or original(part, sql, params)
+
+        latest = self.store.latest('THYAO', limit=15)
+        self.assertEqual(len(latest), 15)
+        self.assertEqual(latest['timestamp'].iloc[0], datetime(2025, 1, 3, 10, 0, 5))
+        self.assertEqual(reads, ['tick_data_20250106', 'tick_data_20250103'])
+
+    def test_latest_many_matches_latest(self):
+        self.store.roll(before=DAYS[-1])
+        self.store.apply_retention(hot_days=1, keep_days=None, today=DAYS[-1])
+        many = self.store.latest_many(['THYAO', 'GARAN', 'AKBNK'], limit=15)
+        self.assertEqual(many['symbol'].tolist(), ['GARAN'] * 15 + ['THYAO'] * 15)
+        for sym in ('THYAO', 'GARAN'):
+            one = many[many['symbol'] == sym].reset_index(drop=True)
+            self.assertEqual(one['id'].tolist(), self.store.latest(sym, limit=15)['id'].tolist())
+
+        # A symbol satisfied by the hot table stops the partition walk for itself only
+        self.assertEqual(len(self.store.latest_many(['THYAO'], limit=5)), 5)
+        self.assertTrue(self.store.latest_many(['AKBNK']).empty)
+
+    def test_per_symbol_layout(self):
+        store = TickStore(engine=self.engine, per_symbol=True)
+        moved = store.roll(before=DAYS[-1])
+        self.assertIn('tick_data_20250102_THYAO', moved)
+        self.assertEqual([p.table for p in store.partitions('GARAN')], ['tick_data_20250103_GARAN', 'tick_data_20250102_GARAN'])
+        self.assertEqual(len(store.query('GARAN')), 30)
+
+    def test_retention_archives_and_deletes(self):
+        self.store.roll(before=date(2025, 1, 7))
+        res = self.store.apply_retention(hot_days=3, keep_days=None, today=date(2025, 1, 7))
+        self.assertEqual(sorted(res['archived']), ['tick_data_20250102', 'tick_data_20250103'])
+        parts = self.store.partitions()
+        self.assertIsNone(parts[0].path)
+        self.assertTrue(os.path.exists(parts[1].path))
+
+        # Archived partitions are still queryable
+        self.assertEqual(len(self.store.query('THYAO')), 30)
+
+        res = self.store.apply_retention(hot_days=3, keep_days=4, today=date(2025, 1, 7))
+        self.assertEqual(res['deleted'], ['tick_data_20250102'])
+        self.assertEqual(len(self.store.query('THYAO')), 20)
+
+    def test_late_tick_for_archived_day(self):
+        self.store.roll(before=DAYS[-1])
+        self.store.apply_retention(hot_days=1, keep_days=None, today=DAYS[-1])
+        with self.engine.begin() as conn:
+            conn.execute(TickData.__table__.insert(), [{'symbol': 'THYAO', 'price': 99.0, 'volume': 1.0, 'source': 'test',
+                                                        'timestamp': datetime(2025, 1, 2, 17, 0)}])
+        self.assertEqual(self.store.roll(before=DAYS[-1]), {'tick_data_20250102': 1})
+        self.assertEqual(self.hot_rows(), 20)
+
+        # The late tick lands in the archive file, which keeps the whole day readable
+        parts = [p for p in self.store.partitions() if p.table == 'tick_data_20250102']
+        self.assertEqual(len(parts), 1)
+        self.assertIsNotNone(parts[0].path)
+        day = self.store.query('THYAO', start=datetime(2025, 1, 2), end=datetime(2025, 1, 3))
+        self.assertEqual(len(day), 11)
+
+if __name__ == '__main__':
+    unittest.main()
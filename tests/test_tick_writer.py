@@ -0,0 +1,199 @@
+import unittest
+import sys
+import os
+import time
+import tempfile
+from datetime import datetime
+
+# Resolve project root
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+# Keep the test away from the real market database
+os.environ.setdefault('BIST_DB_PATH', os.path.join(tempfile.mkdtemp(), 'test_market.db'))
+
+from sqlalchemy import create_engine, text
+from core.database import Base, OrderBookSnapshot, compact_tick_data, _upgrade_tick_data
+from core.tick_writer import TickWriter
+
+def make_row(i):
+    return {
+        'symbol': 'THYAO',
+        'price': 100.0 + i,
+        'volume': 10.0,
+        'timestamp': datetime(2025, 1, 2, 10, 0, 0, i),
+        'received_at': datetime.utcnow()
+    }
+
+class TestTickWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.tmp_dir, 'ticks.db')}")
+        Base.metadata.create_all(self.engine)
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def count(self):
+        with self.engine.connect() as conn:
+            return conn.execute(text("SELECT COUNT(*) FROM tick_data")).scalar()
+
+    def test_flushes_when_batch_is_full(self):
+        writer = TickWriter(self.engine, batch_size=100, flush_interval_ms=60000).start()
+        for i in range(250):
+            writer.submit(make_row(i))
+
+        # Two full batches go out on their own; the 50 leftovers wait for the timer
+        deadline = time.time() + 5
+        while writer.rows_written < 200 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(writer.rows_written, 200)
+        self.assertEqual(writer.flushes, 2)
+
+        writer.close()
+        self.assertEqual(self.count(), 250)
+        self.assertEqual(writer.flushes, 3)
+
+    def test_flushes_after_interval(self):
+        writer = TickWriter(self.engine, batch_size=10000, flush_interval_ms=50).start()
+        writer.submit(make_row(0))
+        writer.submit(make_row(1))
+
+        deadline = time.time() + 5
+        while writer.rows_written < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.count(), 2)
+        writer.close()
+
+    def test_explicit_flush_and_stats(self):
+        writer = TickWriter(self.engine, batch_size=10000, flush_interval_ms=60000).start()
+        for i in range(10):
+            writer.submit(make_row(i))
+        writer.flush(timeout=5)
+        self.assertEqual(self.count(), 10)
+
+        stats = writer.stats()
+        self.assertEqual(stats['rows_submitted'], 10)
+        self.assertEqual(stats['rows_written'], 10)
+        self.assertEqual(stats['queue_depth'], 0)
+        self.assertGreaterEqual(stats['max_queue_depth'], 1)
+        self.assertGreater(stats['avg_flush_ms'], 0.0)
+
+        writer.close()
+        self.assertFalse(writer.submit(make_row(99)))
+
+    def test_rows_for_several_tables_share_a_batch(self):
+        writer = TickWriter(self.engine, batch_size=10000, flush_interval_ms=60000).start()
+        book = {
+            'symbol': 'THYAO', 'timestamp': datetime(2025, 1, 2, 10), 'depth': 1,
+            'bids': b'', 'asks': b'', 'imbalance': 0.5, 'weighted_imbalance': 0.4,
+            'received_at': datetime.utcnow()
+        }
+        for i in range(5):
+            writer.submit(make_row(i))
+            writer.submit(book, table=OrderBookSnapshot.__table__)
+        writer.flush(timeout=5)
+
+        self.assertEqual(writer.flushes, 1)
+        self.assertEqual(self.count(), 5)
+        with self.engine.connect() as conn:
+            self.assertEqual(conn.execute(text("SELECT COUNT(*) FROM order_book_snapshots")).scalar(), 5)
+        writer.close()
+
+    def test_bad_row_does_not_lose_the_batch(self):
+        writer = TickWriter(self.engine, batch_size=10000, flush_interval_ms=60000).start()
+        book = {
+            'symbol': 'THYAO', 'timestamp': datetime(2025, 1, 2, 10), 'depth': 1,
+            'bids': b'', 'asks': b'', 'imbalance': 0.5, 'weighted_imbalance': 0.4,
+            'received_at': datetime.utcnow()
+        }
+        for i in range(5):
+            writer.submit(make_row(i))
+            writer.submit(dict(book, timestamp=datetime(2025, 1, 2, 10, 0, i)), table=OrderBookSnapshot.__table__)
+        # Cannot be bound: fails its table's statement and with it the shared transaction
+        writer.submit(dict(book, imbalance={'not': 'a number'}), table=OrderBookSnapshot.__table__)
+        writer.close()
+
+        self.assertEqual(self.count(), 5)
+        with self.engine.connect() as conn:
+            self.assertEqual(conn.execute(text("SELECT COUNT(*) FROM order_book_snapshots")).scalar(), 5)
+        self.assertEqual(writer.rows_written, 10)
+        self.assertEqual(writer.rows_failed, 1)
+        self.assertEqual(writer.dead_letters[0][0], 'order_book_snapshots')
+
+    def test_duplicate_ticks_are_ignored(self):
+        writer = TickWriter(self.engine, batch_size=10000, flush_interval_ms=60000).start()
+        for _ in range(2):  # e.g. a feeder restart re-sending its history
+            for i in range(10):
+                writer.submit(dict(make_row(i), source='YahooFinance'))
+            writer.flush(timeout=5)
+        # Same key from another feed is a different tick
+        writer.submit(dict(make_row(0), source='MatriksIQ'))
+        writer.close()
+
+        self.assertEqual(self.count(), 11)
+        self.assertEqual(writer.rows_written, 11)
+        self.assertEqual(writer.rows_ignored, 10)
+
+    def test_replace_keeps_newest_copy(self):
+        writer = TickWriter(self.engine, batch_size=10000, flush_interval_ms=60000, on_conflict='replace').start()
+        writer.submit(dict(make_row(0), source='YahooFinance', volume=5.0))
+        writer.flush(timeout=5)
+        writer.submit(dict(make_row(0), source='YahooFinance', volume=7.0))  # partial minute, updated
+        writer.close()
+
+        with self.engine.connect() as conn:
+            self.assertEqual(conn.execute(text("SELECT volume FROM tick_data")).scalars().all(), [7.0])
+
+class TestCompaction(unittest.TestCase):
+
+    def setUp(self):
+        # tick_data as created before the source column existed, full of reloaded history
+        self.engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'legacy.db')}")
+        with self.engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE tick_data (id INTEGER PRIMARY KEY AUTOINCREMENT, symbol VARCHAR, "
+                "price FLOAT, volume FLOAT, timestamp DATETIME, received_at DATETIME)"
+            ))
+            for run in range(3):
+                for i in range(5):
+                    conn.execute(text(
+                        "INSERT INTO tick_data (symbol, price, volume, timestamp) VALUES (:s, :p, 1, :t)"
+                    ), {'s': 'THYAO', 'p': 100.0 + run, 't': f"2025-01-02 10:0{i}:00.000000"})
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def test_upgrade_waits_for_compaction(self):
+        self.assertFalse(_upgrade_tick_data(self.engine))
+        with self.engine.connect() as conn:
+            self.assertEqual(conn.execute(text("SELECT COUNT(*) FROM tick_data WHERE source = ''")).scalar(), 15)
+
+    def test_compaction_dedups_in_place(self):
+        # A copy re-sent after the upgrade, with its real source name
+        _upgrade_tick_data(self.engine)
+        with self.engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO tick_data (symbol, price, volume, timestamp, source) "
+                "VALUES ('THYAO', 200.0, 1, '2025-01-02 10:00:00.000000', 'YahooFinance')"
+            ))
+
+        res = compact_tick_data(self.engine, keep='last', legacy_source='YahooFinance')
+        self.assertEqual(res, {'rows_before': 16, 'rows_after': 5, 'removed': 11})
+        with self.engine.connect() as conn:
+            prices = conn.execute(text("SELECT price FROM tick_data ORDER BY timestamp")).scalars().all()
+        self.assertEqual(prices, [200.0, 102.0, 102.0, 102.0, 102.0])
+
+        # Unique index is in place: the writer now drops re-sent ticks
+        self.assertTrue(_upgrade_tick_data(self.engine))
+        writer = TickWriter(self.engine).start()
+        writer.submit({'symbol': 'THYAO', 'price': 1.0, 'volume': 1.0, 'source': 'YahooFinance',
+                       'timestamp': datetime(2025, 1, 2, 10, 1)})
+        writer.close()
+        self.assertEqual(writer.rows_ignored, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,209 @@
+import unittest
+import asyncio
+import json
+import socket
+import sys
+import os
+import tempfile
+import threading
+from datetime import datetime
+from unittest import mock
+
+# Resolve project root
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+# Keep the test away from the real market database
+os.environ.setdefault('BIST_DB_PATH', os.path.join(tempfile.mkdtemp(), 'test_market.db'))
+
+from integration.matriks_bridge import socket_server
+from integration.matriks_bridge.async_server import AsyncTickServer
+from integration.matriks_bridge.wire_protocol import (
+    BinaryTickEncoder, BinaryFrameDecoder, LineFramer, ProtocolError, negotiate_binary,
+    parse_hello, to_epoch_ns, from_epoch_ns
+)
+
+TICKS = [
+    ('THYAO', 250.5, 100, datetime(2025, 1, 2, 10, 0, 0, 250000)),
+    ('GARAN', 80.25, 5, datetime(2025, 1, 2, 10, 0, 1)),
+    ('THYAO', 250.75, 7, '2025-01-02 10:00:02'),
+]
+
+class TestWireProtocol(unittest.TestCase):
+
+    def test_round_trip_with_split_chunks(self):
+        encoder = BinaryTickEncoder("unit")
+        payload = encoder.encode(TICKS[:2]) + encoder.encode(TICKS[2:])
+
+        decoder = BinaryFrameDecoder("unit")
+        messages = []
+        # Feed 3 bytes at a time to cross every frame and record boundary
+        for i in range(0, len(payload), 3):
+            for arr in decoder.feed(payload[i:i + 3]):
+                messages.extend(decoder.to_messages(arr))
+
+        self.assertEqual([m['symbol'] for m in messages], ['THYAO', 'GARAN', 'THYAO'])
+        self.assertEqual(messages[0]['timestamp'], datetime(2025, 1, 2, 10, 0, 0, 250000))
+        self.assertEqual(messages[2]['timestamp'], datetime(2025, 1, 2, 10, 0, 2))
+        self.assertEqual(messages[1]['price'], 80.25)
+        self.assertEqual(messages[0]['source'], 'unit')
+        # Symbols are only defined once per connection
+        self.assertEqual(encoder.symbol_ids, {'THYAO': 0, 'GARAN': 1})
+
+    def test_undefined_symbol_id_is_dropped(self):
+        payload = BinaryTickEncoder("unit").encode(TICKS)
+        decoder = BinaryFrameDecoder("unit")
+        arrays = decoder.feed(payload)
+        del decoder.symbols[1]  # as if GARAN's definition had never arrived
+        messages = [m for arr in arrays for m in decoder.to_messages(arr)]
+        self.assertEqual([m['symbol'] for m in messages], ['THYAO', 'THYAO'])
+        self.assertEqual(decoder.unknown_symbol_ticks, 1)
+
+    def test_epoch_ns_is_wall_clock(self):
+        ts = datetime(2025, 6, 30, 17, 59, 59, 999999)
+        self.assertEqual(from_epoch_ns(to_epoch_ns(ts)), ts)
+        self.assertEqual(to_epoch_ns(datetime(1970, 1, 1, 0, 0, 1)), 1_000_000_000)
+
+    def test_hello_and_bad_frames(self):
+        hello = BinaryTickEncoder("MatriksIQ").hello()
+        self.assertIsNone(parse_hello(hello[:5]))
+        self.assertEqual(parse_hello(hello), (1, 'MatriksIQ', len(hello)))
+
+        with self.assertRaises(ProtocolError):
+            BinaryFrameDecoder().feed(b"\x01\x00\x00\x00\x02")
+
+    def test_threaded_server_serves_binary_client(self):
+        server_sock, client_sock = socket.socketpair()
+        saved = []
+        with mock.patch.object(socket_server, 'save_to_db', saved.append), \
+             mock.patch.object(socket_server, 'VERBOSE', False):
+            t = threading.Thread(target=socket_server.handle_client, args=(server_sock,))
+            t.start()
+            encoder = negotiate_binary(client_sock, source="unit")
+            client_sock.sendall(encoder.encode(TICKS))
+            client_sock.close()
+            t.join(5)
+
+        self.assertEqual(len(saved), 3)
+        self.assertEqual(saved[1]['symbol'], 'GARAN')
+
+    def test_threaded_server_still_accepts_json(self):
+        server_sock, client_sock = socket.socketpair()
+        saved = []
+        with mock.patch.object(socket_server, 'save_to_db', saved.append), \
+             mock.patch.object(socket_server, 'VERBOSE', False):
+            t = threading.Thread(target=socket_server.handle_client, args=(server_sock,))
+            t.start()
+            # Short first line: fits in the protocol sniffing window
+            client_sock.sendall(b'{}\n' + json.dumps({"symbol": "AKBNK", "price": 50.0}).encode() + b"\n")
+            client_sock.close()
+            t.join(5)
+
+        self.assertEqual([d.get('symbol') for d in saved], [None, 'AKBNK'])
+
+    def test_depth_message_queues_order_book_snapshot(self):
+        submitted = []
+
+        class FakeWriter:
+            def submit(self, row, table=None):
+                submitted.append((table, row))
+
+        message = json.dumps({
+            "symbol": "THYAO", "timestamp": "2025-01-02T10:00:00",
+            "bids": [[100.0, 1000], [99.9, 10]], "asks": [[100.1, 100]]
+        })
+        with mock.patch.object(socket_server, 'get_tick_writer', FakeWriter), \
+             mock.patch.object(socket_server, 'VERBOSE', False):
+            socket_server.save_to_db(socket_server.parse_message(message))
+
+        # Depth-only update: one snapshot, no price=0 tick
+        self.assertEqual(len(submitted), 1)
+        table, row = submitted[0]
+        self.assertEqual(table.name, 'order_book_snapshots')
+        self.assertEqual(row['depth'], 2)
+        self.assertEqual(row['timestamp'], datetime(2025, 1, 2, 10))
+        self.assertAlmostEqual(row['imbalance'], 910 / 1110)
+        self.assertIsNotNone(row['weighted_imbalance'])
+
+    def test_async_server_mixed_clients(self):
+        received = []
+        server = AsyncTickServer(host='127.0.0.1', port=0, sink=received.append)
+        socket_server.VERBOSE = False
+
+        async def scenario():
+            await server.start()
+            port = server.server.sockets[0].getsockname()[1]
+
+            def binary_client():
+                with socket.create_connection(('127.0.0.1', port)) as s:
+                    encoder = negotiate_binary(s, source="unit")
+                    s.sendall(encoder.encode(TICKS))
+
+            def json_client():
+                with socket.create_connection(('127.0.0.1', port)) as s:
+                    s.sendall(b'{"symbol": "EREGL", "price": 40.0}\n')
+
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(loop.run_in_executor(None, binary_client),
+                                 loop.run_in_executor(None, json_client))
+            while server.ticks_parsed < 4:
+                await asyncio.sleep(0.01)
+            await server.stop()
+
+        asyncio.run(scenario())
+        self.assertEqual(sorted(d['symbol'] for d in received), ['EREGL', 'GARAN', 'THYAO', 'THYAO'])
+
+class TestLineFramer(unittest.TestCase):
+
+    def test_utf8_split_across_reads(self):
+        record = json.dumps({"symbol": "ŞİŞE", "note": "çğıöşü"}, ensure_ascii=False).encode('utf-8') + b"\n"
+        split = record.index("Ş".encode('utf-8')) + 1   # inside the 2-byte sequence
+
+        framer = LineFramer(chunk_size=16)
+        self.assertEqual(framer.feed(record[:split]), [])
+        records = framer.feed(record[split:])
+        self.assertEqual(len(records), 1)
+        self.assertEqual(json.loads(records[0])['symbol'], "ŞİŞE")
+
+    def test_many_records_and_partial_tail(self):
+        framer = LineFramer(chunk_size=8)
+        lines = [b'{"i": %d}' % i for i in range(1000)]
+        blob = b"\n".join(lines) + b"\n" + b'{"i": "tail'
+
+        out = []
+        for i in range(0, len(blob), 7):
+            out.extend(framer.feed(blob[i:i + 7]))
+        self.assertEqual([bytes(r) for r in out], lines)
+        self.assertEqual(framer.pending(), len(b'{"i": "tail'))
+
+        out = framer.feed(b'"}\n')
+        self.assertEqual(json.loads(out[0]), {"i": "tail"})
+        self.assertEqual(framer.pending(), 0)
+
+    def test_recv_from_socket(self):
+        a, b = socket.socketpair()
+        payload = b"".join(b'{"n": %d}\n' % i for i in range(5000))
+        sender = threading.Thread(target=lambda: (a.sendall(payload), a.close()))
+        sender.start()
+
+        framer = LineFramer(chunk_size=4096)
+        received = []
+        while True:
+            n, records = framer.recv_from(b)
+            received.extend(records)
+            if n == 0:
+                break
+        sender.join()
+        b.close()
+        self.assertEqual(len(received), 5000)
+        self.assertEqual(json.loads(received[-1]), {"n": 4999})
+
+    def test_runaway_line_is_rejected(self):
+        framer = LineFramer(chunk_size=64, max_line=100)
+        with self.assertRaises(ProtocolError):
+            framer.feed(b"x" * 200)
+
+if __name__ == '__main__':
+    unittest.main()
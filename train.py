@@ -10,7 +10,7 @@ import numpy as np
 # Resolve project root
 sys.path.append(os.getcwd())
 
-from core.feature_engine import fetch_and_process_data
+from core.feature_engine import fetch_and_process_data, load_archived_data
 from models.lstm_price.definitions import BISTLSTM
 from models.lstm_price.dataset import BISTDataset
 
@@ -31,7 +31,10 @@ def train_model():
     # Use '1min' for production (Yahoo Finance Data)
     # The user is running free_data_feeder.py which provides 1-minute interval data.
     # Training on 1s would cause a domain mismatch.
-    df = fetch_and_process_data(SYMBOL, timeframe='1min', limit=5000)
+    # Prefer the full Parquet history (scripts/export_parquet.py), fall back to the newest DB bars
+    df = load_archived_data(SYMBOL, timeframe='1min')
+    if df.empty:
+        df = fetch_and_process_data(SYMBOL, timeframe='1min', limit=5000)
     
     if len(df) < 200:
         print(f"[!] Insufficient data ({len(df)} rows). Need at least 200.")
@@ -12,7 +12,7 @@ project_root = os.path.dirname(os.path.dirname(current_dir))
 if project_root not in sys.path:
     sys.path.append(project_root)
 
-from core.feature_engine import fetch_and_process_data
+from core.feature_engine import fetch_and_process_data, load_archived_data
 from models.itransformer.model import iTransformer
 
 # --- CONFIG ---
@@ -44,7 +44,10 @@ class iTransformerDataset(Dataset):
 
 def train():
     print(f"[*] Fetching Data for {SYMBOL}...")
-    df = fetch_and_process_data(SYMBOL, limit=5000)
+    # Prefer the full Parquet history (scripts/export_parquet.py), fall back to the newest DB bars
+    df = load_archived_data(SYMBOL, timeframe='1min')
+    if df.empty:
+        df = fetch_and_process_data(SYMBOL, limit=5000)
     
     dataset = iTransformerDataset(df, LOOKBACK, PREDICTION)
     loader = DataLoader(dataset, batch_size=BATCH_SIZE, shuffle=True)
@@ -11,7 +11,7 @@ project_root = os.path.dirname(os.path.dirname(current_dir))
 if project_root not in sys.path:
     sys.path.append(project_root)
 
-from core.feature_engine import fetch_and_process_data
+from core.feature_engine import fetch_and_process_data, load_archived_data
 from models.patchtst.dataset import BISTDataset
 
 # CONFIG
@@ -24,8 +24,10 @@ EPOCHS = 5
 
 def train_model():
     print(f"[*] Fetching Data for {SYMBOL}...")
-    # Fetch ample history
-    df = fetch_and_process_data(SYMBOL, timeframe='1min', limit=10000)
+    # Fetch ample history: the full Parquet archive (scripts/export_parquet.py), else the newest DB bars
+    df = load_archived_data(SYMBOL, timeframe='1min')
+    if df.empty:
+        df = fetch_and_process_data(SYMBOL, timeframe='1min', limit=10000)
     
     if len(df) < (CONTEXT_LENGTH + PREDICTION_LENGTH + 100):
         print("[!] Not enough data for training.")